@@ -0,0 +1,105 @@
+"""
+업로드 압축 codec/레벨별 비용 비교
+
+압축에 드는 CPU 시간과 줄어든 크기로 아낀 업로드 시간을 대역폭별로 계산해서
+어떤 설정이 전체 백업 시간을 가장 줄이는지 보여줌
+
+사용법:
+    python -m benchmarks.bench_compression [memory.json 경로] [--size-mb 20] [--bandwidth-mbps 5 20 100]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from src import compression
+
+CANDIDATES = [
+    (None, None),
+    ('gzip', 1), ('gzip', 6), ('gzip', 9),
+    ('zstd', 1), ('zstd', 3), ('zstd', 10), ('zstd', 19)
+]
+
+def make_sample_memory_file(path, size_mb, seed=0):
+    """엔티티 이름이 반복되는 MCP memory 형식의 샘플 파일 생성"""
+    rng = random.Random(seed)
+    names = [f"entity_{i}" for i in range(2000)]
+    types = ['person', 'project', 'tool', 'preference', 'event']
+    words = "user prefers python uses drive backup memory project deadline meeting likes works".split()
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < target:
+            if rng.random() < 0.7:
+                record = {
+                    'type': 'entity',
+                    'name': rng.choice(names),
+                    'entityType': rng.choice(types),
+                    'observations': [' '.join(rng.choices(words, k=8)) for _ in range(rng.randint(1, 5))]
+                }
+            else:
+                record = {
+                    'type': 'relation',
+                    'from': rng.choice(names),
+                    'to': rng.choice(names),
+                    'relationType': rng.choice(['knows', 'uses', 'owns', 'depends_on'])
+                }
+            line = json.dumps(record, separators=(',', ':')) + '\n'
+            f.write(line)
+            written += len(line)
+
+def measure(source_path, codec, level):
+    """압축 한 번 수행 후 (압축 크기, wall 시간, CPU 시간) 반환"""
+    if codec is None:
+        return os.path.getsize(source_path), 0.0, 0.0
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    tmp_path = compression.compress_to_temp(source_path, codec, level)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    size = os.path.getsize(tmp_path)
+    os.remove(tmp_path)
+    return size, wall, cpu
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 압축 벤치마크")
+    parser.add_argument('path', nargs='?', help="측정할 memory.json (없으면 샘플 생성)")
+    parser.add_argument('--size-mb', type=int, default=20, help="샘플 파일 크기 (MB)")
+    parser.add_argument('--bandwidth-mbps', type=float, nargs='+', default=[5, 20, 100],
+                        help="업로드 시간을 계산할 대역폭 (Mbit/s)")
+    args = parser.parse_args()
+
+    sample_path = None
+    source_path = args.path
+    if not source_path:
+        fd, sample_path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        make_sample_memory_file(sample_path, args.size_mb)
+        source_path = sample_path
+
+    try:
+        original = os.path.getsize(source_path)
+        print(f"source: {source_path} ({original / 1024 / 1024:.1f} MB)")
+        header = f"{'codec':<8}{'level':>6}{'ratio':>8}{'wall s':>9}{'cpu s':>8}"
+        header += ''.join(f"{f'total@{bw:g}Mbps':>16}" for bw in args.bandwidth_mbps)
+        print(header)
+
+        for codec, level in CANDIDATES:
+            try:
+                size, wall, cpu = measure(source_path, codec, level)
+            except ImportError as e:
+                print(f"{codec:<8}{level:>6}  skipped ({e})")
+                continue
+            row = f"{codec or 'none':<8}{level if level is not None else '-':>6}"
+            row += f"{original / size:>8.2f}{wall:>9.2f}{cpu:>8.2f}"
+            for bw in args.bandwidth_mbps:
+                upload_seconds = size * 8 / (bw * 1_000_000)
+                row += f"{wall + upload_seconds:>16.2f}"
+            print(row)
+    finally:
+        if sample_path:
+            os.remove(sample_path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+가짜 Drive(benchmarks.fake_drive)를 상대로 한 백업 한 번의 비용 측정
+
+파일 크기/전송 방식별로 폴더 조회, 첫 백업, 변경 후 백업, 변경 없는 백업, 복원을 차례로 실행하고
+단계마다 wall 시간, API 호출 수, 올린/받은 바이트를 표로 출력
+(호출 수와 바이트는 결정적이라 값이 바뀌면 그대로 회귀)
+
+전송 방식:
+    inprocess: FakeHttp로 서비스에 바로 연결 (네트워크 없이 코드 경로 비용만)
+    httplib2:  localhost 서버 + 서비스마다 httplib2.Http
+    session:   localhost 서버 + 공유 연결 풀 SessionHttp
+
+사용법:
+    python -m benchmarks.bench_drive_backup [--sizes-mb 0.1 1 10] [--transports inprocess session]
+        [--modes rotate revision] [--latency-ms 0] [--bandwidth-mbps 0] [--runs 3] [--rate 1000]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_compression import make_sample_memory_file
+from benchmarks.fake_drive import FakeDriveBackend, FakeDriveServer, build_fake_service
+from src.backup_manager import DriveBackupManager
+from src.config import config
+from src.folder_manager import FolderManager
+from src.transport import SessionHttp
+
+# 백업 상태/캐시 파일을 임시 디렉토리로 옮길 설정
+STATE_PATHS = ('FOLDER_CACHE_PATH', 'BACKUP_STATE_PATH', 'CATALOG_PATH', 'HISTORY_INDEX_PATH',
+               'CHUNK_INDEX_PATH', 'DELTA_BASE_DIR')
+
+FOLDER_NAME = 'bench-memory'
+
+def use_state_dir(state_dir):
+    """설정의 로컬 상태 경로를 state_dir 아래로 변경 (실제 credentials/를 건드리지 않도록)"""
+    for name in STATE_PATHS:
+        setattr(config, name, os.path.join(state_dir, os.path.basename(str(getattr(config, name)))))
+
+def connect_manager(manager, backend, transport, server=None):
+    """매니저를 가짜 Drive에 연결"""
+    if transport == 'inprocess':
+        manager.service_factory = lambda: build_fake_service(backend)
+        manager.connect()
+    elif transport == 'httplib2':
+        manager.service_factory = lambda: server.build_service()
+        manager.connect()
+    else:
+        from google.auth.credentials import AnonymousCredentials
+        http = SessionHttp(AnonymousCredentials(), pool_size=config.HTTP_POOL_SIZE)
+        manager.service_factory = lambda: server.build_service(manager.http)
+        manager.connect(http)
+
+def append_entity(path, i):
+    """파일 끝에 엔티티 하나 추가 (변경 후 백업용)"""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(f'{{"type":"entity","name":"bench_{i}","entityType":"note","observations":["run {i}"]}}\n')
+
+def run_steps(backend, manager, source_path, restore_path, run):
+    """
+    단계별로 실행하면서 (단계 이름, wall 시간, 요청 수, 올린 바이트, 받은 바이트) 반환
+
+    FolderManager는 캐시 파일 없이 새로 만들어서 폴더 조회 비용을 따로 측정
+    """
+    results = []
+
+    def step(name, fn):
+        backend.reset_stats()
+        start = time.perf_counter()
+        fn()
+        wall = time.perf_counter() - start
+        stats = backend.stats
+        results.append((name, wall, stats['requests'], stats['bytes_received'], stats['bytes_sent']))
+
+    folders = FolderManager(manager.drive_service, execute=manager.scheduler.execute)
+    step('folder (cold)', lambda: folders.get_or_create_folder(f"{FOLDER_NAME}-{run}"))
+    step('folder (cached)', lambda: folders.get_or_create_folder(f"{FOLDER_NAME}-{run}"))
+    step('first backup', lambda: manager.backup_memory_file(source_path, FOLDER_NAME, force=True))
+    append_entity(source_path, run)
+    step('changed backup', lambda: manager.backup_memory_file(source_path, FOLDER_NAME))
+    step('unchanged backup', lambda: manager.backup_memory_file(source_path, FOLDER_NAME))
+    step('restore', lambda: manager.restore(restore_path, folder_name=FOLDER_NAME))
+    return results
+
+def measure(size_mb, transport, mode, args, work_dir):
+    """같은 조건을 args.runs번 실행해서 단계별 (중앙값 wall, 요청 수, 올린 바이트, 받은 바이트) 반환"""
+    source_path = os.path.join(work_dir, 'memory.json')
+    restore_path = os.path.join(work_dir, 'restored.json')
+    make_sample_memory_file(source_path, size_mb)
+
+    backend = FakeDriveBackend(
+        latency=args.latency_ms / 1000,
+        bandwidth=args.bandwidth_mbps * 1_000_000 / 8 if args.bandwidth_mbps else None
+    )
+    server = FakeDriveServer(backend).start() if transport != 'inprocess' else None
+    try:
+        runs = []
+        for run in range(args.runs):
+            state_dir = tempfile.mkdtemp(dir=work_dir)
+            use_state_dir(state_dir)
+            manager = DriveBackupManager(backup_mode=mode)
+            connect_manager(manager, backend, transport, server)
+            try:
+                runs.append(run_steps(backend, manager, source_path, restore_path, run))
+            finally:
+                if manager.http is not None:
+                    manager.http.close()
+    finally:
+        if server:
+            server.close()
+
+    return [
+        (steps[0][0], statistics.median(step[1] for step in steps), *steps[-1][2:])
+        for steps in zip(*runs)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Drive 백업 벤치마크")
+    parser.add_argument('--sizes-mb', type=float, nargs='+', default=[0.1, 1, 10], help="샘플 memory.json 크기 (MB)")
+    parser.add_argument('--transports', nargs='+', default=['inprocess', 'httplib2', 'session'],
+                        choices=['inprocess', 'httplib2', 'session'], help="전송 방식")
+    parser.add_argument('--modes', nargs='+', default=['rotate'],
+                        choices=['rotate', 'revision', 'delta', 'dedup'], help="백업 모드")
+    parser.add_argument('--latency-ms', type=float, default=0, help="요청 하나의 왕복 지연 (ms)")
+    parser.add_argument('--bandwidth-mbps', type=float, default=0, help="대역폭 (Mbit/s, 0이면 무제한)")
+    parser.add_argument('--runs', type=int, default=3, help="조건마다 반복 횟수 (wall은 중앙값)")
+    parser.add_argument('--rate', type=float, default=1000,
+                        help="API 초당 호출 수 상한 (기본값은 사실상 끔, 실제 설정으로 재려면 8)")
+    args = parser.parse_args()
+
+    config.API_REQUESTS_PER_SECOND = args.rate
+    config.API_BURST = max(config.API_BURST, int(args.rate))
+    work_dir = tempfile.mkdtemp(prefix='bench_drive_')
+    try:
+        print(f"latency {args.latency_ms:g}ms, bandwidth {args.bandwidth_mbps or 'unlimited'}"
+              f"{' Mbit/s' if args.bandwidth_mbps else ''}, {args.runs} runs")
+        print(f"{'size MB':>8}  {'transport':<10}{'mode':<9}{'step':<18}{'wall ms':>9}{'calls':>7}"
+              f"{'KB up':>10}{'KB down':>10}")
+        for size_mb in args.sizes_mb:
+            for transport in args.transports:
+                for mode in args.modes:
+                    for name, wall, calls, sent, received in measure(size_mb, transport, mode, args, work_dir):
+                        print(f"{size_mb:>8g}  {transport:<10}{mode:<9}{name:<18}{wall * 1000:>9.1f}{calls:>7}"
+                              f"{sent / 1024:>10.1f}{received / 1024:>10.1f}")
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+프로젝트 로컬 백업 압축 비교 (기존 직렬 zipfile.write vs 병렬 압축 vs 제외 규칙 적용)
+
+dist/, build/ 같은 빌드 산출물이 들어있는 프로젝트 트리를 만들어서
+예전 방식(os.walk로 전부 돌면서 한 파일씩 ZIP_DEFLATED로 write)과
+같은 파일 목록의 병렬 압축(작업자 수별), .gitignore/기본 제외 목록을 적용한 backup_project를 비교
+
+사용법:
+    python -m benchmarks.bench_project_archive [프로젝트 경로] [--scale 1] [--workers 1 2 4]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+import zipfile
+
+from src.utils import backup
+from src.utils.parallel_zip import RawZipWriter, write_members
+
+def _write_text(path, rng, size, words):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        written = 0
+        while written < size:
+            line = ' '.join(rng.choices(words, k=12)) + '\n'
+            f.write(line)
+            written += len(line)
+
+def _write_binary(path, rng, size, compressible=0.0):
+    """compressible 비율만큼은 반복되는 바이트, 나머지는 난수 (실행 파일/이미지 흉내)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining > 0:
+            block = min(remaining, 1024 * 1024)
+            repeated = int(block * compressible)
+            f.write(b'\x00\x90' * (repeated // 2) + rng.randbytes(block - repeated // 2 * 2))
+            remaining -= block
+
+def make_sample_project(root, scale=1, seed=0):
+    """src/, build/, dist/가 있는 샘플 프로젝트 생성"""
+    rng = random.Random(seed)
+    words = "def class return import self value backup drive folder memory config path file".split()
+    for i in range(200 * scale):
+        _write_text(os.path.join(root, 'src', f'pkg{i % 10}', f'module_{i}.py'), rng, rng.randint(2_000, 40_000), words)
+    for i in range(400 * scale):
+        _write_text(os.path.join(root, 'build', 'memory-vault', f'xref_{i}.toc'), rng, rng.randint(5_000, 80_000), words)
+    for i in range(100 * scale):
+        _write_binary(os.path.join(root, 'build', 'memory-vault', f'lib_{i}.pyc'), rng, rng.randint(2_000, 60_000), 0.6)
+    _write_binary(os.path.join(root, 'build', 'memory-vault', 'base_library.zip'), rng, 8 * 1024 * 1024 * scale)
+    _write_binary(os.path.join(root, 'dist', 'memory-vault.exe'), rng, 40 * 1024 * 1024 * scale, 0.05)
+    _write_binary(os.path.join(root, 'dist', 'icon.ico'), rng, 200 * 1024)
+    _write_binary(os.path.join(root, 'docs', 'screenshot.webp'), rng, 2 * 1024 * 1024)
+    for i in range(20 * scale):
+        _write_text(os.path.join(root, 'logs', f'app_{i}.log'), rng, 200_000, words)
+    with open(os.path.join(root, '.gitignore'), 'w', encoding='utf-8') as f:
+        f.write("*.log\n.venv/\n")
+
+def legacy_files(project_root):
+    """기존 backup_project의 os.walk (versions, __pycache__, .git만 제외)"""
+    for root, dirs, files in os.walk(project_root):
+        for name in ('versions', '__pycache__', '.git'):
+            if name in dirs:
+                dirs.remove(name)
+        for file in files:
+            file_path = os.path.join(root, file)
+            yield file_path, os.path.relpath(file_path, project_root).replace(os.sep, '/')
+
+def legacy_archive(members, backup_path):
+    """기존 backup_project 방식: 한 파일씩 ZIP_DEFLATED로 압축"""
+    with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for file_path, rel_path in members:
+            zipf.write(file_path, rel_path)
+    return backup_path
+
+def parallel_archive(members, backup_path, workers):
+    """같은 파일 목록을 병렬 압축으로 기록"""
+    with RawZipWriter(backup_path) as writer:
+        for _ in write_members(writer, members, workers=workers):
+            pass
+    return backup_path
+
+def measure(fn):
+    """(압축 파일 크기, wall 시간) 반환, 결과 zip이 올바른지도 확인"""
+    start = time.perf_counter()
+    path = fn()
+    wall = time.perf_counter() - start
+    with zipfile.ZipFile(path) as zipf:
+        bad = zipf.testzip()
+        if bad:
+            raise RuntimeError(f"{path}: {bad} CRC mismatch")
+    size = os.path.getsize(path)
+    os.remove(path)
+    return size, wall
+
+def main():
+    parser = argparse.ArgumentParser(description="프로젝트 백업 압축 벤치마크")
+    parser.add_argument('path', nargs='?', help="측정할 프로젝트 경로 (없으면 샘플 생성)")
+    parser.add_argument('--scale', type=int, default=1, help="샘플 프로젝트 크기 배수")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, os.cpu_count() or 1],
+                        help="비교할 작업자 프로세스 수")
+    args = parser.parse_args()
+
+    sample_root = None
+    project_root = args.path
+    if not project_root:
+        sample_root = tempfile.mkdtemp(prefix='bench_project_')
+        make_sample_project(sample_root, args.scale)
+        project_root = sample_root
+
+    os.environ['PROJECT_PATH'] = project_root
+    fd, archive_path = tempfile.mkstemp(suffix='.zip')
+    os.close(fd)
+    try:
+        members = list(legacy_files(project_root))
+        total = sum(os.path.getsize(path) for path, _ in members)
+        print(f"project: {project_root} ({len(members)} files, {total / 1024 / 1024:.1f} MB)")
+        print(f"{'method':<18}{'size MB':>10}{'wall s':>9}{'MB/s':>9}")
+
+        def report(label, size, wall):
+            print(f"{label:<18}{size / 1024 / 1024:>10.1f}{wall:>9.2f}{total / 1024 / 1024 / wall:>9.1f}")
+
+        report('serial zipfile', *measure(lambda: legacy_archive(members, archive_path)))
+        for workers in sorted(set(args.workers)):
+            report(f"parallel x{workers}", *measure(lambda: parallel_archive(members, archive_path, workers)))
+
+        def run_backup():
+            success, result = backup.backup_project()
+            if not success:
+                raise RuntimeError(result)
+            return result
+        # 제외 규칙으로 읽지 않은 파일까지 포함한 전체 트리 기준 MB/s
+        report('backup_project', *measure(run_backup))
+    finally:
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+        if sample_root:
+            shutil.rmtree(sample_root)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,522 @@
+"""
+구글 계정 없이 백업/복원을 돌려볼 수 있는 로컬 Drive v3 대역 (벤치마크/테스트 전용, exe에는 포함되지 않음)
+
+DriveBackupManager와 FolderManager가 쓰는 범위만 흉내 냄
+- files().list/get/create/update/delete (q 검색: name, mimeType, parents, trashed, appProperties has)
+- multipart/resumable 업로드 (세션 URI, 308 + Range로 이어 올리기), Range 다운로드
+- revisions().list/get/update, 배치 요청
+
+두 가지 방식으로 붙일 수 있음
+- in-process: build_fake_service(backend)로 만든 서비스를 drive_service로 주입 (소켓 없음)
+- localhost HTTP 서버: FakeDriveServer(backend)를 띄우고 실제 전송(httplib2, SessionHttp)으로 호출
+
+사용 예:
+    backend = FakeDriveBackend(latency=0.05, bandwidth=2 * 1024 * 1024)
+    manager = DriveBackupManager()
+    manager.service_factory = lambda: build_fake_service(backend)
+    manager.connect()
+    manager.backup_memory_file('memory.json')
+    requests = backend.stats['requests']
+"""
+import email.parser
+import hashlib
+import itertools
+import json
+import re
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# googleapiclient가 만드는 요청 경로 (upload/ 접두사, 파일 ID, 리비전 ID)
+_FILES_PATH = re.compile(r'/(upload/)?drive/v3/files(?:/([^/]+))?(?:/revisions(?:/([^/]+))?)?')
+
+# 지원하는 q 검색 조건 (and로만 연결)
+_CLAUSE = re.compile(
+    r"\s*(?:"
+    r"(?P<field>name|mimeType)\s*(?P<op>=|!=|contains)\s*'(?P<value>(?:[^'\\]|\\.)*)'"
+    r"|'(?P<parent>[^']*)'\s+in\s+parents"
+    r"|trashed\s*=\s*(?P<trashed>true|false)"
+    r"|appProperties\s+has\s+\{\s*key='(?P<akey>[^']*)'\s+and\s+value='(?P<avalue>[^']*)'\s*\}"
+    r")\s*(?:and\b|$)"
+)
+
+def _now():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+def _compile_query(q):
+    """q 문자열을 파일 dict -> bool 함수로 변환 (지원하지 않는 조건이면 ValueError)"""
+    predicates = []
+    pos = 0
+    q = q or ''
+    while pos < len(q):
+        m = _CLAUSE.match(q, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Unsupported query: {q[pos:]}")
+        pos = m.end()
+        if m.group('field'):
+            field, op, value = m.group('field'), m.group('op'), m.group('value').replace("\\'", "'")
+            if op == '=':
+                predicates.append(lambda f, field=field, value=value: f[field] == value)
+            elif op == '!=':
+                predicates.append(lambda f, field=field, value=value: f[field] != value)
+            else:
+                predicates.append(lambda f, field=field, value=value: value in f[field])
+        elif m.group('parent') is not None:
+            predicates.append(lambda f, parent=m.group('parent'): parent in f['parents'])
+        elif m.group('trashed'):
+            predicates.append(lambda f, trashed=m.group('trashed') == 'true': f['trashed'] == trashed)
+        else:
+            predicates.append(lambda f, key=m.group('akey'), value=m.group('avalue'):
+                              f['appProperties'].get(key) == value)
+    return lambda f: all(p(f) for p in predicates)
+
+class FakeDriveBackend:
+    """
+    메모리에 파일/리비전/업로드 세션을 저장하는 Drive v3 대역
+
+    stats로 요청 수와 주고받은 바이트를 세고, latency/bandwidth로 네트워크 지연을 흉내 냄
+    fail_next에 (status, reason)을 넣으면 다음 요청부터 차례로 그 에러를 돌려줌 (재시도 확인용)
+    """
+
+    def __init__(self, latency=0.0, bandwidth=None):
+        """
+        FakeDriveBackend 초기화
+
+        Args:
+            latency (float): 요청 하나의 왕복 지연 (초, 요청/응답에 반씩)
+            bandwidth (float): 초당 전송 바이트 (None이면 무제한)
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.files = {}
+        self.sessions = {}
+        self.fail_next = []
+        self.lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """요청 수/바이트 통계 초기화"""
+        with self.lock:
+            self.stats = {'requests': 0, 'bytes_received': 0, 'bytes_sent': 0, 'calls': Counter()}
+
+    def _new_id(self, prefix='f'):
+        return f"{prefix}{next(self._ids)}"
+
+    def _add_revision(self, file, content):
+        revision = {
+            'id': self._new_id('r'),
+            'modifiedTime': _now(),
+            'size': str(len(content)),
+            'md5Checksum': hashlib.md5(content).hexdigest(),
+            'keepForever': False,
+            'content': content
+        }
+        file['revisions'].append(revision)
+        file['content'] = content
+        file['modifiedTime'] = revision['modifiedTime']
+
+    def create_file(self, metadata, content=None):
+        """파일 생성 (테스트에서 미리 파일을 깔아둘 때도 사용)"""
+        now = _now()
+        file = {
+            'id': self._new_id(),
+            'name': metadata.get('name', 'Untitled'),
+            'mimeType': metadata.get('mimeType', 'application/octet-stream'),
+            'parents': metadata.get('parents', []),
+            'appProperties': dict(metadata.get('appProperties') or {}),
+            'trashed': False,
+            'createdTime': now,
+            'modifiedTime': now,
+            'revisions': [],
+            'content': None
+        }
+        if content is not None:
+            self._add_revision(file, content)
+        with self.lock:
+            self.files[file['id']] = file
+        return file
+
+    def _update(self, file, metadata, content=None):
+        for key in ('name', 'mimeType', 'trashed'):
+            if key in metadata:
+                file[key] = metadata[key]
+        # appProperties는 키 단위로 합치고 None이면 삭제 (Drive와 같은 동작)
+        for key, value in (metadata.get('appProperties') or {}).items():
+            if value is None:
+                file['appProperties'].pop(key, None)
+            else:
+                file['appProperties'][key] = value
+        if content is not None:
+            self._add_revision(file, content)
+        else:
+            file['modifiedTime'] = _now()
+        return file
+
+    @staticmethod
+    def resource(file):
+        """API 응답 형식의 파일 정보 (fields는 무시하고 전부 돌려줌)"""
+        result = {k: v for k, v in file.items() if k not in ('revisions', 'content')}
+        result['kind'] = 'drive#file'
+        if file['content'] is not None:
+            result['size'] = str(len(file['content']))
+            result['md5Checksum'] = hashlib.md5(file['content']).hexdigest()
+            result['headRevisionId'] = file['revisions'][-1]['id']
+        return result
+
+    def handle(self, method, uri, headers=None, body=None):
+        """
+        HTTP 요청 하나 처리
+
+        Args:
+            method (str): HTTP 메서드
+            uri (str): 전체 URI (업로드 세션 URI는 같은 scheme/host로 돌려줌)
+            headers (dict): 요청 헤더
+            body (bytes | str | file-like): 요청 본문
+
+        Returns:
+            tuple: (status, 응답 헤더 dict, 응답 본문 bytes)
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        if hasattr(body, 'read'):
+            body = body.read()
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        body = body or b''
+
+        self._simulate(len(body))
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['bytes_received'] += len(body)
+            if self.fail_next:
+                status, reason = self.fail_next.pop(0)
+                status, resp_headers, content = self._error(status, reason)
+            else:
+                status, resp_headers, content = self._route(method, uri, headers, body)
+            self.stats['bytes_sent'] += len(content)
+        self._simulate(len(content))
+        return status, resp_headers, content
+
+    def _simulate(self, size):
+        delay = self.latency / 2
+        if self.bandwidth:
+            delay += size / self.bandwidth
+        if delay:
+            time.sleep(delay)
+
+    @staticmethod
+    def _json(status, obj):
+        return status, {'content-type': 'application/json; charset=UTF-8'}, json.dumps(obj).encode('utf-8')
+
+    def _error(self, status, reason, message=''):
+        return self._json(status, {'error': {
+            'code': status,
+            'message': message or reason,
+            'errors': [{'reason': reason, 'message': message or reason}]
+        }})
+
+    def _count(self, method, kind):
+        self.stats['calls'][f"{method} {kind}"] += 1
+
+    def _route(self, method, uri, headers, body):
+        parsed = urllib.parse.urlparse(uri)
+        path = parsed.path
+        params = {k: v[-1] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+
+        if path.startswith('/session/'):
+            self._count(method, 'upload session')
+            return self._session_put(path.split('/')[-1], headers, body)
+        if path.startswith('/batch'):
+            return self._batch(f"{parsed.scheme}://{parsed.netloc}", headers, body)
+
+        m = _FILES_PATH.fullmatch(path)
+        if not m:
+            return self._error(404, 'notFound', path)
+        upload, file_id, revision_id = m.group(1), m.group(2), m.group(3)
+        file_id = urllib.parse.unquote(file_id) if file_id else None
+        self._count(method, 'upload' if upload else ('revisions' if '/revisions' in path else 'files'))
+
+        if file_id and file_id not in self.files:
+            return self._error(404, 'notFound', f"File not found: {file_id}")
+        file = self.files.get(file_id)
+
+        if '/revisions' in path:
+            return self._revisions(method, file, revision_id, params, headers, body)
+        if upload:
+            return self._upload(f"{parsed.scheme}://{parsed.netloc}", file, params, headers, body)
+
+        if method == 'GET' and file is None:
+            return self._list(params)
+        if method == 'POST' and file is None:
+            return self._json(200, self.resource(self.create_file(json.loads(body or b'{}'))))
+        if method == 'GET':
+            if params.get('alt') == 'media':
+                return self._media(file['content'] or b'', headers)
+            return self._json(200, self.resource(file))
+        if method == 'PATCH':
+            return self._json(200, self.resource(self._update(file, json.loads(body or b'{}'))))
+        if method == 'DELETE':
+            del self.files[file_id]
+            return 204, {}, b''
+        return self._error(405, 'methodNotAllowed', method)
+
+    def _revisions(self, method, file, revision_id, params, headers, body):
+        if revision_id is None:
+            return self._json(200, {'revisions': [
+                {k: v for k, v in revision.items() if k != 'content'} for revision in file['revisions']
+            ]})
+        revision = next((r for r in file['revisions'] if r['id'] == revision_id), None)
+        if revision is None:
+            return self._error(404, 'notFound', f"Revision not found: {revision_id}")
+        if method == 'PATCH':
+            changes = json.loads(body or b'{}')
+            if 'keepForever' in changes:
+                revision['keepForever'] = changes['keepForever']
+        if params.get('alt') == 'media':
+            return self._media(revision['content'], headers)
+        return self._json(200, {k: v for k, v in revision.items() if k != 'content'})
+
+    def _upload(self, base_url, file, params, headers, body):
+        upload_type = params.get('uploadType')
+        if upload_type == 'multipart':
+            metadata, content = self._parse_multipart(headers, body)
+        elif upload_type == 'media':
+            metadata, content = {}, bytes(body)
+        elif upload_type == 'resumable':
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = {
+                'file_id': file['id'] if file else None,
+                'metadata': json.loads(body) if body else {},
+                'data': bytearray()
+            }
+            return 200, {'location': f"{base_url}/session/{session_id}"}, b''
+        else:
+            return self._error(400, 'badRequest', f"Unknown uploadType: {upload_type}")
+
+        if file:
+            return self._json(200, self.resource(self._update(file, metadata, content)))
+        return self._json(200, self.resource(self.create_file(metadata, content)))
+
+    @staticmethod
+    def _parse_multipart(headers, body):
+        boundary = re.search(r'boundary="?([^";]+)"?', headers['content-type']).group(1).encode()
+        parts = []
+        for raw in body.split(b'--' + boundary)[1:]:
+            if raw.startswith(b'--'):
+                break
+            head, sep, content = raw.partition(b'\r\n\r\n')
+            if not sep:
+                head, sep, content = raw.partition(b'\n\n')
+            if content.endswith(b'\r\n'):
+                content = content[:-2]
+            elif content.endswith(b'\n'):
+                content = content[:-1]
+            parts.append(content)
+        return json.loads(parts[0] or b'{}'), bytes(parts[1]) if len(parts) > 1 else b''
+
+    def _list(self, params):
+        match = _compile_query(params.get('q'))
+        found = sorted((f for f in self.files.values() if match(f)), key=lambda f: f['createdTime'])
+        page_size = int(params.get('pageSize', 100))
+        start = int(params.get('pageToken') or 0)
+        result = {'files': [self.resource(f) for f in found[start:start + page_size]]}
+        if start + page_size < len(found):
+            result['nextPageToken'] = str(start + page_size)
+        return self._json(200, result)
+
+    @staticmethod
+    def _media(content, headers):
+        total = len(content)
+        range_header = headers.get('range')
+        if not range_header:
+            return 200, {'content-type': 'application/octet-stream'}, content
+        start, end = (int(x) for x in range_header.split('=')[1].split('-'))
+        if start >= total and total:
+            return 416, {'content-range': f'bytes */{total}'}, b''
+        end = min(end, total - 1)
+        return 206, {'content-range': f'bytes {start}-{end}/{total}'}, content[start:end + 1]
+
+    def _session_put(self, session_id, headers, body):
+        session = self.sessions.get(session_id)
+        if session is None:
+            return self._error(404, 'notFound', 'Upload session expired')
+        content_range = headers.get('content-range')
+        m = re.fullmatch(r'bytes (?:(\d+)-(\d+)|\*)/(\d+|\*)', content_range) if content_range else None
+        total = m.group(3) if m else None
+        if m and m.group(1) is not None:
+            # 서버에 반영된 곳부터가 아니면 받지 않고 현재 오프셋만 알려줌
+            if int(m.group(1)) != len(session['data']):
+                return 308, self._range_header(session), b''
+            session['data'].extend(body)
+        elif not m:
+            session['data'].extend(body)
+            total = str(len(session['data']))
+        if total not in (None, '*') and len(session['data']) >= int(total):
+            return self._finish(session_id, session)
+        return 308, self._range_header(session), b''
+
+    @staticmethod
+    def _range_header(session):
+        return {'range': f"bytes=0-{len(session['data']) - 1}"} if session['data'] else {}
+
+    def _finish(self, session_id, session):
+        del self.sessions[session_id]
+        content = bytes(session['data'])
+        if not session['file_id']:
+            return self._json(200, self.resource(self.create_file(session['metadata'], content)))
+        file = self.files.get(session['file_id'])
+        if file is None:
+            return self._error(404, 'notFound', f"File not found: {session['file_id']}")
+        return self._json(200, self.resource(self._update(file, session['metadata'], content)))
+
+    def _batch(self, base_url, headers, body):
+        message = email.parser.BytesParser().parsebytes(
+            b'content-type: ' + headers['content-type'].encode() + b'\r\n\r\n' + body)
+        boundary = uuid.uuid4().hex
+        parts = []
+        for part in message.get_payload():
+            raw = part.get_payload(decode=False)
+            head, _, sub_body = raw.replace('\r\n', '\n').partition('\n\n')
+            lines = head.split('\n')
+            method, target, _ = lines[0].split(' ', 2)
+            sub_headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+            status, resp_headers, content = self._route(
+                method, base_url + target, {k.lower(): v for k, v in sub_headers.items()}, sub_body.encode('utf-8'))
+            resp_headers = dict(resp_headers, **{'content-length': str(len(content))})
+            resp_lines = [f'HTTP/1.1 {status} OK'] + [f'{k}: {v}' for k, v in resp_headers.items()]
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: {part['Content-ID'].replace('<', '<response-', 1)}\r\n\r\n"
+                + '\r\n'.join(resp_lines) + '\r\n\r\n' + content.decode('utf-8') + '\r\n'
+            )
+        payload = ''.join(parts) + f'--{boundary}--'
+        return 200, {'content-type': f'multipart/mixed; boundary={boundary}'}, payload.encode('utf-8')
+
+class FakeHttp:
+    """소켓 없이 FakeDriveBackend를 바로 부르는 httplib2.Http 대역"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def request(self, uri, method='GET', body=None, headers=None, redirections=5, connection_type=None):
+        """httplib2.Http.request와 같은 인터페이스"""
+        import httplib2
+
+        status, resp_headers, content = self.backend.handle(method, uri, headers, body)
+        info = {'status': str(status)}
+        info.update(resp_headers)
+        return httplib2.Response(info), content
+
+    def close(self):
+        pass
+
+def _discovery_document(root_url=None):
+    """정적 Drive v3 discovery 문서 (root_url을 주면 모든 요청이 그 주소로 가도록 고침)"""
+    from googleapiclient import discovery_cache
+
+    document = discovery_cache.get_static_doc('drive', 'v3')
+    if root_url is None:
+        return document
+    # 배치 요청은 client_options가 아니라 문서의 rootUrl을 쓰므로 문서 자체를 고침
+    data = json.loads(document)
+    data['rootUrl'] = root_url
+    data['mtlsRootUrl'] = root_url
+    return json.dumps(data)
+
+def build_fake_service(backend, http=None):
+    """
+    FakeDriveBackend에 바로 연결된 Drive 서비스 (in-process)
+
+    Args:
+        backend (FakeDriveBackend): 가짜 Drive
+        http: 요청을 보낼 전송 객체 (None이면 FakeHttp)
+    """
+    from googleapiclient.discovery import build_from_document
+
+    return build_from_document(_discovery_document(), http=http or FakeHttp(backend))
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, headers, content = self.server.backend.handle(
+            self.command, self.server.url + self.path, dict(self.headers.items()), body)
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _dispatch
+
+    def log_message(self, format, *args):
+        # 요청마다 stderr에 찍히는 접근 로그는 끔
+        pass
+
+class FakeDriveServer:
+    """
+    FakeDriveBackend를 localhost HTTP 서버로 띄움 (실제 소켓/전송 객체를 거치는 측정용)
+
+    사용 예:
+        with FakeDriveServer(FakeDriveBackend()) as server:
+            service = server.build_service()
+    """
+
+    def __init__(self, backend, host='127.0.0.1', port=0):
+        """
+        FakeDriveServer 초기화 (port=0이면 빈 포트를 골라 씀)
+
+        Args:
+            backend (FakeDriveBackend): 가짜 Drive
+            host (str): 바인드할 주소
+            port (int): 바인드할 포트
+        """
+        self.backend = backend
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.backend = backend
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self.httpd.url = self.url
+        self._thread = None
+
+    def start(self):
+        """백그라운드 스레드에서 요청 처리 시작"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-drive', daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """서버 종료"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def build_service(self, http=None):
+        """
+        이 서버로 요청을 보내는 Drive 서비스
+
+        Args:
+            http: 전송 객체 (SessionHttp 등, None이면 서비스마다 새 httplib2.Http)
+        """
+        from googleapiclient.discovery import build_from_document
+        from googleapiclient.http import build_http
+
+        # build_http는 재개 가능한 업로드의 308을 리다이렉트로 따라가지 않게 설정된 httplib2.Http
+        return build_from_document(_discovery_document(f"{self.url}/"), http=http or build_http())
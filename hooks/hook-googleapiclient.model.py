@@ -0,0 +1,6 @@
+# PyInstaller 기본 hook은 googleapiclient의 discovery 문서 전체(수백 개, 약 90MB)를 넣어서
+# --onefile exe가 실행할 때마다 그만큼 압축을 풀어야 함 -> 이 프로젝트가 쓰는 Drive v3 문서만 포함
+from PyInstaller.utils.hooks import collect_data_files, copy_metadata
+
+datas = copy_metadata('google_api_python_client')
+datas += collect_data_files('googleapiclient.discovery_cache', includes=['documents/drive.v3.json'])
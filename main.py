@@ -1,58 +1,81 @@
-from src.backup_manager import DriveBackupManager
-from src.folder_manager import FolderManager
-from src.config import config
-import logging
-import warnings
-import os
-import sys
-from googleapiclient.discovery import logger as googleapiclient_logger
-from datetime import datetime
-from dotenv import load_dotenv
-import ctypes
+from src.utils.startup_timer import startup_timer
+from src.utils.run_metrics import run_metrics
 
-# Load environment variables
-load_dotenv()
-project_name = os.getenv('PROJECT_NAME')
+# 시작 시간 측정: google 인증/API 모듈은 authenticate()에서, 하위 명령 전용 모듈은 그 명령에서 필요할 때 import
+with startup_timer.phase('imports'):
+    from src.backup_manager import DriveBackupManager
+    from src.folder_manager import FolderManager
+    from src.utils.logger import setup_logging
+    from src.config import config, project_name  # config가 .env를 한 번 읽음
+    import argparse
+    import logging
+    import warnings
+    import os
+    import sys
+    from datetime import datetime
 
 def show_message_box(title, message, style=0):
     """메시지 박스 표시 (exe 모드에서만)"""
     if getattr(sys, 'frozen', False):
+        import ctypes
         return ctypes.windll.user32.MessageBoxW(0, message, title, style)
 
-# 구글 API 클라이언트의 불필요한 경고 메시지 숨기기
-googleapiclient_logger.setLevel(logging.ERROR)
+# 구글 API 클라이언트의 불필요한 경고 메시지 숨기기 (로거 이름만 쓰므로 googleapiclient를 import하지 않음)
+logging.getLogger('googleapiclient.discovery').setLevel(logging.ERROR)
 
-# Get the application path (works for both script and frozen exe)
-if getattr(sys, 'frozen', False):
-    application_path = os.path.dirname(sys.executable)
-else:
-    application_path = os.path.dirname(os.path.abspath(__file__))
-
-# 로그 디렉토리 생성
-log_dir = os.path.join(application_path, project_name, "logs")
-os.makedirs(log_dir, exist_ok=True)
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(log_dir, f"{project_name}.log")),
-        logging.StreamHandler()
-    ]
+# 로깅 설정 (파일 쓰기는 큐 리스너 스레드에서, 크기/시간 기준 회전 후 이전 파일은 gzip 압축)
+log_dir = str(config.LOG_DIR)
+setup_logging(
+    log_dir,
+    project_name,
+    max_bytes=config.LOG_MAX_BYTES,
+    backup_count=config.LOG_BACKUP_COUNT,
+    when=config.LOG_ROTATE_WHEN
 )
 logger = logging.getLogger(project_name)
 
+def export_run_metrics(success, skipped=False):
+    """이번 백업의 단계별 지표를 로그에 남기고 metrics.jsonl/Prometheus 파일로 내보냄"""
+    logger.info(f"Phases: {run_metrics.report()}")
+    try:
+        if config.METRICS_EXPORT:
+            run_metrics.write_json_line(
+                os.path.join(log_dir, 'metrics.jsonl'),
+                status='success' if success else 'failure',
+                skipped=skipped,
+                mode=config.BACKUP_MODE
+            )
+        if config.METRICS_PROMETHEUS_PATH:
+            run_metrics.write_prometheus(config.METRICS_PROMETHEUS_PATH, success, labels={'mode': config.BACKUP_MODE})
+    except OSError as e:
+        # 지표를 못 남겨도 백업 결과는 그대로
+        logger.warning(f"Failed to export metrics: {e}")
+
 def main():
+    success = False
+    manager = None
     try:
         # 백업 매니저 초기화
         manager = DriveBackupManager(config.CREDENTIALS_PATH)
         
         # 인증 및 백업 실행
         manager.authenticate()
+        logger.info(f"Startup: {startup_timer.report()}")
+        
+        if config.BACKUP_PATHS:
+            backup_many(manager)
+            success = True
+            return
+        
         file_id = manager.backup_memory_file(config.MEMORY_SOURCE_PATH, config.DRIVE_FOLDER_NAME)
+        success = True
+        if config.RETENTION_AUTO_PRUNE and not manager.last_backup_skipped:
+            manager.apply_retention(config.DRIVE_FOLDER_NAME)
         
-        success_msg = f"백업이 성공적으로 완료되었습니다.\nFile ID: {file_id}"
+        if manager.last_backup_skipped:
+            success_msg = f"변경 사항이 없어 백업을 건너뛰었습니다.\nFile ID: {file_id}"
+        else:
+            success_msg = f"백업이 성공적으로 완료되었습니다.\nFile ID: {file_id}"
         logger.info(success_msg)
         show_message_box("백업 성공", success_msg)
         
@@ -61,6 +84,218 @@ def main():
         logger.error(error_msg)
         show_message_box("백업 실패", error_msg, 0x10)  # 0x10 = MB_ICONERROR
         raise
+    finally:
+        export_run_metrics(success, skipped=bool(manager and manager.last_backup_skipped))
+
+def backup_many(manager):
+    """config.BACKUP_PATHS의 파일들을 동시에 백업하고 파일별 결과 표시"""
+    results = manager.backup_many(config.BACKUP_PATHS, config.DRIVE_FOLDER_NAME, config.BACKUP_WORKERS)
+    
+    lines = []
+    for result in results:
+        if not result.success:
+            lines.append(f"[실패] {result.file_name}: {result.error}")
+        elif result.skipped:
+            lines.append(f"[변경 없음] {result.file_name}")
+        else:
+            lines.append(f"[완료] {result.file_name} ({result.seconds:.1f}s) File ID: {result.file_id}")
+    summary = "\n".join(lines)
+    
+    if any(not result.success for result in results):
+        raise Exception(f"일부 파일 백업 실패\n{summary}")
+    
+    logger.info(summary)
+    show_message_box("백업 성공", summary)
+
+def watch(debounce_seconds=config.WATCH_DEBOUNCE_SECONDS, use_inotify=True):
+    """인증된 매니저 하나를 유지하면서 memory.json이 바뀔 때마다 백업"""
+    from src.watcher import MemoryFileWatcher
+    
+    manager = DriveBackupManager(config.CREDENTIALS_PATH)
+    manager.authenticate()
+    
+    def backup():
+        success = False
+        try:
+            file_id = manager.backup_memory_file(config.MEMORY_SOURCE_PATH, config.DRIVE_FOLDER_NAME)
+            success = True
+        finally:
+            # 백업 한 번이 지표 한 줄 (첫 줄에는 인증 시간도 들어감)
+            export_run_metrics(success, skipped=success and manager.last_backup_skipped)
+            run_metrics.reset()
+        if manager.last_backup_skipped:
+            logger.info(f"No changes to back up. File ID: {file_id}")
+        else:
+            logger.info(f"Backup completed. File ID: {file_id}")
+    
+    # 감시 시작 전에 놓친 변경이 있을 수 있으니 한 번 백업
+    backup()
+    
+    watcher = MemoryFileWatcher(
+        config.MEMORY_SOURCE_PATH,
+        backup,
+        debounce_seconds=debounce_seconds,
+        poll_interval=config.WATCH_POLL_INTERVAL,
+        use_inotify=use_inotify
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info("Watch mode stopped")
+
+def prune(dry_run=False):
+    """보관 정책에 따라 오래된 memory_*.json 백업 삭제"""
+    manager = DriveBackupManager(config.CREDENTIALS_PATH)
+    manager.authenticate()
+    deleted = manager.apply_retention(config.DRIVE_FOLDER_NAME, dry_run=dry_run)
+    for backup in deleted:
+        print(f"{'[dry-run] ' if dry_run else ''}deleted {backup['name']}")
+    print(f"{len(deleted)} backups {'would be ' if dry_run else ''}deleted")
+
+def restore(at=None, dest_path=None, list_only=False):
+    """드라이브 백업으로 memory.json 복원 (at을 주면 그 시각 이전의 가장 최근 백업)"""
+    manager = DriveBackupManager(config.CREDENTIALS_PATH)
+    manager.authenticate()
+    
+    if list_only:
+        for point in manager.list_restore_points(config.DRIVE_FOLDER_NAME):
+            print(f"{point['time']}  {point['size'] or '-':>10}  {point['name']}"
+                  f"{' @' + point['revision_id'] if point['revision_id'] else ''}")
+        return
+    
+    restored_path = manager.restore(dest_path, at=at, folder_name=config.DRIVE_FOLDER_NAME)
+    success_msg = f"복원이 완료되었습니다.\n{restored_path}"
+    logger.info(success_msg)
+    show_message_box("복원 성공", success_msg)
+
+def validate(path=None):
+    """memory.json 형식/스키마 검증 결과와 처리 속도 출력"""
+    from src.validator import MemoryFileValidationError, validate_memory_file
+    
+    path = path or config.MEMORY_SOURCE_PATH
+    try:
+        report = validate_memory_file(path)
+    except MemoryFileValidationError as e:
+        print(e)
+        sys.exit(1)
+    print(f"OK: {report}")
+
+def catalog_command(args):
+    """로컬 카탈로그 조회 (list/show는 네트워크 없이 동작)"""
+    from src.catalog import BackupCatalog
+    
+    catalog = BackupCatalog(config.CATALOG_PATH)
+    
+    if args.catalog_command == 'resync':
+        manager = DriveBackupManager(config.CREDENTIALS_PATH)
+        manager.authenticate()
+        count = manager.resync_catalog(config.DRIVE_FOLDER_NAME)
+        print(f"{count} backups recorded from Drive")
+    elif args.catalog_command == 'show':
+        entry = catalog.show(args.key)
+        if not entry:
+            print(f"'{args.key}'에 해당하는 백업이 없어요")
+            return
+        for key, value in entry.items():
+            print(f"{key:<12} {value}")
+    else:
+        entries = catalog.list(source_path=args.source, since=args.since, until=args.until, limit=args.limit)
+        print(f"{'id':>5}  {'created_at':<20}  {'kind':<8}  {'size':>10}  {'md5':<32}  name")
+        for entry in entries:
+            size = entry['size'] if entry['size'] is not None else '-'
+            print(f"{entry['id']:>5}  {entry['created_at']:<20}  {entry['kind'] or '-':<8}  "
+                  f"{size:>10}  {entry['md5'] or '-':<32}  {entry['name']}")
+
+def history_command(args):
+    """엔티티/관찰 변경 이력 조회 (entity/search는 네트워크 없이 동작)"""
+    from src.history_index import HistoryIndex
+    
+    history = HistoryIndex(config.HISTORY_INDEX_PATH)
+    
+    if args.history_command == 'rebuild':
+        manager = DriveBackupManager(config.CREDENTIALS_PATH)
+        manager.authenticate()
+        count = manager.rebuild_history(config.DRIVE_FOLDER_NAME)
+        print(f"{count} versions indexed from Drive")
+    elif args.history_command == 'entity':
+        events = history.entity_history(args.name)
+        if not events:
+            print(f"'{args.name}'의 이력이 없어요")
+        for event in events:
+            target = f"{event['subject']} -> {event['object']}" if event['kind'] == 'relation' else event['subject']
+            print(f"{event['created_at']}  {event['action']:<8}  {event['kind']:<12}  "
+                  f"{target}: {event['detail']}  ({event['name']})")
+    else:
+        matches = history.versions_with_observation(args.text)
+        if not matches:
+            print(f"'{args.text}'가 들어간 관찰이 없어요")
+        for match in matches:
+            versions = match['versions']
+            print(f"[{match['entity']}] {match['observation']}")
+            print(f"    {len(versions)} versions: {versions[0]['created_at']} ({versions[0]['name']}) ~ "
+                  f"{versions[-1]['created_at']} ({versions[-1]['name']})")
+
+def parse_args(argv=None):
+    """명령행 인자 파싱 (명령이 없으면 1회 백업)"""
+    parser = argparse.ArgumentParser(description="memory.json Google Drive 백업")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    subparsers.add_parser('backup', help="memory.json 1회 백업 (기본값)")
+    
+    watch_parser = subparsers.add_parser('watch', help="memory.json 변경 감시 후 자동 백업")
+    watch_parser.add_argument('--debounce', type=float, default=config.WATCH_DEBOUNCE_SECONDS,
+                              help="마지막 쓰기 후 백업까지 기다릴 시간 (초)")
+    watch_parser.add_argument('--poll', action='store_true',
+                              help="inotify 대신 mtime 폴링 사용")
+    
+    prune_parser = subparsers.add_parser('prune', help="보관 정책에 따라 오래된 백업 삭제")
+    prune_parser.add_argument('--dry-run', action='store_true',
+                              help="삭제하지 않고 대상만 출력")
+    
+    validate_parser = subparsers.add_parser('validate', help="memory.json 형식/스키마 검증")
+    validate_parser.add_argument('path', nargs='?', help="검증할 파일 (기본값: MEMORY_SOURCE_PATH)")
+    
+    restore_parser = subparsers.add_parser('restore', help="드라이브 백업으로 memory.json 복원")
+    restore_parser.add_argument('--at', help="이 시각(ISO 8601) 이전의 가장 최근 백업으로 복원 (기본값: 최신)")
+    restore_parser.add_argument('--dest', help="복원할 경로 (기본값: MEMORY_SOURCE_PATH)")
+    restore_parser.add_argument('--list', action='store_true',
+                                help="복원하지 않고 복원 가능한 백업 목록만 출력")
+    
+    catalog_parser = subparsers.add_parser('catalog', help="로컬 백업 카탈로그 조회")
+    catalog_subparsers = catalog_parser.add_subparsers(dest='catalog_command')
+    list_parser = catalog_subparsers.add_parser('list', help="백업 목록 (기본값)")
+    show_parser = catalog_subparsers.add_parser('show', help="백업 한 건 상세 정보")
+    show_parser.add_argument('key', help="카탈로그 ID, 파일 ID 또는 리비전 ID")
+    catalog_subparsers.add_parser('resync', help="Drive에서 카탈로그 다시 만들기")
+    for sub in (catalog_parser, list_parser):
+        sub.add_argument('--source', help="원본 파일 경로로 필터")
+        sub.add_argument('--since', help="이 시각(ISO 8601) 이후만")
+        sub.add_argument('--until', help="이 시각(ISO 8601) 이전만")
+        sub.add_argument('--limit', type=int, default=50, help="최대 개수")
+    
+    history_parser = subparsers.add_parser('history', help="엔티티/관찰 변경 이력 조회")
+    history_subparsers = history_parser.add_subparsers(dest='history_command', required=True)
+    entity_parser = history_subparsers.add_parser('entity', help="엔티티 하나의 추가/변경/삭제 이력")
+    entity_parser.add_argument('name', help="엔티티 이름")
+    search_parser = history_subparsers.add_parser('search', help="관찰 내용이 들어간 버전 찾기")
+    search_parser.add_argument('text', help="찾을 관찰 내용 (부분 일치)")
+    history_subparsers.add_parser('rebuild', help="Drive 백업을 내려받아 인덱스 다시 만들기")
+    
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.command == 'watch':
+        watch(args.debounce, use_inotify=not args.poll)
+    elif args.command == 'prune':
+        prune(args.dry_run)
+    elif args.command == 'validate':
+        validate(args.path)
+    elif args.command == 'restore':
+        restore(args.at, args.dest, list_only=args.list)
+    elif args.command == 'catalog':
+        catalog_command(args)
+    elif args.command == 'history':
+        history_command(args)
+    else:
+        main()
\ No newline at end of file
@@ -7,7 +7,7 @@ a = Analysis(
     binaries=[],
     datas=[('C:\\Users\\asahi\\PycharmProjects\\memory-vault\\credentials/*', 'memory-vault/credentials')],
     hiddenimports=['google.auth.transport.requests'],
-    hookspath=[],
+    hookspath=['C:\\Users\\asahi\\PycharmProjects\\memory-vault\\hooks'],
     hooksconfig={},
     runtime_hooks=[],
     excludes=[],
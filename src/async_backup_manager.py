@@ -0,0 +1,165 @@
+import asyncio
+import contextlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+if __name__ != "__main__":
+    from src.backup_manager import DriveBackupManager
+    from src.utils.run_metrics import run_metrics
+    from src.config import config
+else:
+    from backup_manager import DriveBackupManager
+    from utils.run_metrics import run_metrics
+    from config import config
+
+class AsyncDriveBackupManager:
+    """
+    이벤트 루프 안에서 쓰는 DriveBackupManager (백업/복원/폴더 API를 await로 호출)
+
+    로직은 DriveBackupManager를 그대로 쓰고, 막히는 Drive 호출은 작업자 스레드(asyncio.to_thread)에서 실행
+    - 동시에 실행하는 작업은 max_concurrency개까지 (나머지는 루프를 막지 않고 대기)
+    - 작업을 취소하면 스레드의 다음 Drive 호출(업로드/다운로드는 다음 청크) 전에 멈추고,
+      멈출 때까지 기다린 뒤 CancelledError를 올림 (올리던 업로드는 세션이 남아 다음 백업에서 이어서,
+      복원은 임시 파일만 지우고 원래 파일은 그대로)
+    - httplib2 전송은 공유 drive_service를 스레드 간에 같이 쓸 수 없어서 그걸 쓰는 작업은 하나씩 실행
+      (backup_many의 파일별 백업은 스레드마다 서비스를 따로 만들어서 동시에 실행)
+    """
+
+    def __init__(self, manager=None, max_concurrency=None, **kwargs):
+        """
+        AsyncDriveBackupManager 초기화
+
+        Args:
+            manager (DriveBackupManager): 감쌀 매니저 (None이면 kwargs로 새로 만듦)
+            max_concurrency (int): 동시에 실행할 작업 수 (None이면 config.BACKUP_WORKERS)
+            **kwargs: DriveBackupManager 인자 (credentials_path, backup_mode 등)
+        """
+        self.manager = manager or DriveBackupManager(**kwargs)
+        self.max_concurrency = max_concurrency or config.BACKUP_WORKERS
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._service_lock = asyncio.Lock()
+
+    async def _run(self, fn, *args, shared_service=True):
+        """
+        fn(*args)를 작업자 스레드에서 실행하고 결과 반환
+
+        Args:
+            fn: DriveBackupManager의 막히는 메서드
+            shared_service (bool): fn이 공유 drive_service를 쓰는지 (httplib2 전송이면 하나씩 실행)
+        """
+        async with self._semaphore:
+            lock = self._service_lock if shared_service and self.manager.http is None else contextlib.nullcontext()
+            async with lock:
+                scheduler = self.manager.scheduler
+                cancel_event = threading.Event()
+
+                def work():
+                    with scheduler.cancellable(cancel_event):
+                        return fn(*args)
+
+                task = asyncio.ensure_future(asyncio.to_thread(work))
+                try:
+                    return await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    scheduler.cancel(cancel_event)
+                    # 업로드 세션 저장, 임시 파일 삭제가 끝나도록 스레드가 멈출 때까지 기다림
+                    await asyncio.wait({task})
+                    if not task.cancelled() and task.exception() is not None:
+                        logger.info(f"{fn.__name__} cancelled: {task.exception()!r}")
+                    raise
+
+    async def authenticate(self):
+        """Google Drive API 인증 (토큰이 없으면 브라우저 로그인도 작업자 스레드에서 기다림)"""
+        await self._run(self.manager.authenticate, shared_service=False)
+
+    async def connect(self, http=None):
+        """
+        전송 객체로 Drive 서비스와 FolderManager 준비 (가짜 Drive에 붙일 때는 manager.service_factory를 바꾼 뒤 호출)
+
+        Args:
+            http: 모든 Drive 서비스가 공유할 전송 객체 (None이면 서비스마다 따로 만듦)
+        """
+        await self._run(self.manager.connect, http, shared_service=False)
+
+    async def get_or_create_folder(self, folder_name, parent_id=None):
+        """
+        폴더 가져오기 또는 생성
+
+        Args:
+            folder_name (str): 폴더 이름
+            parent_id (str): 상위 폴더 ID
+
+        Returns:
+            str: 폴더 ID
+        """
+        return await self._run(self.manager.folder_manager.get_or_create_folder, folder_name, parent_id)
+
+    async def backup_memory_file(self, source_path, folder_name=config.DRIVE_FOLDER_NAME, force=False,
+                                 file_name='memory.json'):
+        """
+        메모리 파일을 구글 드라이브에 백업
+
+        동시에 여러 번 불러도 섞이지 않도록 건너뛰었는지 여부를 last_backup_skipped 대신 호출마다 반환
+
+        Returns:
+            tuple: (업로드된 파일의 ID - 건너뛴 경우 기존 파일의 ID, 건너뛰었는지 여부)
+        """
+        return await self._run(self.manager._backup_file, source_path, folder_name, force, file_name)
+
+    async def backup_many(self, sources, folder_name=config.DRIVE_FOLDER_NAME, force=False):
+        """
+        여러 메모리 파일을 max_concurrency개씩 동시에 백업
+
+        Args:
+            sources (list | dict): 파일 경로 목록 (드라이브 이름은 파일 이름) 또는 {드라이브 이름: 경로}
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            force (bool): 내용이 같아도 강제로 백업할지 여부
+
+        Returns:
+            list: 파일별 BackupResult (sources 순서)
+        """
+        targets = self.manager._backup_targets(sources)
+        await self._run(self.manager._prepare_backup_folders, folder_name)
+
+        results = await asyncio.gather(*(
+            self._run(self._backup_target, target, folder_name, force, shared_service=False)
+            for target in targets
+        ))
+        logger.info(f"Batch backup finished: {sum(r.success for r in results)}/{len(results)} succeeded")
+        return results
+
+    def _backup_target(self, target, folder_name, force):
+        with run_metrics.phase('backup'), self.manager.scheduler.foreground():
+            return self.manager._backup_target(target, folder_name, force)
+
+    async def list_restore_points(self, folder_name=config.DRIVE_FOLDER_NAME, file_name='memory.json'):
+        """
+        복원할 수 있는 백업 목록 조회 (오래된 것부터)
+
+        Returns:
+            list: file_id, revision_id, name, time(UTC 문자열), size, md5Checksum을 담은 목록
+        """
+        return await self._run(self.manager.list_restore_points, folder_name, file_name)
+
+    async def restore(self, dest_path=None, at=None, folder_name=config.DRIVE_FOLDER_NAME, file_name='memory.json'):
+        """
+        최신(또는 특정 시점) 백업으로 memory.json 복원 (DriveBackupManager.restore와 같음)
+
+        Returns:
+            str: 복원된 파일 경로
+        """
+        return await self._run(self.manager.restore, dest_path, at, folder_name, file_name)
+
+    async def close(self):
+        """공유 연결 풀 닫기"""
+        if self.manager.http is not None:
+            self.manager.http.close()
+            self.manager.http = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -1,9 +1,19 @@
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+# google 인증/API 클라이언트 모듈은 import가 무거워서 실제로 필요한 메서드 안에서 import
+# (검증/이력 조회처럼 Drive를 쓰지 않는 명령과 exe 시작 시간을 줄이기 위해)
+from googleapiclient.errors import HttpError
+import hashlib
+import io
+import json
 import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 import logging
 
@@ -11,29 +21,163 @@ logger = logging.getLogger(__name__)
 
 if __name__ != "__main__":
     from src.folder_manager import FolderManager
+    from src.backup_state import BackupState
+    from src.catalog import BackupCatalog, normalize_time
+    from src.chunk_store import CHUNKS_FOLDER_NAME, MANIFEST_FORMAT, ChunkIndex, chunk_digest, iter_chunks
+    from src.history_index import HistoryIndex
+    from src.folder_manager import FOLDER_MIME_TYPE
+    from src import compression, memory_graph
+    from src.retention import RetentionPolicy, backup_name_pattern, parse_backup_time, select_backups_to_delete
+    from src.utils.file_utils import HashingWriter, file_md5, fsync_and_replace, stat_signature, temp_path_for
+    from src.validator import validate_memory_file
+    from src.utils.startup_timer import startup_timer
+    from src.utils.run_metrics import run_metrics
+    from src.transport import build_http
+    from src.scheduler import RequestScheduler, is_rate_limited
     from src.config import config
 else:
     from folder_manager import FolderManager
+    from backup_state import BackupState
+    from catalog import BackupCatalog, normalize_time
+    from chunk_store import CHUNKS_FOLDER_NAME, MANIFEST_FORMAT, ChunkIndex, chunk_digest, iter_chunks
+    from history_index import HistoryIndex
+    from folder_manager import FOLDER_MIME_TYPE
+    import compression, memory_graph
+    from retention import RetentionPolicy, backup_name_pattern, parse_backup_time, select_backups_to_delete
+    from utils.file_utils import HashingWriter, file_md5, fsync_and_replace, stat_signature, temp_path_for
+    from validator import validate_memory_file
+    from utils.startup_timer import startup_timer
+    from utils.run_metrics import run_metrics
+    from transport import build_http
+    from scheduler import RequestScheduler, is_rate_limited
     from config import config
 
+# 이름 변경으로 생긴 백업 파일 (예: memory_20241209134259.json)
+_ROTATED_NAME = re.compile(r'_\d{14}(\.[^.]*)?$')
+
+# 업로드 응답에서 받아 카탈로그에 기록할 필드
+UPLOAD_FIELDS = 'id, name, headRevisionId, size, createdTime, modifiedTime, appProperties'
+
+# 패키지에 들어있는 Drive v3 discovery 문서 (프로세스당 한 번만 읽음, 없으면 '')
+_drive_discovery_document = None
+
+def _load_drive_discovery_document():
+    """정적 Drive v3 discovery 문서 (없으면 None - 네트워크에서 받아야 함)"""
+    global _drive_discovery_document
+    if _drive_discovery_document is None:
+        from googleapiclient import discovery_cache
+        _drive_discovery_document = discovery_cache.get_static_doc('drive', 'v3') or ''
+    return _drive_discovery_document or None
+
+@dataclass
+class BackupResult:
+    """backup_many의 파일별 결과"""
+    source_path: str
+    file_name: str
+    success: bool
+    file_id: str = None
+    skipped: bool = False
+    error: str = None
+    seconds: float = 0.0
+
+def _map_bounded(executor, fn, items, window):
+    """executor.map처럼 결과를 순서대로 반환하되 동시에 window개까지만 제출 (메모리 사용량 제한)"""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+@contextmanager
+def _source_snapshot(source_path):
+    """
+    원본을 한 번 읽어서 임시 파일로 복사하면서 MD5도 계산 (백업이 끝나면 삭제)
+    
+    감시 모드에서는 메모리 서버가 백업 도중에도 파일을 고치므로, 백업 한 번은 처음에 만든 사본만 봄
+    
+    Yields:
+        tuple: (사본 경로, 사본의 MD5)
+    """
+    fd, snapshot_path = tempfile.mkstemp(suffix=os.path.splitext(source_path)[1] or '.json')
+    try:
+        md5 = hashlib.md5()
+        with open(source_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+            for block in iter(lambda: src.read(1024 * 1024), b''):
+                md5.update(block)
+                dst.write(block)
+        yield snapshot_path, md5.hexdigest()
+    finally:
+        os.remove(snapshot_path)
+
 class DriveBackupManager:
     """구글 드라이브에 메모리 파일을 백업하는 매니저 클래스"""
     
-    def __init__(self, credentials_path=None):
+    def __init__(self, credentials_path=None, backup_mode=None, compression_codec=None, http_transport=None):
         """
         DriveBackupManager 초기화
         
         Args:
             credentials_path (str): Google OAuth credentials.json 파일 경로
+            backup_mode (str): 'rotate', 'revision', 'delta', 'dedup' 중 하나 (None이면 config.BACKUP_MODE)
+            compression_codec (str): 업로드 압축 codec 'gzip' 또는 'zstd' (None이면 config.UPLOAD_COMPRESSION)
+            http_transport (str): 'session' 또는 'httplib2' (None이면 config.HTTP_TRANSPORT)
         """
         self.SCOPES = ['https://www.googleapis.com/auth/drive.file']
         self.credentials_path = credentials_path or config.CREDENTIALS_PATH
         self.creds = None
         self.drive_service = None
         self.folder_manager = None
+        self.backup_mode = backup_mode or config.BACKUP_MODE
+        if self.backup_mode not in ('rotate', 'revision', 'delta', 'dedup'):
+            raise ValueError(f"Unknown backup mode: {self.backup_mode}")
+        self.http_transport = http_transport or config.HTTP_TRANSPORT
+        if self.http_transport not in ('session', 'httplib2'):
+            raise ValueError(f"Unknown HTTP transport: {self.http_transport}")
+        # 모든 Drive 서비스가 공유하는 전송 객체 (authenticate에서 생성, httplib2면 None)
+        self.http = None
+        # 모든 Drive API 호출의 속도 제한/우선순위 (다시 인증해도 유지)
+        self.scheduler = RequestScheduler(
+            rate=config.API_REQUESTS_PER_SECOND,
+            burst=config.API_BURST,
+            min_rate=config.API_MIN_REQUESTS_PER_SECOND,
+            max_retries=config.API_RATE_LIMIT_RETRIES,
+            backoff_base=config.API_BACKOFF_BASE_SECONDS,
+            backoff_max=config.API_BACKOFF_MAX_SECONDS
+        )
+        self.compression_codec = compression_codec or config.UPLOAD_COMPRESSION
+        if self.compression_codec and self.compression_codec not in compression.CODECS:
+            raise ValueError(f"Unknown compression codec: {self.compression_codec}")
+        self.backup_state = BackupState(config.BACKUP_STATE_PATH, config.UPLOAD_SESSION_MAX_AGE_SECONDS)
+        self.catalog = BackupCatalog(config.CATALOG_PATH)
+        self.history = HistoryIndex(config.HISTORY_INDEX_PATH)
+        self.chunk_index = ChunkIndex(config.CHUNK_INDEX_PATH)
+        self.last_backup_skipped = False
+        # 스레드별 Drive 서비스를 만드는 함수 (테스트에서는 가짜 서비스로 교체 가능)
+        self.service_factory = self._build_service
+        self._local = threading.local()
         
     def authenticate(self):
         """Google Drive API 인증 처리"""
+        with run_metrics.phase('authenticate'):
+            self._load_credentials()
+            self.connect(build_http(
+                self.creds,
+                self.http_transport,
+                pool_size=config.HTTP_POOL_SIZE,
+                connect_timeout=config.HTTP_CONNECT_TIMEOUT,
+                read_timeout=config.HTTP_READ_TIMEOUT,
+                max_retries=config.HTTP_MAX_RETRIES,
+                retry_base=config.HTTP_RETRY_BASE_SECONDS,
+                retry_max=config.HTTP_RETRY_MAX_SECONDS
+            ))
+    
+    def _load_credentials(self):
+        """저장된 토큰 읽기 (만료됐으면 갱신, 없으면 브라우저로 로그인 후 저장)"""
+        with startup_timer.phase('auth imports'):
+            from google.oauth2.credentials import Credentials
+        
         if os.path.exists(config.TOKEN_PATH):
             logger.info("Using existing token")
             self.creds = Credentials.from_authorized_user_file(config.TOKEN_PATH, self.SCOPES)
@@ -41,9 +185,13 @@ class DriveBackupManager:
         if not self.creds or not self.creds.valid:
             if self.creds and self.creds.expired and self.creds.refresh_token:
                 logger.info("Token expired. Refreshing...")
+                from google.auth.transport.requests import Request
                 self.creds.refresh(Request())
+                run_metrics.count_call()
             else:
                 logger.info("Initial authentication required. Opening browser for authorization...")
+                # 브라우저 로그인이 필요할 때만 oauthlib까지 불러옴
+                from google_auth_oauthlib.flow import InstalledAppFlow
                 flow = InstalledAppFlow.from_client_secrets_file(
                     self.credentials_path, self.SCOPES)
                 self.creds = flow.run_local_server(port=0)
@@ -52,78 +200,1262 @@ class DriveBackupManager:
             with open(config.TOKEN_PATH, 'w') as token:
                 token.write(self.creds.to_json())
                 logger.info("Token saved successfully")
-                
+    
+    def connect(self, http=None):
+        """
+        전송 객체로 Drive 서비스와 FolderManager 준비
+        
+        authenticate가 인증 후에 호출하고, 가짜 Drive(benchmarks.fake_drive)에 붙일 때는
+        service_factory를 바꾼 뒤 직접 호출
+        
+        Args:
+            http: 모든 Drive 서비스가 공유할 전송 객체 (None이면 서비스마다 따로 만듦)
+        """
+        # 다시 연결하면 이전 연결 풀은 닫음
+        if self.http is not None and self.http is not http:
+            self.http.close()
+        self.http = http
+        
         # Drive 서비스 생성
-        self.drive_service = build('drive', 'v3', credentials=self.creds)
-                
+        self.drive_service = self.service_factory()
+        
         # FolderManager 초기화 (drive_service 전달)
-        self.folder_manager = FolderManager(self.drive_service)
+        self.folder_manager = FolderManager(
+            self.drive_service,
+            cache_path=config.FOLDER_CACHE_PATH,
+            cache_ttl=config.FOLDER_CACHE_TTL_SECONDS,
+            execute=self.scheduler.execute
+        )
     
-    def backup_memory_file(self, source_path, folder_name=config.DRIVE_FOLDER_NAME):
+    def backup_memory_file(self, source_path, folder_name=config.DRIVE_FOLDER_NAME, force=False, file_name='memory.json'):
         """
         메모리 파일을 구글 드라이브에 백업
         
+        내용이 마지막 업로드와 같으면 이름 변경과 업로드를 건너뛰고
+        last_backup_skipped를 True로 설정
+        
         Args:
             source_path (str): 백업할 memory.json 파일 경로
             folder_name (str): 구글 드라이브의 대상 폴더 이름
+            force (bool): 내용이 같아도 강제로 백업할지 여부
+            file_name (str): 드라이브에 저장할 파일 이름
             
         Returns:
-            str: 업로드된 파일의 ID
+            str: 업로드된 파일의 ID (건너뛴 경우 기존 파일의 ID)
         """
-        try:            
-            # 폴더 확인/생성
-            folder_id = self.folder_manager.get_or_create_folder(folder_name)
-            if not folder_id:
-                raise Exception(f"'{folder_name}' 폴더 생성이나 찾기 실패ㅠㅠ")
+        file_id, self.last_backup_skipped = self._backup_file(source_path, folder_name, force, file_name)
+        return file_id
+    
+    def _backup_file(self, source_path, folder_name, force, file_name):
+        """
+        backup_memory_file 본문 (AsyncDriveBackupManager는 결과를 호출마다 따로 받기 위해 직접 호출)
+        
+        Returns:
+            tuple: (파일 ID, 건너뛰었는지 여부)
+        """
+        try:
+            with run_metrics.phase('backup'), self.scheduler.foreground():
+                return self._backup_source(self.drive_service, source_path, folder_name, file_name, force)
+            
+        except Exception as e:
+            raise Exception(f"백업 중에 문제가 생겼어ㅠㅠ: {str(e)}")
+    
+    def backup_many(self, sources, folder_name=config.DRIVE_FOLDER_NAME, max_workers=None, force=False):
+        """
+        여러 메모리 파일을 작업자 풀에서 동시에 백업
+        
+        Drive 서비스 객체는 작업자마다 따로 만들고, 'session' 전송이면 연결 풀은 모두가 공유
+        (httplib2 전송은 스레드 간에 공유할 수 없어서 작업자마다 연결도 따로 가짐)
+        
+        Args:
+            sources (list | dict): 파일 경로 목록 (드라이브 이름은 파일 이름) 또는 {드라이브 이름: 경로}
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            max_workers (int): 동시에 실행할 작업자 수 (None이면 config.BACKUP_WORKERS)
+            force (bool): 내용이 같아도 강제로 백업할지 여부
             
+        Returns:
+            list: 파일별 BackupResult (sources 순서)
+        """
+        targets = self._backup_targets(sources)
+        self._prepare_backup_folders(folder_name)
+        
+        with run_metrics.phase('backup'), self.scheduler.foreground(), \
+                ThreadPoolExecutor(max_workers=max_workers or config.BACKUP_WORKERS) as executor:
+            results = list(executor.map(lambda target: self._backup_target(target, folder_name, force), targets))
+        
+        logger.info(f"Batch backup finished: {sum(r.success for r in results)}/{len(results)} succeeded")
+        return results
+    
+    @staticmethod
+    def _backup_targets(sources):
+        """backup_many의 sources를 (드라이브 이름, 경로) 목록으로 변환 (드라이브 이름이 겹치면 ValueError)"""
+        if isinstance(sources, dict):
+            targets = list(sources.items())
+        else:
+            targets = [(os.path.basename(path), path) for path in sources]
+        names = [name for name, _ in targets]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate remote file names {duplicates}: pass a dict of {{name: path}} instead")
+        return targets
+    
+    def _prepare_backup_folders(self, folder_name):
+        """작업자가 폴더를 캐시에서 바로 찾도록 먼저 확인/생성"""
+        folder_id = self.folder_manager.get_or_create_folder(folder_name)
+        if not folder_id:
+            raise Exception(f"'{folder_name}' 폴더 생성이나 찾기 실패ㅠㅠ")
+        if self.backup_mode == 'dedup':
+            self.folder_manager.get_or_create_folder(CHUNKS_FOLDER_NAME, parent_id=folder_id)
+    
+    def _backup_target(self, target, folder_name, force):
+        """작업자 스레드에서 파일 하나 백업 (실패해도 예외 대신 BackupResult로 반환)"""
+        file_name, source_path = target
+        started = time.perf_counter()
+        try:
+            file_id, skipped = self._backup_source(
+                self._thread_service(), source_path, folder_name, file_name, force
+            )
+            return BackupResult(source_path, file_name, True, file_id, skipped,
+                                seconds=time.perf_counter() - started)
+        except Exception as e:
+            logger.error(f"Backup of {source_path} failed: {e}")
+            return BackupResult(source_path, file_name, False, error=str(e),
+                                seconds=time.perf_counter() - started)
+    
+    def _build_service(self):
+        """
+        인증 정보로 새 Drive 서비스 생성 ('session' 전송이면 공유 연결 풀 사용, httplib2면 연결을 따로 가짐)
+        
+        discovery 문서는 패키지에 들어있는 정적 문서를 프로세스당 한 번만 읽어서 재사용
+        (서비스마다 문자열에서 새로 만드는 건 build_from_document가 문서를 고치면서 쓰기 때문)
+        """
+        with startup_timer.phase('client imports'):
+            from googleapiclient.discovery import build, build_from_document
+        with startup_timer.phase('service build'):
+            document = _load_drive_discovery_document()
+            auth = {'http': self.http} if self.http is not None else {'credentials': self.creds}
+            if document is None:
+                return build('drive', 'v3', **auth)
+            return build_from_document(document, **auth)
+    
+    def _thread_service(self):
+        """현재 스레드 전용 Drive 서비스 (메인 스레드는 drive_service 사용)"""
+        if threading.current_thread() is threading.main_thread():
+            return self.drive_service
+        service = getattr(self._local, 'drive_service', None)
+        if service is None:
+            service = self._local.drive_service = self.service_factory()
+        return service
+    
+    def _backup_source(self, service, source_path, folder_name, file_name, force):
+        """
+        파일 하나 백업 (backup_memory_file/backup_many 공통)
+        
+        Returns:
+            tuple: (파일 ID, 건너뛰었는지 여부)
+        """
+        # 크기/수정 시각이 지문과 같으면 파일을 읽지도 않고 종료
+        stat = stat_signature(source_path)
+        fingerprint = self.backup_state.get_fingerprint(source_path, folder_name)
+        if not force and fingerprint and stat and fingerprint.get('stat') == stat:
+            logger.info(f"{file_name}: local file unchanged since last upload. Backup skipped")
+            return fingerprint.get('file_id'), True
+        
+        # 원본은 사본을 만들 때 한 번만 읽고 MD5, 검증, 압축, 업로드는 모두 사본과 이 MD5를 씀
+        with _source_snapshot(source_path) as (snapshot_path, local_md5):
+            if not force and fingerprint and fingerprint.get('md5') == local_md5:
+                # 수정 시각만 바뀐 경우: 다음부터는 stat만으로 건너뛰도록 지문 갱신
+                self.backup_state.save_fingerprint(source_path, folder_name, local_md5, fingerprint.get('file_id'),
+                                                   stat)
+                logger.info(f"{file_name}: local file unchanged since last upload. Backup skipped")
+                return fingerprint.get('file_id'), True
+            
+            return self._backup_snapshot(
+                service, source_path, snapshot_path, folder_name, file_name, force, local_md5, fingerprint, stat
+            )
+    
+    def _backup_snapshot(self, service, source_path, snapshot_path, folder_name, file_name, force, local_md5,
+                         fingerprint, stat):
+        """
+        원본 사본으로 백업 (검증, 업로드, delta 기준 사본, 이력 인덱스가 모두 같은 내용을 봄)
+        
+        Args:
+            source_path (str): 원본 경로 (지문, 카탈로그, delta 체인을 구분하는 기준)
+            snapshot_path (str): 백업을 시작할 때 만든 원본 사본
+            local_md5 (str): 사본의 MD5
+            fingerprint (dict): 마지막 업로드 지문
+            stat (list): 사본을 만들기 전 원본의 stat_signature (지문에 같이 저장)
+        
+        Returns:
+            tuple: (파일 ID, 건너뛰었는지 여부)
+        """
+        # 깨진 파일이 정상 백업을 밀어내지 않도록 원격 파일을 건드리기 전에 검증
+        if config.VALIDATE_BEFORE_UPLOAD:
+            report = validate_memory_file(snapshot_path)
+            logger.info(f"{file_name} validated: {report}")
+        
+        # 리비전 모드는 기록해 둔 파일 ID로 바로 갱신 (목록 조회 생략)
+        if self.backup_mode == 'revision' and fingerprint and fingerprint.get('file_id'):
+            file = self._update_file_in_place(service, snapshot_path, fingerprint['file_id'], local_md5)
+            if file:
+                return self._finish_backup(file, source_path, snapshot_path, folder_name, local_md5, stat), False
+        
+        # 폴더 확인/생성
+        folder_id = self.folder_manager.get_or_create_folder(folder_name)
+        if not folder_id:
+            raise Exception(f"'{folder_name}' 폴더 생성이나 찾기 실패ㅠㅠ")
+        
+        # delta 모드는 파일 하나 대신 스냅샷/패치 체인으로 저장
+        if self.backup_mode == 'delta':
+            file_id, skipped = self._backup_delta(
+                service, source_path, snapshot_path, folder_id, folder_name, file_name, local_md5
+            )
+            self.backup_state.save_fingerprint(source_path, folder_name, local_md5, file_id, stat)
+            return file_id, skipped
+        
+        # dedup 모드는 새 청크만 올리고 버전은 매니페스트로 저장
+        if self.backup_mode == 'dedup':
+            file = self._backup_dedup(service, snapshot_path, folder_id, file_name, local_md5)
+            return self._finish_backup(file, source_path, snapshot_path, folder_name, local_md5, stat), False
+        
+        # 원격 파일과 내용이 같으면 이름 변경/업로드 생략
+        existing_file = self._find_existing_file(service, folder_id, file_name)
+        if not force and existing_file and self._remote_source_md5(existing_file) == local_md5:
+            logger.info(f"{file_name}: remote file already up to date. Backup skipped")
+            self.backup_state.save_fingerprint(source_path, folder_name, local_md5, existing_file['id'], stat)
+            return existing_file['id'], True
+        
+        file = None
+        if self.backup_mode == 'revision' and existing_file:
+            # 같은 파일의 내용을 갱신 (이전 내용은 리비전으로 남음)
+            file = self._update_file_in_place(service, snapshot_path, existing_file['id'], local_md5)
+        
+        if not file:
             # 기존 파일 백업 처리
-            self._backup_existing_file(self.drive_service, folder_id)
+            if self.backup_mode == 'rotate':
+                self._backup_existing_file(service, existing_file)
             
             # 새 파일 업로드
-            return self._upload_new_file(self.drive_service, source_path, folder_id)
-            
+            file = self._upload_new_file(service, snapshot_path, folder_id, file_name, source_md5=local_md5)
+        return self._finish_backup(file, source_path, snapshot_path, folder_name, local_md5, stat), False
+    
+    def _finish_backup(self, file, source_path, snapshot_path, folder_name, local_md5, stat):
+        """업로드 후 지문 저장과 카탈로그 기록을 하고 파일 ID 반환"""
+        self.backup_state.save_fingerprint(source_path, folder_name, local_md5, file['id'], stat)
+        self._record_backup(file, source_path, snapshot_path, folder_name, local_md5, self.backup_mode)
+        return file['id']
+    
+    def _record_backup(self, file, source_path, snapshot_path, folder_name, source_md5, kind, graph=None):
+        """
+        업로드 결과를 로컬 카탈로그와 이력 인덱스에 기록 (실패해도 백업 자체는 성공으로 둠)
+        
+        Args:
+            snapshot_path (str): 업로드한 원본 사본 (원본은 그 사이에 바뀌었을 수 있음)
+            graph (dict): 이미 파싱해 둔 사본의 그래프 (None이면 사본에서 읽음)
+        """
+        app_properties = file.get('appProperties') or {}
+        try:
+            self.catalog.record(
+                file['id'],
+                file.get('name'),
+                created_at=file.get('modifiedTime') or file.get('createdTime'),
+                revision_id=file.get('headRevisionId'),
+                folder=folder_name,
+                source_path=source_path,
+                kind=kind,
+                size=os.path.getsize(snapshot_path),
+                md5=source_md5,
+                stored_size=int(file['size']) if file.get('size') else None,
+                codec=app_properties.get('codec')
+            )
         except Exception as e:
-            raise Exception(f"백업 중에 문제가 생겼어ㅠㅠ: {str(e)}")
+            logger.warning(f"Failed to record backup in catalog: {e}")
+        
+        # 방금 올린 내용이 로컬에 있으므로 다운로드 없이 직전 버전과의 차이만 인덱싱
+        try:
+            self.history.index_version(
+                source_path,
+                graph if graph is not None else memory_graph.load_graph(snapshot_path),
+                self._history_version_key(file['id'], file.get('headRevisionId')),
+                name=file.get('name'),
+                created_at=file.get('modifiedTime') or file.get('createdTime')
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update history index: {e}")
     
-    def _backup_existing_file(self, service, folder_id):
-        """기존 파일이 있다면 날짜 붙여서 백업"""
-        results = service.files().list(
-            q=f"name='memory.json' and '{folder_id}' in parents",
-            spaces='drive'
-        ).execute()
+    def _history_version_key(self, file_id, revision_id=None):
+        """히스토리 인덱스의 버전 식별자 (revision 모드만 리비전별로 구분)"""
+        if self.backup_mode == 'revision' and revision_id:
+            return f"{file_id}:{revision_id}"
+        return file_id
+    
+    def _find_existing_file(self, service, folder_id, file_name='memory.json'):
+        """폴더 안의 현재 파일(기본 memory.json) 조회 (md5Checksum 포함)"""
+        results = self.scheduler.execute(service.files().list(
+            q=f"name='{file_name}' and '{folder_id}' in parents and trashed=false",
+            spaces='drive',
+            fields='files(id, name, md5Checksum, appProperties)'
+        ))
         
-        if results.get('files'):
-            existing_file = results['files'][0]
-            backup_name = f"memory_{datetime.now().strftime('%Y%m%d%H%M%S')}.json"
+        files = results.get('files')
+        return files[0] if files else None
+    
+    @staticmethod
+    def _remote_source_md5(remote_file):
+        """원격 파일의 원본 MD5 (압축 업로드면 appProperties에 기록된 원본 해시)"""
+        app_properties = remote_file.get('appProperties') or {}
+        return app_properties.get('sourceMd5') or remote_file.get('md5Checksum')
+    
+    def _backup_existing_file(self, service, existing_file):
+        """기존 파일이 있다면 날짜 붙여서 백업"""
+        if not existing_file:
+            return
+        with run_metrics.phase('backup_existing_file'):
+            stem, ext = os.path.splitext(existing_file['name'])
+            backup_name = f"{stem}_{datetime.now().strftime('%Y%m%d%H%M%S')}{ext}"
             
-            service.files().update(
+            self.scheduler.execute(service.files().update(
                 fileId=existing_file['id'],
                 body={'name': backup_name}
-            ).execute()
-            
-            logger.info(f"Existing file backed up as: {backup_name}")
+            ))
+            self.catalog.rename(existing_file['id'], backup_name)
+            self.history.rename(existing_file['id'], backup_name)
+        
+        logger.info(f"Existing file backed up as: {backup_name}")
     
-    def _upload_new_file(self, service, source_path, folder_id):
-        """새 파일 업로드"""
+    def _upload_new_file(self, service, source_path, folder_id, name='memory.json', app_properties=None,
+                         source_md5=None, session_name=None):
+        """
+        새 파일 업로드
+        
+        Args:
+            source_md5 (str): source_path의 MD5를 이미 알면 전달 (다시 읽지 않음)
+            session_name (str): 업로드 세션을 찾을 때 name 대신 쓸 고정 이름
+                                (name에 시각이 들어가면 다시 실행했을 때 끊긴 세션을 못 찾으므로)
+        
+        Returns:
+            dict: 업로드된 파일 정보 (UPLOAD_FIELDS)
+        """
         file_metadata = {
-            'name': 'memory.json',
+            'name': name,
             'parents': [folder_id]
         }
         
+        with run_metrics.phase('upload_new_file'), \
+                self._upload_media(source_path, source_md5) as (media, codec_properties, upload_md5):
+            properties = {k: v for k, v in codec_properties.items() if v is not None}
+            properties.update(app_properties or {})
+            if properties:
+                file_metadata['appProperties'] = properties
+            
+            # 끊긴 업로드를 이어서 올릴 때는 처음 정한 이름을 그대로 씀
+            session_key = f"create:{folder_id}/{session_name or name}:{upload_md5}"
+            session = self.backup_state.get_upload_session(session_key, config.UPLOAD_SESSION_MAX_AGE_SECONDS)
+            if session and session.get('name'):
+                file_metadata['name'] = session['name']
+            
+            request = service.files().create(
+                body=file_metadata,
+                media_body=media,
+                fields=UPLOAD_FIELDS
+            )
+            file = self._execute_resumable(request, session_key, file_metadata['name'])
+        
+        logger.info("New file uploaded successfully")
+        if self.backup_mode == 'revision':
+            self._keep_revision(service, file.get('id'), file.get('headRevisionId'))
+        return file
+    
+    @contextmanager
+    def _upload_media(self, source_path, source_md5=None):
+        """
+        업로드할 미디어 준비 (압축 설정 시 임시 파일로 스트리밍 압축)
+        
+        Args:
+            source_path (str): 올릴 파일
+            source_md5 (str): source_path의 MD5를 이미 알면 전달 (원본을 다시 읽지 않음)
+        
+        Yields:
+            tuple: (MediaFileUpload, codec/sourceMd5 appProperties - 압축 안 하면 값이 None,
+                    실제로 올라가는 바이트의 MD5)
+        """
+        from googleapiclient.http import MediaFileUpload
+        
+        source_md5 = source_md5 or file_md5(source_path)
+        if not self.compression_codec:
+            upload_path, tmp_path, upload_md5 = source_path, None, source_md5
+            codec_properties = {'codec': None, 'sourceMd5': None}
+            mimetype = config.DEFAULT_MIME_TYPE
+        else:
+            # 압축된 바이트의 MD5는 압축하면서 같이 계산
+            tmp_path, upload_md5 = compression.compress_to_temp(
+                source_path, self.compression_codec, config.COMPRESSION_LEVEL, with_md5=True
+            )
+            upload_path = tmp_path
+            codec_properties = {'codec': self.compression_codec, 'sourceMd5': source_md5}
+            mimetype = compression.MIME_TYPES[self.compression_codec]
+            logger.info(f"Compressed with {self.compression_codec}: "
+                        f"{os.path.getsize(source_path)} -> {os.path.getsize(tmp_path)} bytes")
+        
         media = MediaFileUpload(
-            source_path,
-            mimetype=config.DEFAULT_MIME_TYPE,
+            upload_path,
+            mimetype=mimetype,
+            chunksize=config.UPLOAD_CHUNK_SIZE,
             resumable=True
         )
+        try:
+            yield media, codec_properties, upload_md5
+        finally:
+            media.stream().close()
+            if tmp_path:
+                os.remove(tmp_path)
+    
+    def _execute_resumable(self, request, session_key, name=None):
+        """
+        재개 가능한 업로드를 청크 단위로 실행
         
-        file = service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields='id'
-        ).execute()
+        세션 URI와 오프셋을 backup_state에 기록해 두고, 이전 실행이 중간에 끊겼으면
+        서버에 반영된 오프셋을 물어본 뒤 그 지점부터 이어서 올림
         
-        logger.info("New file uploaded successfully")
-        return file.get('id')
+        Args:
+            request: media_body가 resumable인 HttpRequest
+            session_key (str): 업로드 대상과 내용을 식별하는 키
+            name (str): 새로 만드는 파일의 이름 (세션에 같이 저장해서 이어 올릴 때 재사용)
+            
+        Returns:
+            dict: 업로드 완료 후 API 응답
+        """
+        session = self.backup_state.get_upload_session(session_key, config.UPLOAD_SESSION_MAX_AGE_SECONDS)
+        if session:
+            offset, response = self._query_upload_offset(request, session['uri'])
+            if response is not None:
+                self.backup_state.clear_upload_session(session_key)
+                return response
+            if offset is not None:
+                logger.info(f"Resuming upload from byte {offset}")
+                request.resumable_uri = session['uri']
+                request.resumable_progress = offset
+            else:
+                logger.info("Saved upload session expired. Starting over")
+                self.backup_state.clear_upload_session(session_key)
+        
+        start_offset = request.resumable_progress
+        if request.resumable_uri is None:
+            # 첫 next_chunk는 세션을 여는 요청까지 두 번 호출함
+            run_metrics.count_call()
+        response = None
+        while response is None:
+            status, response = self.scheduler.call(request.next_chunk)
+            if response is None:
+                self.backup_state.save_upload_session(
+                    session_key, request.resumable_uri, request.resumable_progress, name
+                )
+                logger.debug(f"Uploaded {int(status.progress() * 100)}%")
+        
+        self.backup_state.clear_upload_session(session_key)
+        run_metrics.add_bytes(request.resumable.size() - start_offset)
+        return response
+    
+    def _query_upload_offset(self, request, session_uri):
+        """
+        업로드 세션에 서버가 반영한 바이트 수 조회
+        
+        Returns:
+            tuple: (다음에 보낼 오프셋, 완료 응답) - 세션이 만료되었으면 (None, None)
+        """
+        size = request.resumable.size()
+        resp, content = self.scheduler.call(
+            request.http.request,
+            session_uri,
+            'PUT',
+            headers={'Content-Range': f'bytes */{size}', 'Content-Length': '0'}
+        )
+        if resp.status in (200, 201):
+            return None, request.postproc(resp, content)
+        if resp.status == 308:
+            # Range 헤더가 없으면 아직 아무것도 반영되지 않은 상태
+            committed = resp.get('range')
+            return (int(committed.split('-')[1]) + 1 if committed else 0), None
+        return None, None
+    
+    def _delta_base_path(self, source_path, folder_name):
+        """delta 모드에서 마지막으로 올린 그래프 사본의 로컬 경로"""
+        key = f"{folder_name}/{os.path.abspath(source_path)}"
+        return os.path.join(config.DELTA_BASE_DIR, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.json")
+    
+    def _backup_delta(self, service, source_path, snapshot_path, folder_id, folder_name, file_name, source_md5):
+        """
+        delta 모드 백업: 체인이 없거나 길어지면 전체 스냅샷, 아니면 변경분 패치만 업로드
+        
+        패치 계산, 업로드, 새 기준 사본 모두 snapshot_path에서 만들어서 기준 사본에는
+        올라간 패치에 들어간 변경만 남음 (백업 도중에 원본이 바뀌어도 다음 패치에 들어감)
+        
+        Returns:
+            tuple: (업로드된 스냅샷 또는 패치 파일 ID, 변경이 없어 건너뛰었는지 여부)
+        """
+        stem, ext = os.path.splitext(file_name)
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        chain = self.backup_state.get_delta_chain(source_path, folder_name)
+        base_path = self._delta_base_path(source_path, folder_name)
+        os.makedirs(config.DELTA_BASE_DIR, exist_ok=True)
+        
+        if (not chain or chain['seq'] >= config.DELTA_FULL_SNAPSHOT_EVERY
+                or not os.path.exists(chain.get('base_path', base_path))):
+            file = self._upload_new_file(
+                service, snapshot_path, folder_id,
+                name=f"{stem}_full_{timestamp}{ext}",
+                app_properties={'deltaKind': 'full', 'deltaSource': file_name},
+                source_md5=source_md5,
+                session_name=f"{file_name}:full"
+            )
+            self._record_backup(file, source_path, snapshot_path, folder_name, source_md5, 'full')
+            shutil.copyfile(snapshot_path, base_path)
+            self.backup_state.save_delta_chain(source_path, folder_name, file['id'], 0, base_path)
+            logger.info("Full snapshot uploaded. New delta chain started")
+            return file['id'], False
+        
+        graph = memory_graph.load_graph(snapshot_path)
+        patch = memory_graph.diff_graphs(memory_graph.load_graph(chain['base_path']), graph)
+        if memory_graph.is_empty_patch(patch):
+            logger.info("Graph unchanged since last delta. Backup skipped")
+            return chain['full_id'], True
+        
+        seq = chain['seq'] + 1
+        fd, patch_path = tempfile.mkstemp(suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(patch, f, ensure_ascii=False, separators=(',', ':'))
+            file = self._upload_new_file(
+                service, patch_path, folder_id,
+                name=f"{stem}_delta_{timestamp}_{seq:04d}{ext}",
+                app_properties={'deltaKind': 'delta', 'chainId': chain['full_id'], 'seq': str(seq)},
+                session_name=f"{file_name}:delta:{chain['full_id']}:{seq}"
+            )
+        finally:
+            os.remove(patch_path)
+        self._record_backup(file, source_path, snapshot_path, folder_name, source_md5, 'delta', graph)
+        
+        shutil.copyfile(snapshot_path, chain['base_path'])
+        self.backup_state.save_delta_chain(source_path, folder_name, chain['full_id'], seq, chain['base_path'])
+        logger.info(f"Delta #{seq} uploaded ({os.path.getsize(snapshot_path)} bytes source)")
+        return file['id'], False
+    
+    def _backup_dedup(self, service, source_path, folder_id, file_name, source_md5):
+        """
+        파일을 내용 기반 청크로 나눠 드라이브에 없는 청크만 올리고, 이번 버전은 매니페스트로 저장
+        
+        청크는 '<백업 폴더>/chunks/<sha256>'에 한 번만 저장되고, 이미 있는지는 로컬 ChunkIndex에서
+        이 청크 폴더의 목록으로만 판단 (다른 백업 폴더에 같은 청크가 있어도 새로 올림)
+        
+        Returns:
+            dict: 업로드된 매니페스트 파일 정보 (UPLOAD_FIELDS)
+        """
+        chunks_folder_id = self.folder_manager.get_or_create_folder(CHUNKS_FOLDER_NAME, parent_id=folder_id)
+        if not self.chunk_index.has_folder(chunks_folder_id):
+            # 처음이거나 다른 PC라면 드라이브에 있는 청크 목록을 한 번 받아옴
+            self._sync_chunk_index(service, chunks_folder_id)
+        
+        entries = []
+        
+        def new_chunks():
+            scheduled = set()
+            with open(source_path, 'rb') as f:
+                for data in iter_chunks(f, config.DEDUP_CHUNK_MIN_SIZE, config.DEDUP_CHUNK_AVG_SIZE,
+                                        config.DEDUP_CHUNK_MAX_SIZE):
+                    digest = chunk_digest(data)
+                    entries.append(digest)
+                    if not self.chunk_index.get(chunks_folder_id, digest) and digest not in scheduled:
+                        scheduled.add(digest)
+                        yield chunks_folder_id, digest, data
+        
+        workers = config.BACKUP_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            uploaded = list(_map_bounded(executor, self._upload_chunk, new_chunks(), workers * 2))
+        
+        manifest = {
+            'format': MANIFEST_FORMAT,
+            'name': file_name,
+            'size': os.path.getsize(source_path),
+            'md5': source_md5,
+            'chunks': [[digest, self.chunk_index.get(chunks_folder_id, digest)] for digest in entries]
+        }
+        logger.info(f"{file_name}: {len(entries)} chunks, {len(uploaded)} new ({sum(uploaded)} bytes uploaded)")
+        
+        stem, ext = os.path.splitext(file_name)
+        fd, manifest_path = tempfile.mkstemp(suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, separators=(',', ':'))
+            return self._upload_new_file(
+                service, manifest_path, folder_id,
+                name=f"{stem}_manifest_{datetime.now().strftime('%Y%m%d%H%M%S')}{ext}",
+                app_properties={'manifestSource': file_name},
+                session_name=f"{file_name}:manifest"
+            )
+        finally:
+            os.remove(manifest_path)
+    
+    def _upload_chunk(self, item):
+        """청크 하나 업로드 후 인덱스에 기록 (작업자 스레드에서 실행)"""
+        from googleapiclient.http import MediaIoBaseUpload
+        
+        chunks_folder_id, digest, data = item
+        payload, mimetype = data, 'application/octet-stream'
+        if self.compression_codec:
+            buffer = io.BytesIO()
+            compression.compress_stream(io.BytesIO(data), buffer, self.compression_codec, config.COMPRESSION_LEVEL)
+            payload, mimetype = buffer.getvalue(), compression.MIME_TYPES[self.compression_codec]
+        
+        # 청크는 작으므로 재개 가능한 세션 없이 요청 한 번으로 올림
+        with run_metrics.phase('upload_chunk'):
+            file = self.scheduler.execute(self._thread_service().files().create(
+                body={'name': digest, 'parents': [chunks_folder_id]},
+                media_body=MediaIoBaseUpload(io.BytesIO(payload), mimetype=mimetype, resumable=False),
+                fields='id'
+            ))
+            run_metrics.add_bytes(len(payload))
+        self.chunk_index.add(chunks_folder_id, digest, file['id'])
+        return len(payload)
+    
+    def _sync_chunk_index(self, service, chunks_folder_id):
+        """드라이브의 청크 폴더를 읽어서 로컬 청크 인덱스 재구성"""
+        files = self._list_folder_files(
+            service, f"'{chunks_folder_id}' in parents and trashed=false", fields='id, name')
+        self.chunk_index.replace_folder(chunks_folder_id, {file['name']: file['id'] for file in files})
+        logger.info(f"Chunk index synced: {len(files)} chunks on Drive")
+    
+    def resync_chunk_index(self, folder_name=config.DRIVE_FOLDER_NAME):
+        """
+        드라이브에서 청크 인덱스 다시 만들기 (청크 폴더를 직접 정리했을 때 사용)
+        
+        Returns:
+            int: 드라이브에 있는 청크 수
+        """
+        with self.scheduler.background():
+            folder_id = self.folder_manager.get_or_create_folder(folder_name)
+            chunks_folder_id = self.folder_manager.get_or_create_folder(CHUNKS_FOLDER_NAME, parent_id=folder_id)
+            self._sync_chunk_index(self.drive_service, chunks_folder_id)
+        return self.chunk_index.count(chunks_folder_id)
+    
+    def _list_manifests(self, service, folder_name, file_name):
+        """dedup 모드 매니페스트 목록 (오래된 것부터)"""
+        folder_id = self.folder_manager.get_or_create_folder(folder_name)
+        manifests = self._list_folder_files(
+            service,
+            f"'{folder_id}' in parents and trashed=false and "
+            f"appProperties has {{ key='manifestSource' and value='{file_name}' }}"
+        )
+        return sorted(manifests, key=lambda f: f['createdTime'])
+    
+    def _iter_manifest_chunks(self, manifest):
+        """매니페스트의 청크를 병렬로 받아 순서대로 반환 (SHA-256 검증)"""
+        def fetch(entry):
+            digest, file_id = entry
+            data = self._download_bytes(self._thread_service(), file_id)
+            if chunk_digest(data) != digest:
+                raise Exception(f"청크 {digest}의 내용이 달라ㅠㅠ")
+            return data
+        
+        workers = config.BACKUP_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from _map_bounded(executor, fetch, manifest['chunks'], workers * 2)
+    
+    def restore_from_manifest(self, dest_path, folder_name=config.DRIVE_FOLDER_NAME, file_name='memory.json',
+                              at=None):
+        """
+        dedup 모드 매니페스트의 청크를 이어 붙여서 memory.json 복원
+        
+        Args:
+            dest_path (str): 복원된 내용을 저장할 경로
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            file_name (str): 백업할 때 사용한 드라이브 파일 이름
+            at (str | datetime): 이 시각 이전의 가장 최근 매니페스트로 복원 (None이면 최신)
+            
+        Returns:
+            str: 복원된 파일 경로
+        """
+        service = self.drive_service
+        manifests = self._list_manifests(service, folder_name, file_name)
+        if at:
+            manifests = [f for f in manifests if normalize_time(f['createdTime']) <= normalize_time(at)]
+        if not manifests:
+            raise Exception(f"'{folder_name}' 폴더에 {at or '지금'} 이전 매니페스트가 없어ㅠㅠ")
+        manifest_file = manifests[-1]
+        manifest = json.loads(self._download_bytes(service, manifest_file['id']))
+        
+        tmp_path = temp_path_for(dest_path, suffix='.restore')
+        try:
+            md5 = hashlib.md5()
+            with open(tmp_path, 'wb') as f:
+                for data in self._iter_manifest_chunks(manifest):
+                    md5.update(data)
+                    f.write(data)
+            if md5.hexdigest() != manifest['md5']:
+                raise Exception(f"복원한 파일의 MD5가 달라ㅠㅠ ({md5.hexdigest()} != {manifest['md5']})")
+            fsync_and_replace(tmp_path, dest_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        logger.info(f"Restored {dest_path} from {manifest_file['name']} ({len(manifest['chunks'])} chunks)")
+        return dest_path
+    
+    def _list_folder_files(self, service, query, fields='id, name, createdTime, appProperties'):
+        """조건에 맞는 파일 목록을 페이지를 끝까지 넘기며 조회"""
+        files = []
+        page_token = None
+        while True:
+            response = self.scheduler.execute(service.files().list(
+                q=query,
+                spaces='drive',
+                fields=f'nextPageToken, files({fields})',
+                pageSize=1000,
+                pageToken=page_token
+            ))
+            files.extend(response.get('files', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return files
+    
+    def _download_bytes(self, service, file_id, revision_id=None):
+        """파일(또는 특정 리비전) 내용을 메모리로 다운로드 (압축되어 있으면 해제)"""
+        from googleapiclient.http import MediaIoBaseDownload
+        
+        if revision_id:
+            request = service.revisions().get_media(fileId=file_id, revisionId=revision_id)
+        else:
+            request = service.files().get_media(fileId=file_id)
+        buffer = io.BytesIO()
+        downloader = MediaIoBaseDownload(buffer, request)
+        done = False
+        while not done:
+            _, done = self.scheduler.call(downloader.next_chunk)
+        return compression.decompress_bytes(buffer.getvalue())
+    
+    def list_restore_points(self, folder_name=config.DRIVE_FOLDER_NAME, file_name='memory.json'):
+        """
+        복원할 수 있는 백업 목록 조회 (오래된 것부터)
+        
+        이름 변경으로 생긴 memory_<ts>.json 파일과 현재 memory.json의 리비전을 합쳐서 반환
+        
+        Args:
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            file_name (str): 백업할 때 사용한 드라이브 파일 이름
+            
+        Returns:
+            list: file_id, revision_id, name, time(UTC 문자열), size, md5Checksum을 담은 목록
+        """
+        service = self.drive_service
+        folder_id = self.folder_manager.get_or_create_folder(folder_name)
+        pattern = backup_name_pattern(file_name)
+        
+        points = []
+        files = self._list_folder_files(
+            service,
+            f"'{folder_id}' in parents and trashed=false",
+            fields='id, name, createdTime, size, md5Checksum'
+        )
+        for file in files:
+            if file['name'] == file_name:
+                for revision in self.list_revisions(file_id=file['id']):
+                    points.append({
+                        'file_id': file['id'],
+                        'revision_id': revision['id'],
+                        'name': file['name'],
+                        'time': normalize_time(revision['modifiedTime']),
+                        'size': revision.get('size'),
+                        'md5Checksum': revision.get('md5Checksum')
+                    })
+            elif parse_backup_time(file['name'], pattern):
+                points.append({
+                    'file_id': file['id'],
+                    'revision_id': None,
+                    'name': file['name'],
+                    'time': normalize_time(file['createdTime']),
+                    'size': file.get('size'),
+                    'md5Checksum': file.get('md5Checksum')
+                })
+        
+        points.sort(key=lambda p: p['time'])
+        return points
+    
+    def restore(self, dest_path=None, at=None, folder_name=config.DRIVE_FOLDER_NAME, file_name='memory.json'):
+        """
+        최신(또는 특정 시점) 백업으로 memory.json 복원
+        
+        같은 디렉토리의 임시 파일에 큰 청크로 스트리밍 다운로드하고 md5Checksum을 확인한 뒤
+        fsync -> os.replace로 교체해서, 실행 중인 메모리 서버가 반쯤 쓰인 파일을 보지 않게 함
+        
+        Args:
+            dest_path (str): 복원할 경로 (None이면 config.MEMORY_SOURCE_PATH)
+            at (str | datetime): 이 시각 이전의 가장 최근 백업으로 복원 (None이면 최신)
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            file_name (str): 백업할 때 사용한 드라이브 파일 이름
+            
+        Returns:
+            str: 복원된 파일 경로
+        """
+        dest_path = str(dest_path or config.MEMORY_SOURCE_PATH)
+        if self.backup_mode == 'delta':
+            return self.restore_from_deltas(dest_path, folder_name, file_name=file_name, at=at)
+        if self.backup_mode == 'dedup':
+            return self.restore_from_manifest(dest_path, folder_name, file_name=file_name, at=at)
+        
+        points = self.list_restore_points(folder_name, file_name)
+        if at:
+            points = [p for p in points if p['time'] <= normalize_time(at)]
+        if not points:
+            raise Exception(f"'{folder_name}' 폴더에 {at or '지금'} 이전 백업이 없어ㅠㅠ")
+        point = points[-1]
+        
+        if point['revision_id']:
+            request = self.drive_service.revisions().get_media(
+                fileId=point['file_id'], revisionId=point['revision_id'])
+        else:
+            request = self.drive_service.files().get_media(fileId=point['file_id'])
+        self._restore_media(request, dest_path, point['md5Checksum'])
+        
+        logger.info(f"Restored {dest_path} from {point['name']} ({point['time']})")
+        return dest_path
+    
+    def _restore_media(self, request, dest_path, expected_md5=None):
+        """다운로드 요청 내용을 임시 파일로 받아 검증/압축 해제 후 dest_path와 원자적으로 교체"""
+        from googleapiclient.http import MediaIoBaseDownload
+        
+        tmp_path = temp_path_for(dest_path, suffix='.restore')
+        try:
+            with open(tmp_path, 'wb') as fh:
+                writer = HashingWriter(fh)
+                downloader = MediaIoBaseDownload(writer, request, chunksize=config.DOWNLOAD_CHUNK_SIZE)
+                done = False
+                while not done:
+                    _, done = self.scheduler.call(downloader.next_chunk)
+            
+            # md5Checksum은 드라이브에 저장된 바이트(압축된 상태) 기준
+            if expected_md5 and writer.md5.hexdigest() != expected_md5:
+                raise Exception(f"다운로드한 파일의 MD5가 달라ㅠㅠ ({writer.md5.hexdigest()} != {expected_md5})")
+            
+            compression.decompress_file(tmp_path)
+            fsync_and_replace(tmp_path, dest_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def restore_from_deltas(self, dest_path, folder_name=config.DRIVE_FOLDER_NAME, chain_id=None, file_name='memory.json',
+                            at=None):
+        """
+        전체 스냅샷에 패치 체인을 순서대로 적용해서 memory.json 복원
+        
+        Args:
+            dest_path (str): 복원된 내용을 저장할 경로
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            chain_id (str): 기준 스냅샷 파일 ID (None이면 가장 최근 체인)
+            file_name (str): 백업할 때 사용한 드라이브 파일 이름
+            at (str | datetime): 이 시각까지 올라간 스냅샷/패치만 적용 (None이면 최신)
+            
+        Returns:
+            str: 복원된 파일 경로
+        """
+        service = self.drive_service
+        folder_id = self.folder_manager.get_or_create_folder(folder_name)
+        
+        if not chain_id:
+            snapshots = self._list_folder_files(
+                service,
+                f"'{folder_id}' in parents and trashed=false and "
+                f"appProperties has {{ key='deltaKind' and value='full' }} and "
+                f"appProperties has {{ key='deltaSource' and value='{file_name}' }}"
+            )
+            if at:
+                snapshots = [f for f in snapshots if normalize_time(f['createdTime']) <= normalize_time(at)]
+            if not snapshots:
+                raise Exception(f"'{folder_name}' 폴더에 전체 스냅샷이 없어ㅠㅠ")
+            chain_id = max(snapshots, key=lambda f: f['createdTime'])['id']
+        
+        deltas = self._list_folder_files(
+            service,
+            f"'{folder_id}' in parents and trashed=false and "
+            f"appProperties has {{ key='chainId' and value='{chain_id}' }}"
+        )
+        if at:
+            deltas = [f for f in deltas if normalize_time(f['createdTime']) <= normalize_time(at)]
+        deltas.sort(key=lambda f: int(f['appProperties']['seq']))
+        
+        graph = memory_graph.parse_graph(
+            self._download_bytes(service, chain_id).decode('utf-8').splitlines()
+        )
+        for delta in deltas:
+            memory_graph.apply_patch(graph, json.loads(self._download_bytes(service, delta['id'])))
+        
+        tmp_path = temp_path_for(dest_path, suffix='.restore')
+        try:
+            memory_graph.dump_graph(graph, tmp_path)
+            fsync_and_replace(tmp_path, dest_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        logger.info(f"Restored {dest_path} from snapshot {chain_id} + {len(deltas)} deltas")
+        return dest_path
+    
+    def apply_retention(self, folder_name=config.DRIVE_FOLDER_NAME, policy=None, dry_run=False,
+                        file_name='memory.json'):
+        """
+        이름 변경으로 쌓인 타임스탬프 백업에 보관 정책 적용
+        
+        Args:
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            policy (RetentionPolicy): 보관 정책 (None이면 config 값)
+            dry_run (bool): True면 삭제하지 않고 대상만 반환
+            file_name (str): 백업 원본의 드라이브 파일 이름
+            
+        Returns:
+            list: 삭제한(dry_run이면 삭제할) 파일 정보 목록 (id, name, time)
+        """
+        policy = policy or RetentionPolicy.from_config()
+        pattern = backup_name_pattern(file_name)
+        # 정리는 급하지 않으므로 진행 중인 백업의 호출이 먼저 나가게 함
+        with self.scheduler.background():
+            folder_id = self.folder_manager.get_or_create_folder(folder_name)
+            files = self._list_folder_files(
+                self.drive_service,
+                f"'{folder_id}' in parents and trashed=false",
+                fields='id, name'
+            )
+        
+        backups = []
+        for file in files:
+            backup_time = parse_backup_time(file['name'], pattern)
+            if backup_time:
+                backups.append({'id': file['id'], 'name': file['name'], 'time': backup_time})
+        
+        keep, delete = select_backups_to_delete(backups, policy)
+        logger.info(f"Retention: {len(backups)} backups, keeping {len(keep)}, "
+                    f"{'would delete' if dry_run else 'deleting'} {len(delete)}")
+        if dry_run:
+            for backup in delete:
+                logger.info(f"[dry-run] would delete {backup['name']}")
+            return delete
+        
+        with self.scheduler.background():
+            failed = self._batch_delete(self.drive_service, [backup['id'] for backup in delete])
+        if failed:
+            logger.warning(f"Retention: {len(failed)} deletes failed")
+        deleted = [backup for backup in delete if backup['id'] not in failed]
+        self.catalog.remove([backup['id'] for backup in deleted])
+        return deleted
+    
+    def rebuild_history(self, folder_name=config.DRIVE_FOLDER_NAME, source_path=None, file_name='memory.json'):
+        """
+        드라이브의 백업을 오래된 것부터 내려받아 히스토리 인덱스 재구성
+        
+        인덱스를 처음 만들 때나 다른 PC에서 올린 백업을 반영할 때 사용
+        (평소에는 백업할 때마다 자동으로 갱신됨)
+        
+        Args:
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            source_path (str): 이력을 묶을 원본 파일 경로 (None이면 config.MEMORY_SOURCE_PATH)
+            file_name (str): 백업할 때 사용한 드라이브 파일 이름
+            
+        Returns:
+            int: 인덱싱한 버전 수
+        """
+        service = self.drive_service
+        source_path = source_path or config.MEMORY_SOURCE_PATH
+        self.history.clear(source_path)
+        
+        count = 0
+        for graph, version_key, name, created_at in self._iter_backup_graphs(service, folder_name, file_name):
+            self.history.index_version(source_path, graph, version_key, name=name, created_at=created_at)
+            count += 1
+        
+        logger.info(f"History index rebuilt: {count} versions of {file_name} in '{folder_name}'")
+        return count
+    
+    def _iter_backup_graphs(self, service, folder_name, file_name):
+        """백업 버전을 오래된 것부터 (graph, version_key, name, created_at)로 반환"""
+        if self.backup_mode == 'dedup':
+            for manifest_file in self._list_manifests(service, folder_name, file_name):
+                manifest = json.loads(self._download_bytes(service, manifest_file['id']))
+                data = b''.join(self._iter_manifest_chunks(manifest))
+                yield (
+                    memory_graph.parse_graph(data.decode('utf-8').splitlines()),
+                    manifest_file['id'],
+                    manifest_file['name'],
+                    manifest_file['createdTime']
+                )
+            return
+        
+        if self.backup_mode != 'delta':
+            for point in self.list_restore_points(folder_name, file_name):
+                data = self._download_bytes(service, point['file_id'], point['revision_id'])
+                yield (
+                    memory_graph.parse_graph(data.decode('utf-8').splitlines()),
+                    self._history_version_key(point['file_id'], point['revision_id']),
+                    point['name'],
+                    point['time']
+                )
+            return
+        
+        # delta 모드는 체인마다 전체 스냅샷에 패치를 차례로 적용하면서 버전을 만듦
+        folder_id = self.folder_manager.get_or_create_folder(folder_name)
+        snapshots = self._list_folder_files(
+            service,
+            f"'{folder_id}' in parents and trashed=false and "
+            f"appProperties has {{ key='deltaKind' and value='full' }} and "
+            f"appProperties has {{ key='deltaSource' and value='{file_name}' }}"
+        )
+        for snapshot in sorted(snapshots, key=lambda f: f['createdTime']):
+            graph = memory_graph.parse_graph(
+                self._download_bytes(service, snapshot['id']).decode('utf-8').splitlines()
+            )
+            yield graph, snapshot['id'], snapshot['name'], snapshot['createdTime']
+            
+            deltas = self._list_folder_files(
+                service,
+                f"'{folder_id}' in parents and trashed=false and "
+                f"appProperties has {{ key='chainId' and value='{snapshot['id']}' }}"
+            )
+            for delta in sorted(deltas, key=lambda f: int(f['appProperties']['seq'])):
+                memory_graph.apply_patch(graph, json.loads(self._download_bytes(service, delta['id'])))
+                yield graph, delta['id'], delta['name'], delta['createdTime']
+    
+    def resync_catalog(self, folder_name=config.DRIVE_FOLDER_NAME):
+        """
+        Drive 폴더를 다시 읽어서 로컬 카탈로그 재구성
+        
+        원본 경로는 Drive에 없으므로 기존 카탈로그에 남아있던 값만 유지
+        
+        Returns:
+            int: 카탈로그에 기록된 항목 수
+        """
+        # 재구성은 급하지 않으므로 진행 중인 백업의 호출이 먼저 나가게 함
+        with self.scheduler.background():
+            return self._resync_catalog(folder_name)
+    
+    def _resync_catalog(self, folder_name):
+        """Drive 폴더 목록과 리비전을 읽어서 폴더의 카탈로그 항목을 교체"""
+        service = self.drive_service
+        folder_id = self.folder_manager.get_or_create_folder(folder_name)
+        known_sources = {row['file_id']: row['source_path'] for row in self.catalog.list(folder=folder_name)}
+        
+        entries = []
+        for file in self._list_folder_files(
+            service,
+            f"'{folder_id}' in parents and trashed=false and mimeType != '{FOLDER_MIME_TYPE}'",
+            fields='id, name, size, md5Checksum, createdTime, modifiedTime, headRevisionId, appProperties'
+        ):
+            app_properties = file.get('appProperties') or {}
+            codec = app_properties.get('codec')
+            entry = {
+                'file_id': file['id'],
+                'name': file['name'],
+                'folder': folder_name,
+                'source_path': known_sources.get(file['id']),
+                'codec': codec
+            }
+            
+            # 이름 변경된 백업이나 delta 조각은 파일 하나가 곧 백업 하나
+            if app_properties.get('deltaKind') or app_properties.get('manifestSource') or _ROTATED_NAME.search(file['name']):
+                entries.append(dict(
+                    entry,
+                    revision_id=file.get('headRevisionId') or '',
+                    kind=app_properties.get('deltaKind') or ('dedup' if app_properties.get('manifestSource') else 'rotate'),
+                    created_at=normalize_time(file['createdTime']),
+                    size=None if codec else int(file.get('size', 0)),
+                    md5=self._remote_source_md5(file),
+                    stored_size=int(file.get('size', 0))
+                ))
+                continue
+            
+            # 현재 파일은 리비전마다 백업 하나 (rotate 모드면 리비전이 하나뿐)
+            revisions = self.list_revisions(file_id=file['id'])
+            kind = 'revision' if len(revisions) > 1 else 'rotate'
+            for revision in revisions:
+                is_head = revision['id'] == file.get('headRevisionId')
+                entries.append(dict(
+                    entry,
+                    revision_id=revision['id'],
+                    kind=kind,
+                    created_at=normalize_time(revision['modifiedTime']),
+                    size=None if codec else int(revision.get('size', 0)),
+                    md5=self._remote_source_md5(file) if is_head else revision.get('md5Checksum'),
+                    stored_size=int(revision.get('size', 0)),
+                    codec=codec if is_head else None
+                ))
+        
+        self.catalog.clear(folder_name)
+        self.catalog.record_many(entries)
+        logger.info(f"Catalog resynced: {len(entries)} backups in '{folder_name}'")
+        return len(entries)
+    
+    def _batch_delete(self, service, file_ids):
+        """
+        Drive 배치 요청으로 파일 일괄 삭제 (배치당 최대 100개)
+        
+        배치 안의 요청도 할당량을 하나씩 쓰므로 요청 수만큼 토큰을 받고,
+        속도 제한으로 실패한 삭제는 스케줄러 백오프 후 다시 모아서 보냄
+        
+        Returns:
+            dict: 삭제에 실패한 파일 ID와 에러
+        """
+        failed = {}
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                failed[request_id] = exception
+        
+        pending = list(file_ids)
+        attempt = 0
+        while pending:
+            for start in range(0, len(pending), 100):
+                ids = pending[start:start + 100]
+                batch = service.new_batch_http_request(callback=on_response)
+                for file_id in ids:
+                    batch.add(service.files().delete(fileId=file_id), request_id=file_id)
+                self.scheduler.call(batch.execute, cost=len(ids))
+            
+            pending = [file_id for file_id, error in failed.items() if is_rate_limited(error)]
+            if not pending or attempt >= self.scheduler.max_retries:
+                break
+            self.scheduler.throttle(attempt, reason=f"rate limit on {len(pending)} batched deletes")
+            attempt += 1
+            for file_id in pending:
+                del failed[file_id]
+        return failed
+    
+    def _update_file_in_place(self, service, source_path, file_id, source_md5=None):
+        """
+        기존 파일의 내용만 갱신 (revision 모드)
+        
+        Args:
+            source_md5 (str): source_path의 MD5를 이미 알면 전달 (다시 읽지 않음)
+        
+        Returns:
+            dict: 갱신된 파일 정보 (파일이 없어졌으면 None)
+        """
+        try:
+            with run_metrics.phase('update_file_in_place'), \
+                    self._upload_media(source_path, source_md5) as (media, codec_properties, upload_md5):
+                # None 값은 이전 업로드의 codec 정보를 지움
+                request = service.files().update(
+                    fileId=file_id,
+                    body={'appProperties': codec_properties},
+                    media_body=media,
+                    fields=f'{UPLOAD_FIELDS}, trashed'
+                )
+                file = self._execute_resumable(request, f"update:{file_id}:{upload_md5}")
+        except HttpError as e:
+            if e.resp.status == 404:
+                logger.info(f"File {file_id} no longer exists. Uploading a new one")
+                return None
+            raise
+        
+        if file.get('trashed'):
+            return None
+        
+        logger.info("File content updated as a new revision")
+        self._keep_revision(service, file['id'], file.get('headRevisionId'))
+        return file
+    
+    def _keep_revision(self, service, file_id, revision_id):
+        """
+        하루 첫 리비전만 자동 정리되지 않도록 keepForever 표시
+        
+        Drive는 파일당 keepForever 리비전을 200개까지만 허용하므로 REVISION_KEEP_FOREVER_LIMIT개가 차면
+        오래된 것부터 해제하고, 그래도 실패하면 경고만 남김 (내용은 이미 올라갔으므로 백업은 성공)
+        """
+        if not config.REVISION_KEEP_FOREVER or not revision_id:
+            return
+        today = datetime.now().strftime('%Y-%m-%d')
+        if self.backup_state.get_pinned_day(file_id) == today:
+            return
+        
+        try:
+            self._unpin_old_revisions(service, file_id, config.REVISION_KEEP_FOREVER_LIMIT - 1)
+            self.scheduler.execute(service.revisions().update(
+                fileId=file_id,
+                revisionId=revision_id,
+                body={'keepForever': True}
+            ))
+        except HttpError as e:
+            logger.warning(f"Could not keep revision {revision_id} forever: {e}")
+            return
+        self.backup_state.save_pinned_day(file_id, today)
+    
+    def _unpin_old_revisions(self, service, file_id, keep):
+        """keepForever 리비전이 keep개만 남도록 오래된 것부터 해제"""
+        pinned = [revision for revision in self._list_revisions(service, file_id) if revision.get('keepForever')]
+        for revision in pinned[:max(0, len(pinned) - keep)]:
+            self.scheduler.execute(service.revisions().update(
+                fileId=file_id,
+                revisionId=revision['id'],
+                body={'keepForever': False}
+            ))
+            logger.info(f"Revision {revision['id']} ({revision['modifiedTime']}) is no longer kept forever")
+    
+    def _resolve_memory_file_id(self, folder_name, file_name='memory.json'):
+        """폴더 안의 현재 memory.json 파일 ID 조회"""
+        folder_id = self.folder_manager.get_or_create_folder(folder_name)
+        existing_file = self._find_existing_file(self.drive_service, folder_id, file_name)
+        if not existing_file:
+            raise Exception(f"'{folder_name}' 폴더에 {file_name}이 없어ㅠㅠ")
+        return existing_file['id']
+    
+    def list_revisions(self, file_id=None, folder_name=config.DRIVE_FOLDER_NAME, file_name='memory.json'):
+        """
+        memory.json의 리비전 목록 조회 (오래된 것부터)
+        
+        Args:
+            file_id (str): 대상 파일 ID (None이면 폴더의 memory.json)
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            file_name (str): file_id가 없을 때 찾을 드라이브 파일 이름
+            
+        Returns:
+            list: id, modifiedTime, size, md5Checksum, keepForever를 담은 리비전 목록
+        """
+        file_id = file_id or self._resolve_memory_file_id(folder_name, file_name)
+        return self._list_revisions(self.drive_service, file_id)
+    
+    def _list_revisions(self, service, file_id):
+        """파일의 리비전 전체 목록 (페이지를 모두 읽음)"""
+        revisions = []
+        page_token = None
+        while True:
+            response = self.scheduler.execute(service.revisions().list(
+                fileId=file_id,
+                fields='nextPageToken, revisions(id, modifiedTime, size, md5Checksum, keepForever)',
+                pageToken=page_token
+            ))
+            revisions.extend(response.get('revisions', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return revisions
+    
+    def restore_revision(self, revision_id, dest_path, file_id=None, folder_name=config.DRIVE_FOLDER_NAME,
+                         file_name='memory.json'):
+        """
+        특정 리비전의 내용을 로컬 파일로 복원
+        
+        Args:
+            revision_id (str): 복원할 리비전 ID
+            dest_path (str): 복원된 내용을 저장할 경로
+            file_id (str): 대상 파일 ID (None이면 폴더의 memory.json)
+            folder_name (str): 구글 드라이브의 대상 폴더 이름
+            file_name (str): file_id가 없을 때 찾을 드라이브 파일 이름
+            
+        Returns:
+            str: 복원된 파일 경로
+        """
+        file_id = file_id or self._resolve_memory_file_id(folder_name, file_name)
+        request = self.drive_service.revisions().get_media(fileId=file_id, revisionId=revision_id)
+        self._restore_media(request, dest_path)
+        
+        logger.info(f"Revision {revision_id} restored to {dest_path}")
+        return dest_path
 
 
 if __name__ == "__main__":
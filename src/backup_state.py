@@ -0,0 +1,130 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+class BackupState:
+    """마지막으로 업로드한 파일의 지문(fingerprint)을 로컬에 저장하고 조회"""
+
+    def __init__(self, state_path, upload_session_max_age=None):
+        """
+        BackupState 초기화
+
+        Args:
+            state_path (str): 지문을 저장할 JSON 파일 경로
+            upload_session_max_age (float): 이 시간(초)보다 오래된 업로드 세션은 저장할 때 정리 (None이면 두기)
+        """
+        self.state_path = state_path
+        self.upload_session_max_age = upload_session_max_age
+        self.state = self._load()
+        # 여러 작업자 스레드가 동시에 기록할 수 있으므로 변경과 저장을 묶어서 보호
+        self.lock = threading.RLock()
+
+    def _load(self):
+        """저장된 상태 파일 읽기 (없거나 깨져 있으면 빈 상태로 시작)"""
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """상태 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        with self.lock:
+            self._prune_upload_sessions()
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_path)
+
+    def _set(self, key, value):
+        """항목을 기록(value가 None이면 삭제)하고 저장"""
+        with self.lock:
+            if value is None:
+                if self.state.pop(key, None) is None:
+                    return
+            else:
+                self.state[key] = value
+            self._save()
+
+    @staticmethod
+    def _key(source_path, folder_name):
+        return f"{folder_name}/{os.path.abspath(source_path)}"
+
+    def get_fingerprint(self, source_path, folder_name):
+        """마지막 업로드 지문 반환 (없으면 None)"""
+        return self.state.get(self._key(source_path, folder_name))
+
+    def save_fingerprint(self, source_path, folder_name, md5, file_id, stat=None):
+        """
+        업로드(또는 동일 내용 확인) 후 지문 기록
+
+        Args:
+            stat (list): 읽기 전에 잰 stat_signature (다음 백업에서 같으면 파일을 읽지 않고 건너뜀)
+        """
+        self._set(self._key(source_path, folder_name), {
+            'md5': md5,
+            'size': stat[0] if stat else os.path.getsize(source_path),
+            'stat': stat,
+            'file_id': file_id,
+            'uploaded_at': datetime.now().isoformat(timespec='seconds')
+        })
+
+    def get_delta_chain(self, source_path, folder_name):
+        """delta 모드의 현재 체인 정보 반환 (full_id, seq, base_path)"""
+        return self.state.get(f"delta:{self._key(source_path, folder_name)}")
+
+    def save_delta_chain(self, source_path, folder_name, full_id, seq, base_path):
+        """delta 체인 정보 기록"""
+        self._set(f"delta:{self._key(source_path, folder_name)}", {
+            'full_id': full_id,
+            'seq': seq,
+            'base_path': str(base_path)
+        })
+
+    def get_pinned_day(self, file_id):
+        """revision 모드에서 마지막으로 keepForever 표시한 날짜 (YYYY-mm-dd, 없으면 None)"""
+        return self.state.get(f"pin:{file_id}")
+
+    def save_pinned_day(self, file_id, day):
+        """keepForever 표시한 날짜 기록"""
+        self._set(f"pin:{file_id}", day)
+
+    @staticmethod
+    def _is_expired(session, max_age):
+        return max_age is not None and time.time() - session.get('created_at', 0) > max_age
+
+    def _prune_upload_sessions(self):
+        """다시 찾지 않을(내용이 바뀌었거나 끝내 안 돌린) 만료된 업로드 세션 삭제"""
+        for key in [k for k, v in self.state.items()
+                    if k.startswith('upload:') and self._is_expired(v, self.upload_session_max_age)]:
+            del self.state[key]
+
+    def get_upload_session(self, session_key, max_age=None):
+        """저장된 재개 가능한 업로드 세션 반환 (max_age초보다 오래됐으면 지우고 None)"""
+        key = f"upload:{session_key}"
+        with self.lock:
+            session = self.state.get(key)
+            if session and self._is_expired(session, max_age):
+                self._set(key, None)
+                return None
+            return session
+
+    def save_upload_session(self, session_key, uri, offset, name=None):
+        """업로드 세션 URI와 서버에 반영된 오프셋, 새로 만드는 파일 이름 기록"""
+        key = f"upload:{session_key}"
+        previous = self.state.get(key)
+        self._set(key, {
+            'uri': uri,
+            'offset': offset,
+            'name': name,
+            'created_at': previous['created_at'] if previous and previous['uri'] == uri else time.time()
+        })
+
+    def clear_upload_session(self, session_key):
+        """완료되었거나 만료된 업로드 세션 삭제"""
+        self._set(f"upload:{session_key}", None)
@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timezone
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backups (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_id TEXT NOT NULL,
+    revision_id TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL,
+    folder TEXT,
+    source_path TEXT,
+    kind TEXT,
+    created_at TEXT NOT NULL,
+    size INTEGER,
+    md5 TEXT,
+    stored_size INTEGER,
+    codec TEXT,
+    UNIQUE (file_id, revision_id)
+);
+CREATE INDEX IF NOT EXISTS idx_backups_created_at ON backups (created_at);
+CREATE INDEX IF NOT EXISTS idx_backups_source ON backups (source_path, created_at);
+"""
+
+_COLUMNS = ('id', 'file_id', 'revision_id', 'name', 'folder', 'source_path', 'kind',
+            'created_at', 'size', 'md5', 'stored_size', 'codec')
+
+def normalize_time(value=None):
+    """datetime 또는 ISO 8601 문자열을 UTC 'YYYY-mm-ddTHH:MM:SSZ' 형식으로 통일 (None이면 현재 시각)"""
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        # 시간대가 없으면 로컬 시각으로 간주
+        value = value.astimezone()
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class BackupCatalog:
+    """백업 이력을 로컬 SQLite에 기록해서 네트워크 없이 조회하는 카탈로그"""
+
+    def __init__(self, db_path):
+        """
+        BackupCatalog 초기화
+
+        Args:
+            db_path (str): SQLite 파일 경로
+        """
+        self.db_path = str(db_path)
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        """호출마다 새 연결 (작업자 스레드에서도 안전하게 쓰기 위함)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return closing(conn)
+
+    def _write(self, sql, params_list):
+        with self.lock, self._connect() as conn:
+            with conn:
+                conn.executemany(sql, params_list)
+
+    def record(self, file_id, name, created_at=None, revision_id=None, folder=None, source_path=None,
+               kind=None, size=None, md5=None, stored_size=None, codec=None):
+        """백업 한 건 기록 (같은 파일/리비전이면 덮어씀)"""
+        self.record_many([{
+            'file_id': file_id,
+            'revision_id': revision_id or '',
+            'name': name,
+            'folder': folder,
+            'source_path': os.path.abspath(source_path) if source_path else None,
+            'kind': kind,
+            'created_at': normalize_time(created_at),
+            'size': size,
+            'md5': md5,
+            'stored_size': stored_size,
+            'codec': codec
+        }])
+
+    def record_many(self, entries):
+        """백업 여러 건을 한 트랜잭션으로 기록"""
+        columns = _COLUMNS[1:]
+        self._write(
+            f"INSERT OR REPLACE INTO backups ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            [tuple(entry.get(column) for column in columns) for entry in entries]
+        )
+
+    def rename(self, file_id, name):
+        """이름 변경 반영 (rotate 모드의 memory.json -> memory_<ts>.json)"""
+        self._write("UPDATE backups SET name = ? WHERE file_id = ?", [(name, file_id)])
+
+    def remove(self, file_ids):
+        """삭제된 파일의 기록 제거"""
+        self._write("DELETE FROM backups WHERE file_id = ?", [(file_id,) for file_id in file_ids])
+
+    def clear(self, folder=None):
+        """카탈로그 비우기 (folder를 주면 해당 폴더만)"""
+        if folder is None:
+            self._write("DELETE FROM backups", [()])
+        else:
+            self._write("DELETE FROM backups WHERE folder = ?", [(folder,)])
+
+    def list(self, source_path=None, folder=None, since=None, until=None, limit=None):
+        """
+        백업 목록 조회 (최신순)
+
+        Args:
+            source_path (str): 원본 파일 경로로 필터
+            folder (str): 드라이브 폴더 이름으로 필터
+            since (str | datetime): 이 시각 이후만
+            until (str | datetime): 이 시각 이전만
+            limit (int): 최대 개수
+
+        Returns:
+            list: 백업 정보 dict 목록
+        """
+        conditions, params = [], []
+        if source_path:
+            conditions.append("source_path = ?")
+            params.append(os.path.abspath(source_path))
+        if folder:
+            conditions.append("folder = ?")
+            params.append(folder)
+        if since:
+            conditions.append("created_at >= ?")
+            params.append(normalize_time(since))
+        if until:
+            conditions.append("created_at <= ?")
+            params.append(normalize_time(until))
+
+        sql = "SELECT * FROM backups"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY created_at DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def show(self, key):
+        """카탈로그 ID, 파일 ID, 리비전 ID 중 하나로 백업 한 건 조회 (없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM backups WHERE CAST(id AS TEXT) = ? OR file_id = ? OR revision_id = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (str(key), key, key)
+            ).fetchone()
+        return dict(row) if row else None
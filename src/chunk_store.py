@@ -0,0 +1,154 @@
+import hashlib
+import os
+import threading
+import zlib
+
+if __name__ != "__main__":
+    from src.utils.file_utils import temp_path_for
+else:
+    from utils.file_utils import temp_path_for
+
+# 드라이브 백업 폴더 안에서 청크를 모아두는 하위 폴더 이름
+CHUNKS_FOLDER_NAME = 'chunks'
+
+MANIFEST_FORMAT = 1
+
+# 레코드 안에서 자를 때 쓰는 gear 해시 표 (바이트값마다 고정된 64비트 난수 - 바뀌면 청크 경계가 모두 달라짐)
+_GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], 'little') for i in range(256)]
+_MASK64 = (1 << 64) - 1
+
+def chunk_digest(data):
+    """청크 내용의 주소 (SHA-256 hex) - 드라이브의 청크 파일 이름으로도 사용"""
+    return hashlib.sha256(data).hexdigest()
+
+def iter_chunks(f, min_size=64 * 1024, avg_size=256 * 1024, max_size=1024 * 1024):
+    """
+    내용 기반 청킹 (content-defined chunking)
+
+    JSON-lines 레코드 경계에서만 자르고, 자를지 여부는 레코드 내용의 해시(crc32)로 결정
+    중간에 레코드가 추가/삭제되어도 그 주변 청크만 바뀌고 나머지 경계는 그대로 유지됨
+    레코드 길이에 비례한 확률로 자르므로 청크 크기는 평균 avg_size 근처가 됨
+    max_size보다 긴 레코드는 그 안에서 gear 롤링 해시로 경계를 찾으므로(_split_record),
+    큰 observation 중간에 몇 바이트가 끼어도 그 근처 청크만 바뀜
+
+    Args:
+        f: 바이너리 모드로 연 파일 객체
+        min_size (int): 이보다 작으면 자르지 않음
+        avg_size (int): 목표 평균 청크 크기
+        max_size (int): 이 크기를 넘기 전에 강제로 자름 (한 레코드가 이보다 크면 레코드 안에서 내용 기반으로 자름)
+
+    Yields:
+        bytes: 청크 내용
+    """
+    # 레코드 1바이트당 경계가 될 확률 = 1 / (avg_size - min_size)
+    cut_scale = (1 << 32) // max(avg_size - min_size, 1)
+    pending, size = [], 0
+
+    for line in f:
+        if len(line) > max_size:
+            if pending:
+                yield b''.join(pending)
+                pending, size = [], 0
+            yield from _split_record(line, min_size, avg_size, max_size)
+            continue
+
+        if size + len(line) > max_size:
+            yield b''.join(pending)
+            pending, size = [], 0
+
+        pending.append(line)
+        size += len(line)
+        if size >= min_size and zlib.crc32(line) < len(line) * cut_scale:
+            yield b''.join(pending)
+            pending, size = [], 0
+
+    if pending:
+        yield b''.join(pending)
+
+def _split_record(record, min_size, avg_size, max_size):
+    """
+    max_size보다 긴 레코드를 gear 롤링 해시로 자름 (고정 오프셋으로 자르면 1바이트만 끼어도 뒤 청크가 모두 밀림)
+
+    해시는 최근 64바이트로만 정해지므로 경계는 내용을 따라 움직이고, 변경 지점 뒤에서 같은 경계를 만나면
+    나머지 청크는 그대로 유지됨
+    """
+    # 바이트마다 경계가 될 확률 = 1 / (avg_size - min_size), 최소 크기 전까지는 해시만 채움
+    threshold = (1 << 64) // max(avg_size - min_size, 1)
+    warmup = min(64, min_size)
+    start = 0
+    while len(record) - start > max_size:
+        cut, h = start + max_size, 0
+        for i in range(start + min_size - warmup, start + max_size):
+            h = ((h << 1) + _GEAR[record[i]]) & _MASK64
+            if i >= start + min_size and h < threshold:
+                cut = i + 1
+                break
+        yield record[start:cut]
+        start = cut
+    yield record[start:]
+
+class ChunkIndex:
+    """
+    드라이브에 이미 올라간 청크 목록 (청크 폴더 ID -> digest -> 드라이브 파일 ID)
+
+    "이 청크가 이미 있나?"를 API 호출 없이 답하기 위한 로컬 캐시
+    청크는 백업 폴더마다 따로 저장되므로 청크 폴더별로 구분 (다른 폴더의 청크를 매니페스트에 넣지 않도록)
+    한 줄에 'folder_id digest file_id'씩 추가만 하는 텍스트 파일로 저장
+    """
+
+    def __init__(self, index_path):
+        """
+        ChunkIndex 초기화
+
+        Args:
+            index_path (str): 인덱스 파일 경로
+        """
+        self.index_path = str(index_path)
+        self.lock = threading.Lock()
+        self.folders = self._load()
+
+    def _load(self):
+        folders = {}
+        if not os.path.exists(self.index_path):
+            return folders
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                # 마지막 줄이 쓰다 만 상태일 수 있으니 형식이 맞는 줄만 사용
+                # (폴더 구분이 없던 예전 'digest file_id' 줄은 버리고 드라이브에서 다시 채움)
+                if len(parts) == 3 and len(parts[1]) == 64:
+                    folders.setdefault(parts[0], {})[parts[1]] = parts[2]
+        return folders
+
+    def has_folder(self, folder_id):
+        """이 청크 폴더의 목록이 있는지 (없으면 드라이브에서 한 번 채워야 함)"""
+        return folder_id in self.folders
+
+    def count(self, folder_id):
+        """청크 폴더에 있는 것으로 알고 있는 청크 수"""
+        return len(self.folders.get(folder_id, {}))
+
+    def get(self, folder_id, digest):
+        """청크 폴더 안에서 청크의 드라이브 파일 ID (모르면 None)"""
+        return self.folders.get(folder_id, {}).get(digest)
+
+    def add(self, folder_id, digest, file_id):
+        """새로 올린 청크 기록"""
+        with self.lock:
+            self.folders.setdefault(folder_id, {})[digest] = file_id
+            os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(f"{folder_id} {digest} {file_id}\n")
+
+    def replace_folder(self, folder_id, chunks):
+        """드라이브에서 다시 읽은 목록으로 한 청크 폴더의 인덱스 교체 (다른 폴더는 그대로)"""
+        with self.lock:
+            self.folders[folder_id] = dict(chunks)
+            tmp_path = temp_path_for(self.index_path)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(
+                    f"{folder} {digest} {file_id}\n"
+                    for folder, folder_chunks in self.folders.items()
+                    for digest, file_id in folder_chunks.items()
+                )
+            os.replace(tmp_path, self.index_path)
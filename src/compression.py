@@ -0,0 +1,116 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+
+if __name__ != "__main__":
+    from src.utils.file_utils import HashingWriter
+else:
+    from utils.file_utils import HashingWriter
+
+# 스트리밍 압축/해제 시 한 번에 처리할 바이트 수 (메모리 사용량 상한)
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+CODECS = ('gzip', 'zstd')
+DEFAULT_LEVELS = {'gzip': 6, 'zstd': 3}
+MIME_TYPES = {'gzip': 'application/gzip', 'zstd': 'application/zstd'}
+
+# 압축 형식 판별용 매직 바이트
+_MAGIC = {
+    b'\x1f\x8b': 'gzip',
+    b'\x28\xb5\x2f\xfd': 'zstd'
+}
+
+def _zstandard():
+    """zstandard 모듈 가져오기 (선택 의존성)"""
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd 압축을 쓰려면 zstandard 패키지가 필요해: pip install zstandard")
+    return zstandard
+
+def _check_codec(codec):
+    if codec not in CODECS:
+        raise ValueError(f"Unknown compression codec: {codec}")
+
+def compress_stream(src, dst, codec, level=None):
+    """파일 객체 src를 codec으로 압축해서 dst에 스트리밍으로 기록"""
+    _check_codec(codec)
+    level = DEFAULT_LEVELS[codec] if level is None else level
+
+    if codec == 'gzip':
+        # mtime=0: 같은 입력이면 항상 같은 바이트가 나오도록 고정
+        with gzip.GzipFile(fileobj=dst, mode='wb', compresslevel=level, mtime=0) as gz:
+            shutil.copyfileobj(src, gz, STREAM_CHUNK_SIZE)
+    else:
+        compressor = _zstandard().ZstdCompressor(level=level)
+        compressor.copy_stream(src, dst, read_size=STREAM_CHUNK_SIZE, write_size=STREAM_CHUNK_SIZE)
+
+def decompress_stream(src, dst, codec):
+    """파일 객체 src를 codec으로 풀어서 dst에 스트리밍으로 기록"""
+    _check_codec(codec)
+
+    if codec == 'gzip':
+        with gzip.GzipFile(fileobj=src, mode='rb') as gz:
+            shutil.copyfileobj(gz, dst, STREAM_CHUNK_SIZE)
+    else:
+        decompressor = _zstandard().ZstdDecompressor()
+        decompressor.copy_stream(src, dst, read_size=STREAM_CHUNK_SIZE, write_size=STREAM_CHUNK_SIZE)
+
+def detect_codec(header):
+    """앞부분 바이트로 압축 형식 판별 (압축되지 않았으면 None)"""
+    for magic, codec in _MAGIC.items():
+        if header.startswith(magic):
+            return codec
+    return None
+
+def compress_to_temp(source_path, codec, level=None, with_md5=False):
+    """
+    파일을 압축해서 임시 파일로 저장
+
+    Args:
+        with_md5 (bool): 압축된 바이트의 MD5도 쓰면서 같이 계산해서 반환
+
+    Returns:
+        str: 압축된 임시 파일 경로 (사용 후 호출한 쪽에서 삭제)
+             with_md5면 (경로, MD5)
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=f'.{codec}')
+    try:
+        with open(source_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+            writer = HashingWriter(dst)
+            compress_stream(src, writer, codec, level)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    if with_md5:
+        return tmp_path, writer.md5.hexdigest()
+    return tmp_path
+
+def decompress_file(path):
+    """
+    압축된 파일이면 같은 경로에 풀어서 교체
+
+    Returns:
+        str: 감지된 codec (압축되지 않았으면 None)
+    """
+    with open(path, 'rb') as f:
+        codec = detect_codec(f.read(4))
+    if not codec:
+        return None
+
+    tmp_path = f"{path}.decompress"
+    with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        decompress_stream(src, dst, codec)
+    os.replace(tmp_path, path)
+    return codec
+
+def decompress_bytes(data):
+    """압축된 바이트면 풀어서, 아니면 그대로 반환"""
+    codec = detect_codec(data[:4])
+    if not codec:
+        return data
+    output = io.BytesIO()
+    decompress_stream(io.BytesIO(data), output, codec)
+    return output.getvalue()
@@ -19,6 +19,12 @@ def get_application_path():
         base_path = Path(__file__).parent.parent
     return base_path
 
+def get_log_dir():
+    """로그 디렉토리 ([실행파일위치]/[프로젝트명]/logs, 개발 중에는 저장소 아래 [프로젝트명]/logs)"""
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).parent / project_name / 'logs'
+    return Path(__file__).parent.parent / project_name / 'logs'
+
 @dataclass
 class Config:
     """Application configuration"""
@@ -28,6 +34,13 @@ class Config:
     CREDENTIALS_PATH: Path = CREDENTIALS_DIR / 'credentials.json'
     TOKEN_PATH: Path = CREDENTIALS_DIR / 'token.json'
     FOLDER_CACHE_PATH: Path = CREDENTIALS_DIR / 'folder_cache.json'
+    # 로컬 백업 상태 (credentials/는 exe에 같이 묶이므로 사용자마다 다른 데이터는 따로 둠)
+    DATA_DIR: Path = ROOT_DIR / 'data'
+    BACKUP_STATE_PATH: Path = DATA_DIR / 'backup_state.json'  # 파일별 지문과 이어서 올릴 업로드 세션
+    CATALOG_PATH: Path = DATA_DIR / 'catalog.sqlite3'  # 로컬 백업 이력 카탈로그
+    HISTORY_INDEX_PATH: Path = DATA_DIR / 'history.sqlite3'  # 버전별 엔티티/관찰 변경 이력 인덱스
+    CHUNK_INDEX_PATH: Path = DATA_DIR / 'chunk_index.txt'  # dedup 모드에서 드라이브에 올라간 청크 목록 (청크 폴더별)
+    DELTA_BASE_DIR: Path = DATA_DIR / 'delta'  # delta 모드에서 마지막으로 올린 그래프 사본
     
     # Memory file path
     MEMORY_SOURCE_PATH: str = r"C:\Users\asahi\AppData\Roaming\npm\node_modules\@modelcontextprotocol\server-memory\dist\memory.json"
@@ -35,9 +48,62 @@ class Config:
     # Google Drive settings
     DRIVE_FOLDER_NAME: str = 'claude-memory'
     DEFAULT_MIME_TYPE: str = 'application/json'
+    FOLDER_CACHE_TTL_SECONDS: float = 3600  # 캐시된 폴더 ID를 files().get 검증 없이 쓰는 시간
+    
+    # HTTP transport settings
+    HTTP_TRANSPORT: str = 'session'  # 'session': 모든 호출이 연결 풀 하나를 공유 (keep-alive, 타임아웃, 재시도), 'httplib2': googleapiclient 기본 전송 (서비스마다 연결 따로)
+    HTTP_POOL_SIZE: int = 10  # 'session' 전송의 최대 동시 연결 수 (BACKUP_WORKERS보다 크게)
+    HTTP_CONNECT_TIMEOUT: float = 10  # 연결 타임아웃 (초)
+    HTTP_READ_TIMEOUT: float = 120  # 응답을 기다리는 타임아웃 (초, 소켓 읽기 한 번 기준)
+    HTTP_MAX_RETRIES: int = 5  # 5xx/연결 끊김 재시도 횟수 (429는 API_RATE_LIMIT_RETRIES)
+    HTTP_RETRY_BASE_SECONDS: float = 0.5  # 재시도 대기 시간 기준 (시도마다 두 배, 0~그 값 사이에서 무작위)
+    HTTP_RETRY_MAX_SECONDS: float = 30  # 재시도 대기 시간 상한
+    
+    # Drive API request scheduling
+    API_REQUESTS_PER_SECOND: float = 8  # Drive API 호출 속도 상한 (토큰 버킷, 여러 PC가 같은 계정으로 백업하면 낮추기)
+    API_BURST: int = 10  # 쉬고 있다가 한 번에 보낼 수 있는 최대 호출 수
+    API_MIN_REQUESTS_PER_SECOND: float = 0.5  # 속도 제한 응답을 받아 늦출 때의 하한
+    API_RATE_LIMIT_RETRIES: int = 8  # 429, 403 rateLimitExceeded/userRateLimitExceeded 재시도 횟수
+    API_BACKOFF_BASE_SECONDS: float = 1  # 속도 제한 대기 시간 기준 (시도마다 두 배, 0~그 값 사이에서 무작위)
+    API_BACKOFF_MAX_SECONDS: float = 64  # 속도 제한 대기 시간 상한
     
     # Backup settings
-    BACKUP_PATHS: List[str] = None  # Optional: Add paths if needed
+    VALIDATE_BEFORE_UPLOAD: bool = True  # 업로드 전에 memory.json 형식/스키마 검증 (깨져 있으면 백업 중단)
+    BACKUP_MODE: str = 'rotate'  # 'rotate': 이름 변경 후 새로 업로드, 'revision': 한 파일을 갱신하고 리비전으로 이력 관리, 'delta': 변경분 패치만 업로드, 'dedup': 새 청크만 업로드하고 버전은 매니페스트로 저장
+    REVISION_KEEP_FOREVER: bool = True  # revision 모드에서 하루 첫 리비전을 자동 삭제되지 않게 보관
+    REVISION_KEEP_FOREVER_LIMIT: int = 180  # 보관 표시한 리비전이 이만큼 차면 오래된 것부터 해제 (Drive 상한은 파일당 200개)
+    DELTA_FULL_SNAPSHOT_EVERY: int = 20  # delta 모드에서 패치 N개마다 전체 스냅샷 업로드
+    DEDUP_CHUNK_MIN_SIZE: int = 64 * 1024  # dedup 모드 청크 최소 크기
+    DEDUP_CHUNK_AVG_SIZE: int = 256 * 1024  # dedup 모드 목표 평균 청크 크기 (작을수록 중복 제거가 잘 되지만 API 호출이 늘어남)
+    DEDUP_CHUNK_MAX_SIZE: int = 1024 * 1024  # dedup 모드 청크 최대 크기 (이보다 긴 레코드는 안에서 롤링 해시로 자름)
+    UPLOAD_COMPRESSION: str = None  # None, 'gzip', 'zstd' (zstd는 zstandard 패키지 필요)
+    COMPRESSION_LEVEL: int = None  # None이면 codec 기본값 (gzip 6, zstd 3)
+    UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024  # 재개 가능한 업로드의 청크 크기 (256KB의 배수)
+    UPLOAD_SESSION_MAX_AGE_SECONDS: float = 6 * 24 * 3600  # 저장된 업로드 세션 URI 유효 기간 (Drive는 1주일, 지나면 상태 파일에서 삭제)
+    DOWNLOAD_CHUNK_SIZE: int = 32 * 1024 * 1024  # 복원 시 한 번의 요청으로 받을 바이트 수 (클수록 왕복이 줄어듦)
+    # Retention settings (이름 변경으로 생긴 memory_YYYYmmddHHMMSS.json 정리)
+    RETENTION_KEEP_LAST: int = 10  # 무조건 남길 최신 백업 수
+    RETENTION_KEEP_DAILY: int = 7  # 최근 N일 동안 하루 하나씩
+    RETENTION_KEEP_WEEKLY: int = 4  # 최근 N주 동안 한 주 하나씩
+    RETENTION_KEEP_MONTHLY: int = 12  # 최근 N개월 동안 한 달 하나씩
+    RETENTION_AUTO_PRUNE: bool = False  # 백업 후 자동으로 보관 정책 적용
+    
+    BACKUP_PATHS: List[str] = None  # Optional: 여러 memory 파일을 동시에 백업할 때 경로 목록 (또는 {드라이브 이름: 경로})
+    BACKUP_WORKERS: int = 4  # BACKUP_PATHS 동시 백업 작업자 수
+    
+    # Watch mode settings
+    WATCH_DEBOUNCE_SECONDS: float = 2.0  # 마지막 쓰기 후 이만큼 조용하면 백업
+    WATCH_POLL_INTERVAL: float = 1.0  # inotify를 못 쓸 때 mtime 확인 주기
+    
+    # Logging settings (로그 디렉토리의 <프로젝트 이름>.log)
+    LOG_DIR: Path = get_log_dir()  # main과 Logger가 같은 파일에 쓰도록 한 곳에서 결정
+    LOG_MAX_BYTES: int = 5 * 1024 * 1024  # 로그 파일이 이 크기를 넘으면 회전 (이전 파일은 gzip 압축)
+    LOG_ROTATE_WHEN: str = None  # 'midnight', 'H' 등을 주면 크기 대신 시간 기준으로 회전
+    LOG_BACKUP_COUNT: int = 10  # 남길 이전 로그 파일 수
+    
+    # Metrics settings
+    METRICS_EXPORT: bool = True  # 백업마다 단계별 시간/바이트/API 호출/재시도를 로그 디렉토리의 metrics.jsonl에 한 줄씩 추가
+    METRICS_PROMETHEUS_PATH: str = None  # 설정하면 node_exporter textfile collector용 파일도 갱신 (예: /var/lib/node_exporter/textfile_collector/memory_vault.prom)
     
     @classmethod
     def load(cls) -> 'Config':
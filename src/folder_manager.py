@@ -1,40 +1,153 @@
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+if __name__ != "__main__":
+    from src.utils.file_utils import temp_path_for
+    from src.utils.run_metrics import run_metrics
+else:
+    from utils.file_utils import temp_path_for
+    from utils.run_metrics import run_metrics
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
 
 class FolderManager:
-    def __init__(self, drive_service):
+    def __init__(self, drive_service, cache_path=None, cache_ttl=3600, execute=None):
+        """
+        FolderManager 초기화
+
+        Args:
+            drive_service: Google Drive API 서비스 객체
+            cache_path (str): 폴더 ID 캐시를 저장할 JSON 파일 경로 (None이면 메모리에만 저장)
+            cache_ttl (float): 캐시된 ID를 검증 없이 믿는 시간 (초)
+            execute: HttpRequest를 실행하는 함수 (None이면 request.execute() 바로 호출)
+        """
         self.drive_service = drive_service
-        self.folder_cache = {}
-        
-    def get_or_create_folder(self, folder_name):
-        """폴더 가져오기 또는 생성"""
-        # 캐시에 있으면 반환
-        if folder_name in self.folder_cache:
-            return self.folder_cache[folder_name]
-            
+        self.execute = execute or (lambda request: request.execute())
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.folder_cache = self._load_cache()
+        # backup_many 작업자 스레드와 비동기 작업이 한 FolderManager를 같이 쓰므로 캐시 변경과 저장을 묶어서 보호
+        self.lock = threading.RLock()
+
+    def _load_cache(self):
+        """디스크에 저장된 폴더 캐시 읽기"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Folder cache is unreadable. Starting with an empty cache")
+            return {}
+        # 형식이 맞는 항목만 사용
+        return {
+            name: entry for name, entry in cache.items()
+            if isinstance(entry, dict) and entry.get('id')
+        }
+
+    def _save_cache(self):
+        """폴더 캐시를 디스크에 저장 (임시 파일에 쓴 뒤 교체, self.lock을 잡고 호출)"""
+        if not self.cache_path:
+            return
+        tmp_path = temp_path_for(self.cache_path)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.folder_cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _remember(self, folder_name, folder_id):
+        """폴더 ID를 검증 시각과 함께 캐시에 기록"""
+        with self.lock:
+            self.folder_cache[folder_name] = {'id': folder_id, 'validated_at': time.time()}
+            self._save_cache()
+
+    def _is_valid_folder(self, folder_id):
+        """캐시된 ID가 아직 살아있는(휴지통에 없는) 폴더인지 files().get으로 확인"""
+        try:
+            folder = self.execute(self.drive_service.files().get(
+                fileId=folder_id,
+                fields='id, mimeType, trashed'
+            ))
+        except HttpError as e:
+            if e.resp.status == 404:
+                return False
+            raise
+        return folder.get('mimeType') == FOLDER_MIME_TYPE and not folder.get('trashed')
+
+    def invalidate(self, folder_name):
+        """캐시에서 폴더 제거"""
+        with self.lock:
+            if self.folder_cache.pop(folder_name, None) is not None:
+                self._save_cache()
+
+    def get_or_create_folder(self, folder_name, parent_id=None):
+        """
+        폴더 가져오기 또는 생성
+
+        Args:
+            folder_name (str): 폴더 이름
+            parent_id (str): 상위 폴더 ID (None이면 위치와 관계없이 이름으로 찾고 내 드라이브 최상위에 생성)
+
+        Returns:
+            str: 폴더 ID
+        """
+        with run_metrics.phase('get_or_create_folder'):
+            return self._get_or_create_folder(folder_name, parent_id)
+
+    def _get_or_create_folder(self, folder_name, parent_id):
+        """get_or_create_folder 본문 (캐시 확인 -> Drive 검색 -> 없으면 생성)"""
+        # 하위 폴더는 상위 폴더 ID까지 묶어서 캐시 (다른 폴더 안의 같은 이름과 구분)
+        cache_key = f"{parent_id}/{folder_name}" if parent_id else folder_name
+
+        # 캐시에 있으면 TTL 안에서는 바로 반환, 지나면 가볍게 검증
+        entry = self.folder_cache.get(cache_key)
+        if entry:
+            if time.time() - entry.get('validated_at', 0) < self.cache_ttl:
+                return entry['id']
+            if self._is_valid_folder(entry['id']):
+                self._remember(cache_key, entry['id'])
+                return entry['id']
+            logger.info(f"Cached folder '{folder_name}' is gone or trashed. Evicting")
+            self.invalidate(cache_key)
+
         # Drive에서 폴더 검색
-        response = self.drive_service.files().list(
-            q=f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder'",
+        query = f"name='{folder_name}' and mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
+        if parent_id:
+            query += f" and '{parent_id}' in parents"
+        response = self.execute(self.drive_service.files().list(
+            q=query,
             spaces='drive',
             fields='files(id, name)'
-        ).execute()
-        
+        ))
+
         # 폴더가 있으면 ID 반환
         if response.get('files'):
             folder_id = response['files'][0]['id']
-            self.folder_cache[folder_name] = folder_id
+            self._remember(cache_key, folder_id)
             return folder_id
-            
+
         # 없으면 새로 생성
         file_metadata = {
             'name': folder_name,
-            'mimeType': 'application/vnd.google-apps.folder'
+            'mimeType': FOLDER_MIME_TYPE
         }
-        
-        folder = self.drive_service.files().create(
+        if parent_id:
+            file_metadata['parents'] = [parent_id]
+
+        folder = self.execute(self.drive_service.files().create(
             body=file_metadata,
             fields='id'
-        ).execute()
-        
+        ))
+
         folder_id = folder.get('id')
-        self.folder_cache[folder_name] = folder_id
-        return folder_id
\ No newline at end of file
+        self._remember(cache_key, folder_id)
+        return folder_id
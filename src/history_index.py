@@ -0,0 +1,263 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+if __name__ != "__main__":
+    from src import memory_graph
+    from src.catalog import normalize_time
+else:
+    import memory_graph
+    from catalog import normalize_time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_path TEXT NOT NULL,
+    version_key TEXT NOT NULL,
+    name TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE (source_path, version_key)
+);
+CREATE TABLE IF NOT EXISTS events (
+    version_id INTEGER NOT NULL REFERENCES versions (id),
+    kind TEXT NOT NULL,
+    action TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    object TEXT,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_subject ON events (subject, version_id);
+CREATE INDEX IF NOT EXISTS idx_events_object ON events (object, version_id);
+CREATE TABLE IF NOT EXISTS current_records (
+    source_path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    record TEXT NOT NULL,
+    PRIMARY KEY (source_path, kind, key)
+);
+"""
+
+def _relation_key_text(relation):
+    return json.dumps(list(memory_graph.relation_key(relation)), ensure_ascii=False)
+
+def _observations(record):
+    return record.get('observations') or []
+
+def graph_events(old, new, patch=None):
+    """
+    두 그래프 사이의 변경을 인덱스 이벤트로 변환
+
+    엔티티 추가/변경/삭제, 관찰(observation) 추가/삭제, 관계 추가/삭제를
+    (kind, action, subject, object, detail) 튜플로 반환
+
+    Args:
+        patch (dict): 이미 계산한 memory_graph.diff_graphs(old, new) 결과 (None이면 새로 계산)
+    """
+    if patch is None:
+        patch = memory_graph.diff_graphs(old, new)
+    events = []
+
+    for record in patch['entities']['added']:
+        events.append(('entity', 'added', record['name'], None, record.get('entityType')))
+        events.extend(('observation', 'added', record['name'], None, text) for text in _observations(record))
+    for record in patch['entities']['changed']:
+        previous = old['entities'][record['name']]
+        events.append(('entity', 'changed', record['name'], None, record.get('entityType')))
+        old_texts, new_texts = set(_observations(previous)), set(_observations(record))
+        events.extend(('observation', 'added', record['name'], None, text)
+                      for text in _observations(record) if text not in old_texts)
+        events.extend(('observation', 'removed', record['name'], None, text)
+                      for text in _observations(previous) if text not in new_texts)
+    for name in patch['entities']['removed']:
+        previous = old['entities'][name]
+        events.append(('entity', 'removed', name, None, previous.get('entityType')))
+        events.extend(('observation', 'removed', name, None, text) for text in _observations(previous))
+
+    for action in ('added', 'removed'):
+        events.extend(
+            ('relation', action, record.get('from'), record.get('to'), record.get('relationType'))
+            for record in patch['relations'][action]
+        )
+    return events
+
+class HistoryIndex:
+    """백업 버전마다 엔티티/관계/관찰의 추가·변경·삭제를 기록하는 SQLite 인덱스"""
+
+    def __init__(self, db_path):
+        """
+        HistoryIndex 초기화
+
+        Args:
+            db_path (str): SQLite 파일 경로
+        """
+        self.db_path = str(db_path)
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        """호출마다 새 연결 (작업자 스레드에서도 안전하게 쓰기 위함)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return closing(conn)
+
+    def _current_graph(self, conn, source_path):
+        """마지막으로 인덱싱한 버전의 그래프 (다운로드 없이 비교하기 위해 저장해 둔 것)"""
+        graph = {'entities': {}, 'relations': {}}
+        rows = conn.execute(
+            "SELECT kind, record FROM current_records WHERE source_path = ?", (source_path,))
+        for row in rows:
+            record = json.loads(row['record'])
+            if row['kind'] == 'entity':
+                graph['entities'][record['name']] = record
+            else:
+                graph['relations'][memory_graph.relation_key(record)] = record
+        return graph
+
+    def index_version(self, source_path, graph, version_key, name=None, created_at=None):
+        """
+        새 백업 버전을 인덱스에 추가 (직전 버전과의 차이만 기록)
+
+        Args:
+            source_path (str): 원본 memory 파일 경로 (버전 이력을 구분하는 기준)
+            graph (dict): 이번 버전의 그래프 (memory_graph.parse_graph 결과)
+            version_key (str): 버전 식별자 (드라이브 파일 ID 또는 파일 ID:리비전 ID)
+            name (str): 드라이브 파일 이름
+            created_at (str | datetime): 백업 시각
+
+        Returns:
+            int: 기록한 이벤트 수 (이미 인덱싱된 버전이면 0)
+        """
+        source_path = os.path.abspath(source_path)
+
+        with self.lock, self._connect() as conn:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO versions (source_path, version_key, name, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (source_path, version_key, name, normalize_time(created_at))
+                )
+                if not cursor.rowcount:
+                    return 0
+                version_id = cursor.lastrowid
+
+                old = self._current_graph(conn, source_path)
+                patch = memory_graph.diff_graphs(old, graph)
+                events = graph_events(old, graph, patch)
+                conn.executemany(
+                    "INSERT INTO events (version_id, kind, action, subject, object, detail) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(version_id,) + event for event in events]
+                )
+
+                self._apply_to_current(conn, source_path, patch)
+        return len(events)
+
+    @staticmethod
+    def _apply_to_current(conn, source_path, patch):
+        """다음 버전과 비교할 수 있게 현재 상태에 바뀐 레코드만 반영 (그래프 전체를 다시 쓰지 않음)"""
+        conn.executemany(
+            "DELETE FROM current_records WHERE source_path = ? AND kind = ? AND key = ?",
+            [(source_path, 'entity', name) for name in patch['entities']['removed']] +
+            [(source_path, 'relation', _relation_key_text(record)) for record in patch['relations']['removed']]
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO current_records (source_path, kind, key, record) VALUES (?, ?, ?, ?)",
+            [(source_path, 'entity', record['name'], json.dumps(record, ensure_ascii=False))
+             for record in patch['entities']['added'] + patch['entities']['changed']] +
+            [(source_path, 'relation', _relation_key_text(record), json.dumps(record, ensure_ascii=False))
+             for record in patch['relations']['added']]
+        )
+
+    def rename(self, version_key, name):
+        """드라이브 파일 이름 변경 반영 (rotate 모드의 memory.json -> memory_<ts>.json)"""
+        with self.lock, self._connect() as conn:
+            with conn:
+                conn.execute("UPDATE versions SET name = ? WHERE version_key = ?", (name, version_key))
+
+    def clear(self, source_path=None):
+        """인덱스 비우기 (source_path를 주면 해당 원본만)"""
+        with self.lock, self._connect() as conn:
+            with conn:
+                if source_path is None:
+                    conn.executescript("DELETE FROM events; DELETE FROM versions; DELETE FROM current_records;")
+                    return
+                source_path = os.path.abspath(source_path)
+                conn.execute(
+                    "DELETE FROM events WHERE version_id IN (SELECT id FROM versions WHERE source_path = ?)",
+                    (source_path,))
+                conn.execute("DELETE FROM versions WHERE source_path = ?", (source_path,))
+                conn.execute("DELETE FROM current_records WHERE source_path = ?", (source_path,))
+
+    def entity_history(self, name, source_path=None):
+        """
+        엔티티 하나의 변경 이력 (오래된 것부터)
+
+        엔티티 자체의 추가/변경/삭제, 관찰 추가/삭제, 이 엔티티가 양끝에 있는 관계 추가/삭제를 포함
+
+        Returns:
+            list: kind, action, subject, object, detail과 버전 정보(version_key, name, created_at)를 담은 dict 목록
+        """
+        sql = (
+            "SELECT e.kind, e.action, e.subject, e.object, e.detail, "
+            "v.id AS version_id, v.version_key, v.name, v.created_at, v.source_path "
+            "FROM events e JOIN versions v ON v.id = e.version_id "
+            "WHERE (e.subject = ? OR e.object = ?)"
+        )
+        params = [name, name]
+        if source_path:
+            sql += " AND v.source_path = ?"
+            params.append(os.path.abspath(source_path))
+        sql += " ORDER BY v.id, e.rowid"
+
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def versions_with_observation(self, text, source_path=None):
+        """
+        관찰 내용에 text가 들어간 버전 목록
+
+        관찰이 추가된 버전부터 삭제되기 직전 버전까지를 구간으로 묶어서 반환
+
+        Returns:
+            list: entity, observation, 구간 안의 버전 목록(versions)을 담은 dict 목록
+        """
+        sql = (
+            "SELECT e.action, e.subject, e.detail, v.id AS version_id, v.source_path "
+            "FROM events e JOIN versions v ON v.id = e.version_id "
+            "WHERE e.kind = 'observation' AND instr(e.detail, ?) > 0"
+        )
+        params = [text]
+        if source_path:
+            sql += " AND v.source_path = ?"
+            params.append(os.path.abspath(source_path))
+        sql += " ORDER BY v.id"
+
+        with self._connect() as conn:
+            spans = []
+            open_spans = {}
+            for row in conn.execute(sql, params):
+                key = (row['source_path'], row['subject'], row['detail'])
+                if row['action'] == 'added':
+                    open_spans.setdefault(key, row['version_id'])
+                elif key in open_spans:
+                    spans.append(key + (open_spans.pop(key), row['version_id']))
+            spans.extend(key + (start, None) for key, start in open_spans.items())
+
+            results = []
+            for source, entity, observation, start, end in sorted(spans, key=lambda s: s[3]):
+                versions = conn.execute(
+                    "SELECT id, version_key, name, created_at FROM versions "
+                    "WHERE source_path = ? AND id >= ? AND (? IS NULL OR id < ?) ORDER BY id",
+                    (source, start, end, end)
+                ).fetchall()
+                results.append({
+                    'source_path': source,
+                    'entity': entity,
+                    'observation': observation,
+                    'versions': [dict(version) for version in versions]
+                })
+            return results
@@ -0,0 +1,92 @@
+import json
+
+# MCP memory 서버가 쓰는 것과 같은 직렬화 (JSON.stringify 기본값과 동일)
+_JSON_SEPARATORS = (',', ':')
+
+def relation_key(relation):
+    """관계를 식별하는 키 (from, relationType, to)"""
+    return (relation.get('from'), relation.get('relationType'), relation.get('to'))
+
+def iter_records(lines):
+    """JSON-lines 입력에서 빈 줄을 건너뛰고 레코드를 하나씩 반환"""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+def parse_graph(lines):
+    """
+    JSON-lines 레코드를 엔티티/관계 그래프로 변환
+
+    Returns:
+        dict: {'entities': {name: record}, 'relations': {key: record}}
+    """
+    graph = {'entities': {}, 'relations': {}}
+    for record in iter_records(lines):
+        if record.get('type') == 'entity':
+            graph['entities'][record['name']] = record
+        elif record.get('type') == 'relation':
+            graph['relations'][relation_key(record)] = record
+    return graph
+
+def load_graph(path):
+    """memory.json 파일을 읽어서 그래프로 변환"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_graph(f)
+
+def dump_graph(graph, path):
+    """그래프를 MCP memory 서버 형식(엔티티 다음 관계, 줄 단위 JSON)으로 저장"""
+    records = list(graph['entities'].values()) + list(graph['relations'].values())
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(
+            json.dumps(record, ensure_ascii=False, separators=_JSON_SEPARATORS)
+            for record in records
+        ))
+
+def diff_graphs(old, new):
+    """
+    두 그래프의 차이를 패치로 계산
+
+    Returns:
+        dict: 추가/변경/삭제된 엔티티와 추가/삭제된 관계
+    """
+    old_entities, new_entities = old['entities'], new['entities']
+    old_relations, new_relations = old['relations'], new['relations']
+
+    return {
+        'entities': {
+            'added': [record for name, record in new_entities.items() if name not in old_entities],
+            'changed': [
+                record for name, record in new_entities.items()
+                if name in old_entities and old_entities[name] != record
+            ],
+            'removed': [name for name in old_entities if name not in new_entities]
+        },
+        'relations': {
+            'added': [record for key, record in new_relations.items() if key not in old_relations],
+            'removed': [record for key, record in old_relations.items() if key not in new_relations]
+        }
+    }
+
+def is_empty_patch(patch):
+    """변경 사항이 하나도 없는 패치인지 확인"""
+    return not any(
+        changes for section in ('entities', 'relations')
+        for changes in patch[section].values()
+    )
+
+def apply_patch(graph, patch):
+    """그래프에 패치를 적용 (graph를 직접 수정하고 반환)"""
+    entities, relations = graph['entities'], graph['relations']
+
+    for name in patch['entities']['removed']:
+        entities.pop(name, None)
+    for record in patch['entities']['changed'] + patch['entities']['added']:
+        entities[record['name']] = record
+
+    for record in patch['relations']['removed']:
+        relations.pop(relation_key(record), None)
+    for record in patch['relations']['added']:
+        relations[relation_key(record)] = record
+
+    return graph
@@ -0,0 +1,81 @@
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+
+if __name__ != "__main__":
+    from src.config import config
+else:
+    from config import config
+
+@dataclass
+class RetentionPolicy:
+    """
+    타임스탬프 백업 보관 정책 (grandfather-father-son)
+
+    최신 keep_last개와, 최근 keep_daily일/keep_weekly주/keep_monthly개월 각각에서
+    가장 최신 백업 하나씩을 남기고 나머지는 삭제 대상으로 분류
+    """
+    keep_last: int = 10
+    keep_daily: int = 7
+    keep_weekly: int = 4
+    keep_monthly: int = 12
+
+    @classmethod
+    def from_config(cls) -> 'RetentionPolicy':
+        """config 값으로 정책 생성"""
+        return cls(
+            keep_last=config.RETENTION_KEEP_LAST,
+            keep_daily=config.RETENTION_KEEP_DAILY,
+            keep_weekly=config.RETENTION_KEEP_WEEKLY,
+            keep_monthly=config.RETENTION_KEEP_MONTHLY
+        )
+
+def backup_name_pattern(file_name='memory.json'):
+    """이름 변경으로 생긴 백업 파일 이름 패턴 (예: memory_20241209134259.json)"""
+    stem, ext = os.path.splitext(file_name)
+    return re.compile(rf"^{re.escape(stem)}_(\d{{14}}){re.escape(ext)}$")
+
+def parse_backup_time(name, pattern):
+    """백업 파일 이름에서 생성 시각 추출 (패턴이 맞지 않으면 None)"""
+    match = pattern.match(name)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), '%Y%m%d%H%M%S')
+    except ValueError:
+        return None
+
+def select_backups_to_delete(backups, policy):
+    """
+    보관 정책에 따라 삭제할 백업 선택
+
+    Args:
+        backups (list): 'time'(datetime) 키를 가진 백업 정보 목록
+        policy (RetentionPolicy): 보관 정책
+
+    Returns:
+        tuple: (남길 백업 목록, 삭제할 백업 목록) - 둘 다 최신순
+    """
+    ordered = sorted(backups, key=lambda b: b['time'], reverse=True)
+    keep_ids = {id(b) for b in ordered[:policy.keep_last]}
+
+    buckets = [
+        (policy.keep_daily, lambda t: t.date()),
+        (policy.keep_weekly, lambda t: t.isocalendar()[:2]),
+        (policy.keep_monthly, lambda t: (t.year, t.month))
+    ]
+    for limit, bucket_of in buckets:
+        seen = set()
+        for backup in ordered:
+            if len(seen) >= limit:
+                break
+            bucket = bucket_of(backup['time'])
+            if bucket not in seen:
+                # 각 기간에서 가장 최신 백업 하나만 남김
+                seen.add(bucket)
+                keep_ids.add(id(backup))
+
+    keep = [b for b in ordered if id(b) in keep_ids]
+    delete = [b for b in ordered if id(b) not in keep_ids]
+    return keep, delete
@@ -0,0 +1,249 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from googleapiclient.errors import HttpError
+
+if __name__ != "__main__":
+    from src.transport import backoff_delay, retry_after_seconds
+    from src.utils.run_metrics import run_metrics
+else:
+    from transport import backoff_delay, retry_after_seconds
+    from utils.run_metrics import run_metrics
+
+logger = logging.getLogger(__name__)
+
+# 403 응답 중에서 잠시 후 다시 보내면 되는 사유 (나머지 403은 권한 문제라 재시도해도 같음)
+RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded'})
+
+def error_reasons(error):
+    """HttpError 본문의 error.errors[].reason 목록 (본문이 JSON이 아니면 빈 목록)"""
+    try:
+        content = error.content.decode('utf-8') if isinstance(error.content, bytes) else error.content
+        data = json.loads(content)
+    except (AttributeError, TypeError, ValueError):
+        return []
+    errors = (data.get('error') or {}).get('errors') if isinstance(data, dict) else None
+    return [item.get('reason') for item in errors or [] if isinstance(item, dict)]
+
+def is_rate_limited(error):
+    """429 또는 속도 제한 사유가 붙은 403인지"""
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    return error.resp.status == 403 and bool(RATE_LIMIT_REASONS.intersection(error_reasons(error)))
+
+class RequestCancelled(BaseException):
+    """
+    cancellable() 블록이 취소되어 다음 Drive API 호출을 보내지 않고 멈춤
+
+    asyncio.CancelledError처럼 BaseException이라 실패를 결과로 바꾸는 except Exception에 걸리지 않음
+    """
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지고 burst개까지 쌓이는 토큰 버킷 (잠금은 RequestScheduler가 담당)
+    """
+
+    def __init__(self, rate, burst):
+        """
+        TokenBucket 초기화
+
+        Args:
+            rate (float): 초당 채워지는 토큰 수
+            burst (int): 최대로 쌓이는 토큰 수
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost, now):
+        """
+        cost개를 꺼내려면 기다려야 하는 시간 (초, 바로 꺼낼 수 있으면 0)
+
+        배치 요청처럼 burst보다 큰 cost는 burst만큼 쌓이면 꺼내고 모자란 만큼 빚으로 남김
+        (다음 호출이 그만큼 더 기다림)
+        """
+        self._refill(now)
+        needed = min(cost, self.burst)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def take(self, cost):
+        self.tokens -= cost
+
+class RequestScheduler:
+    """
+    Drive API 호출 속도 조절과 우선순위 처리
+
+    - 모든 호출은 토큰 버킷에서 토큰을 받은 뒤에 실행 (초당 호출 수 상한)
+    - 429나 403 rateLimitExceeded/userRateLimitExceeded를 받으면 속도를 절반으로 줄이고
+      모든 호출을 jitter 백오프만큼 멈췄다가 같은 요청을 다시 보냄 (성공할 때마다 조금씩 원래 속도로 회복)
+    - background() 안의 호출(보관 정책 삭제, 카탈로그 재구성 등)은 foreground() 작업(백업)이 진행 중이거나
+      토큰을 기다리는 일반 호출이 있으면 양보
+    - cancellable(event) 안의 호출은 event가 set되면 토큰을 기다리다가도 RequestCancelled로 멈춤
+      (업로드/다운로드는 청크마다 호출하므로 청크 경계에서 멈춤)
+    """
+
+    def __init__(self, rate=8, burst=10, min_rate=0.5, max_retries=8, backoff_base=1, backoff_max=64):
+        """
+        RequestScheduler 초기화
+
+        Args:
+            rate (float): 초당 최대 호출 수
+            burst (int): 쉬고 있다가 한 번에 보낼 수 있는 호출 수
+            min_rate (float): 속도 제한 응답으로 늦출 때의 하한
+            max_retries (int): 속도 제한 응답 재시도 횟수
+            backoff_base (float): 재시도 대기 시간 기준 (초)
+            backoff_max (float): 재시도 대기 시간 상한 (초)
+        """
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.bucket = TokenBucket(rate, burst)
+        self.paused_until = 0.0
+        self.throttled = 0
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._foreground = 0
+        self._local = threading.local()
+
+    @property
+    def rate(self):
+        """지금 적용 중인 초당 호출 수"""
+        return self.bucket.rate
+
+    @contextmanager
+    def foreground(self):
+        """이 블록이 끝날 때까지 background 호출을 미룸 (백업처럼 먼저 끝나야 하는 작업)"""
+        with self._cond:
+            self._foreground += 1
+        self._local.foreground = getattr(self._local, 'foreground', 0) + 1
+        try:
+            yield
+        finally:
+            self._local.foreground -= 1
+            with self._cond:
+                self._foreground -= 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def background(self):
+        """이 스레드에서 이 블록 안의 호출을 낮은 우선순위로 실행"""
+        self._local.background = getattr(self._local, 'background', 0) + 1
+        try:
+            yield
+        finally:
+            self._local.background -= 1
+
+    @contextmanager
+    def cancellable(self, event):
+        """이 스레드에서 이 블록 안의 호출을 event(threading.Event)로 취소할 수 있게 함 (cancel(event)로 취소)"""
+        previous = getattr(self._local, 'cancel_event', None)
+        self._local.cancel_event = event
+        try:
+            yield
+        finally:
+            self._local.cancel_event = previous
+
+    def cancel(self, event):
+        """event를 set하고 토큰을 기다리는 호출을 깨움 (이미 보낸 요청은 끝까지 기다림)"""
+        event.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _is_background(self):
+        # 같은 스레드의 foreground 작업 안에서 부른 거면 자기 자신을 기다리게 되므로 일반 호출로 취급
+        return getattr(self._local, 'background', 0) > 0 and getattr(self._local, 'foreground', 0) == 0
+
+    def acquire(self, cost=1):
+        """토큰 cost개를 받을 때까지 대기 (background 호출은 일반 호출이 없을 때까지 추가로 대기)"""
+        background = self._is_background()
+        cancel_event = getattr(self._local, 'cancel_event', None)
+        with self._cond:
+            if not background:
+                self._waiting += 1
+            try:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise RequestCancelled("Drive request cancelled")
+                    if background and (self._waiting or self._foreground):
+                        self._cond.wait()
+                        continue
+                    now = time.monotonic()
+                    delay = max(self.paused_until - now, self.bucket.wait_time(cost, now))
+                    if delay <= 0:
+                        self.bucket.take(cost)
+                        return
+                    self._cond.wait(delay)
+            finally:
+                if not background:
+                    self._waiting -= 1
+                    self._cond.notify_all()
+
+    def throttle(self, attempt, retry_after=None, reason='rate limit'):
+        """
+        속도 제한 응답을 받았을 때 속도를 절반으로 줄이고 모든 호출을 잠시 멈춤
+
+        Args:
+            attempt (int): 같은 요청의 재시도 순번 (대기 시간이 두 배씩 늘어남)
+            retry_after (float): 서버가 알려준 Retry-After (초)
+            reason (str): 로그에 남길 사유
+        """
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+        run_metrics.count_retry()
+        with self._cond:
+            self.throttled += 1
+            self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+            self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            rate = self.bucket.rate
+        logger.warning(f"Drive {reason}. Slowing to {rate:.2f} req/s and retrying in {delay:.1f}s "
+                       f"({attempt + 1}/{self.max_retries})")
+
+    def _recover(self):
+        # 성공할 때마다 원래 속도의 1/20씩 회복
+        with self._cond:
+            if self.bucket.rate < self.max_rate:
+                self.bucket.rate = min(self.max_rate, self.bucket.rate + self.max_rate / 20)
+
+    def call(self, fn, *args, cost=1, **kwargs):
+        """
+        토큰을 받아서 fn 실행, 속도 제한 응답이면 백오프 후 다시 실행
+
+        Args:
+            fn: Drive API를 호출하는 함수 (request.execute, request.next_chunk 등)
+            cost (int): 이 호출이 쓰는 할당량 (배치 요청은 안에 든 요청 수)
+
+        Returns:
+            fn의 반환값
+        """
+        attempt = 0
+        while True:
+            self.acquire(cost)
+            run_metrics.count_call(cost)
+            try:
+                result = fn(*args, **kwargs)
+            except HttpError as e:
+                if attempt >= self.max_retries or not is_rate_limited(e):
+                    raise
+                reasons = ', '.join(error_reasons(e)) or str(e.resp.status)
+                self.throttle(attempt, retry_after_seconds(e.resp), f"rate limit ({reasons})")
+                attempt += 1
+                continue
+            self._recover()
+            return result
+
+    def execute(self, request):
+        """HttpRequest 실행 (request.execute()를 대신함)"""
+        return self.call(request.execute)
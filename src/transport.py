@@ -0,0 +1,161 @@
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+if __name__ != "__main__":
+    from src.utils.run_metrics import run_metrics
+else:
+    from utils.run_metrics import run_metrics
+
+# 잠시 후 다시 보내면 성공할 수 있는 응답
+# (429는 모든 호출의 속도를 같이 늦춰야 하므로 여기서 재시도하지 않고 RequestScheduler가 처리)
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# 같은 요청을 다시 보내도 결과가 같은 메서드 (응답을 못 받았을 때도 재시도 가능)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'PATCH'})
+
+def backoff_delay(attempt, base, maximum, retry_after=None):
+    """
+    재시도 전 대기 시간 (full jitter: 0 ~ base * 2^attempt 사이 무작위, maximum 이하)
+
+    여러 작업자가 동시에 실패해도 같은 순간에 다시 몰리지 않도록 무작위로 흩어지게 함
+    서버가 Retry-After를 주면 그보다 짧게 기다리지 않음
+    """
+    delay = random.uniform(0, min(maximum, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, maximum))
+    return delay
+
+def retry_after_seconds(headers):
+    """Retry-After 헤더 값 (초, 없거나 날짜 형식이면 None)"""
+    value = headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        # HTTP 날짜 형식은 무시하고 기본 백오프 사용
+        return None
+
+class SessionHttp:
+    """
+    requests AuthorizedSession을 httplib2.Http처럼 쓸 수 있게 감싼 전송 객체
+
+    googleapiclient는 http.request(uri, method, body, headers, ...)만 호출하고
+    (httplib2.Response, content)를 기대하므로 그 모양으로 돌려줌
+    - 한 urllib3 연결 풀을 모든 스레드/서비스가 공유 (keep-alive 연결 재사용)
+    - 요청마다 연결/읽기 타임아웃
+    - 5xx와 연결 끊김은 jitter를 넣은 지수 백오프로 재시도
+    """
+
+    def __init__(self, credentials, pool_size=10, connect_timeout=10, read_timeout=120,
+                 max_retries=5, retry_base=0.5, retry_max=30):
+        """
+        SessionHttp 초기화
+
+        Args:
+            credentials: google.auth 인증 정보 (토큰 갱신은 AuthorizedSession이 처리)
+            pool_size (int): 최대 동시 연결 수
+            connect_timeout (float): 연결 타임아웃 (초)
+            read_timeout (float): 응답을 기다리는 타임아웃 (초)
+            max_retries (int): 재시도 횟수
+            retry_base (float): 재시도 대기 시간 기준 (초)
+            retry_max (float): 재시도 대기 시간 상한 (초)
+        """
+        from google.auth.transport.requests import AuthorizedSession
+        from requests.adapters import HTTPAdapter
+
+        self.credentials = credentials
+        self.session = AuthorizedSession(credentials)
+        # 재시도는 본문을 다시 보낼 수 있는 여기서 직접 처리 (urllib3 자체 재시도는 끔)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def _should_retry_error(self, error, method):
+        import requests
+
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            # 연결 자체가 안 됐으면 요청이 서버에 가지 않았음
+            return True
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            # 보낸 뒤에 끊겼으면 서버가 처리했을 수 있으니 같은 결과가 보장되는 메서드만
+            return method in IDEMPOTENT_METHODS
+        return False
+
+    def _sleep_before_retry(self, attempt, reason, retry_after=None):
+        delay = backoff_delay(attempt, self.retry_base, self.retry_max, retry_after)
+        with self._lock:
+            self.retries += 1
+        run_metrics.count_retry()
+        logger.warning(f"{reason}. Retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+        time.sleep(delay)
+
+    def request(self, uri, method='GET', body=None, headers=None, redirections=5, connection_type=None):
+        """httplib2.Http.request와 같은 인터페이스 (redirections, connection_type은 무시)"""
+        import httplib2
+        import requests
+
+        method = method.upper()
+        # 재개 가능한 업로드는 파일 조각을 스트림으로 넘기므로 재시도할 수 있게 미리 읽어둠 (청크 크기만큼)
+        if hasattr(body, 'read'):
+            body = body.read()
+        elif isinstance(body, str):
+            body = body.encode('utf-8')
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(
+                    method, uri, data=body, headers=headers, timeout=self.timeout
+                )
+            except requests.exceptions.RequestException as e:
+                if attempt >= self.max_retries or not self._should_retry_error(e, method):
+                    raise
+                self._sleep_before_retry(attempt, f"{method} {uri.split('?')[0]} failed: {e}")
+                attempt += 1
+                continue
+
+            info = {key.lower(): value for key, value in response.headers.items()}
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self._sleep_before_retry(
+                    attempt,
+                    f"{method} {uri.split('?')[0]} returned {response.status_code}",
+                    retry_after_seconds(info)
+                )
+                attempt += 1
+                continue
+
+            info['status'] = str(response.status_code)
+            resp = httplib2.Response(info)
+            resp.reason = response.reason
+            return resp, response.content
+
+    def close(self):
+        """풀의 연결 닫기"""
+        self.session.close()
+
+def build_http(credentials, kind, **options):
+    """
+    DriveBackupManager가 쓸 전송 객체 만들기
+
+    Args:
+        credentials: google.auth 인증 정보
+        kind (str): 'session' 또는 'httplib2'
+        **options: SessionHttp 설정
+
+    Returns:
+        SessionHttp (httplib2면 None - 서비스마다 googleapiclient 기본 전송을 만듦)
+    """
+    if kind == 'httplib2':
+        return None
+    if kind == 'session':
+        return SessionHttp(credentials, **options)
+    raise ValueError(f"Unknown HTTP transport: {kind}")
@@ -1,50 +1,431 @@
+import hashlib
+import json
 import os
-import shutil
+import time
 import zipfile
+from collections import defaultdict
 from datetime import datetime
 from dotenv import load_dotenv
 
+if __name__ != "__main__":
+    from src.utils.ignore_rules import IgnoreMatcher, iter_project_files
+    from src.utils.parallel_zip import RawZipWriter, read_member_at, write_members
+else:
+    from ignore_rules import IgnoreMatcher, iter_project_files
+    from parallel_zip import RawZipWriter, read_member_at, write_members
+
 # Load environment variables
 load_dotenv()
 
-def backup_project():
-    """프로젝트 전체를 versions 폴더에 압축 백업"""
+# 스냅샷마다 압축 파일 안에 같이 넣는 매니페스트 (경로, 크기, 수정 시각, 해시, 내용이 들어있는 압축 파일)
+MANIFEST_NAME = '__snapshot_manifest__.json'
+MANIFEST_FORMAT = 1
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# compact 후 모든 스냅샷의 고유한 파일 내용을 SHA-256 이름으로 한 번씩만 담는 팩 (versions 폴더 안)
+PACK_NAME = 'pack.zip'
+# 팩으로 옮긴 스냅샷의 매니페스트(backup_*.json)를 두는 폴더 (versions 폴더 안)
+PACKED_DIR_NAME = 'packed'
+
+# 기본 제외 목록과 .gitignore 외에 추가로 제외할 패턴 (쉼표 구분, gitignore 문법)
+BACKUP_EXCLUDES = [pattern.strip() for pattern in os.getenv('BACKUP_EXCLUDES', '').split(',') if pattern.strip()]
+# 이보다 큰 파일은 스냅샷에서 제외 (MB, 0이면 제한 없음)
+BACKUP_MAX_FILE_MB = float(os.getenv('BACKUP_MAX_FILE_MB', '100'))
+
+def _file_sha256(path):
+    """파일을 청크 단위로 읽으면서 SHA-256 계산"""
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+def read_manifest(archive_path):
+    """
+    스냅샷의 매니페스트 읽기
+
+    Args:
+        archive_path (str): backup_*.zip 또는 팩으로 옮긴 스냅샷의 packed/backup_*.json
+
+    Returns:
+        dict: 매니페스트 (매니페스트가 없는 예전 백업이면 None)
+    """
+    if archive_path.endswith('.json'):
+        with open(archive_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with zipfile.ZipFile(archive_path) as zipf:
+        if MANIFEST_NAME not in zipf.namelist():
+            return None
+        return json.loads(zipf.read(MANIFEST_NAME))
+
+def list_snapshots(versions_dir):
+    """
+    스냅샷 목록 (오래된 순)
+
+    Returns:
+        list: (스냅샷 이름, 경로) - 압축 파일(backup_*.zip)과 팩으로 옮긴 스냅샷(packed/backup_*.json) 모두 포함
+    """
+    snapshots = {}
+    packed_dir = os.path.join(versions_dir, PACKED_DIR_NAME)
+    for directory, extension in ((packed_dir, '.json'), (versions_dir, '.zip')):
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            if name.startswith('backup_') and name.endswith(extension):
+                # compact --keep으로 둘 다 있으면 압축 파일 쪽을 사용
+                snapshots[name[:-len(extension)]] = os.path.join(directory, name)
+    return sorted(snapshots.items())
+
+def find_latest_snapshot(versions_dir):
+    """매니페스트가 있는 가장 최근 스냅샷 경로 (없으면 None)"""
+    for _, path in reversed(list_snapshots(versions_dir)):
+        try:
+            if read_manifest(path) is not None:
+                return path
+        except (OSError, zipfile.BadZipFile, ValueError):
+            continue
+    return None
+
+def _versions_dir_of(snapshot_path):
+    """스냅샷 경로에서 versions 폴더 경로 구하기"""
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    if snapshot_path.endswith('.json') and os.path.basename(directory) == PACKED_DIR_NAME:
+        return os.path.dirname(directory)
+    return directory
+
+def backup_project(incremental=False, workers=None, excludes=None, max_file_size=None):
+    """
+    프로젝트 전체를 versions 폴더에 압축 백업
+
+    압축은 여러 프로세스에서 병렬로 하고, 이미 압축된 형식(.zip, .exe, .ico 등)은 그대로 저장
+
+    Args:
+        incremental (bool): True면 직전 스냅샷과 비교해서 바뀐 파일만 압축
+                            (나머지는 매니페스트로 이전 압축 파일을 가리킴)
+        workers (int): 압축 작업자 프로세스 수 (None이면 CPU 수, 1이면 병렬 처리 안 함)
+        excludes (list): 기본 제외 목록과 .gitignore 외에 추가로 제외할 패턴 (None이면 BACKUP_EXCLUDES)
+        max_file_size (int): 이보다 큰 파일은 제외 (바이트, None이면 BACKUP_MAX_FILE_MB)
+
+    Returns:
+        tuple: (성공 여부, 백업 파일 경로 또는 에러 메시지)
+    """
+    backup_path = None
     try:
         project_root = os.getenv('PROJECT_PATH')
         if not project_root:
             raise ValueError("PROJECT_PATH not found in .env file")
-        
+
         versions_dir = os.path.join(project_root, 'versions')
         os.makedirs(versions_dir, exist_ok=True)
-        
+
+        base_path = find_latest_snapshot(versions_dir) if incremental else None
+        base_files = read_manifest(base_path)['files'] if base_path else {}
+
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_filename = f'backup_{timestamp}.zip'
         backup_path = os.path.join(versions_dir, backup_filename)
-        
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(project_root):
-                if 'versions' in dirs:
-                    dirs.remove('versions')
-                if '__pycache__' in dirs:
-                    dirs.remove('__pycache__')
-                if '.git' in dirs:
-                    dirs.remove('.git')
-                if '.env' in dirs:
-                    dirs.remove('.env')
-                    
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, project_root)
-                    zipf.write(file_path, rel_path)
-        
+
+        matcher = IgnoreMatcher.for_project(project_root, BACKUP_EXCLUDES if excludes is None else excludes)
+        if max_file_size is None and BACKUP_MAX_FILE_MB > 0:
+            max_file_size = int(BACKUP_MAX_FILE_MB * 1024 * 1024)
+        oversized = []
+
+        manifest = {
+            'format': MANIFEST_FORMAT,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'base': os.path.basename(base_path) if base_path else None,
+            'files': {}
+        }
+        to_write = []
+        for file_path, rel_path, stat in iter_project_files(project_root, matcher, max_file_size, oversized):
+            entry = {'size': stat.st_size, 'mtime': stat.st_mtime}
+            manifest['files'][rel_path] = entry
+            previous = base_files.get(rel_path)
+
+            if previous and previous['size'] == stat.st_size:
+                # 크기와 수정 시각이 같으면 읽지 않고 이전 해시를 그대로 사용,
+                # 수정 시각만 바뀌었으면 해시로 실제 변경 여부 확인
+                if previous['mtime'] == stat.st_mtime:
+                    entry['sha256'] = previous['sha256']
+                else:
+                    entry['sha256'] = _file_sha256(file_path)
+                if entry['sha256'] == previous['sha256']:
+                    entry['archive'] = previous['archive']
+                    if 'offset' in previous:
+                        entry['offset'] = previous['offset']
+                    continue
+
+            to_write.append((file_path, rel_path))
+
+        # 크기 제한으로 빠진 파일은 복원 시 없다는 걸 알 수 있도록 매니페스트에 기록
+        manifest['oversized'] = dict(oversized)
+
+        with RawZipWriter(backup_path) as writer:
+            members = write_members(writer, to_write, workers=workers)
+            for (_, rel_path), sha256 in zip(to_write, members):
+                manifest['files'][rel_path].update(sha256=sha256, archive=backup_filename)
+
+            writer.add_bytes(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+
         return True, backup_path
-        
+
     except Exception as e:
+        # 매니페스트가 없는 반쯤 쓰인 압축 파일은 다음 증분의 기준이 되지 않도록 삭제
+        if backup_path and os.path.exists(backup_path):
+            os.remove(backup_path)
+        return False, str(e)
+
+def restore_project(snapshot_path, dest_dir):
+    """
+    스냅샷의 전체 파일 트리를 dest_dir에 복원
+
+    증분 스냅샷이면 매니페스트가 가리키는 이전 압축 파일들에서 바뀌지 않은 파일을 가져옴
+
+    Args:
+        snapshot_path (str): 복원할 backup_*.zip 경로
+        dest_dir (str): 복원할 디렉토리
+
+    Returns:
+        tuple: (성공 여부, 복원된 파일 수 또는 에러 메시지)
+    """
+    archives = {}
+    pack = None
+    try:
+        manifest = read_manifest(snapshot_path)
+        versions_dir = _versions_dir_of(snapshot_path)
+
+        if manifest is None:
+            # 매니페스트가 없는 예전 백업은 전체가 들어있음
+            with zipfile.ZipFile(snapshot_path) as zipf:
+                zipf.extractall(dest_dir)
+                return True, len(zipf.namelist())
+
+        def archive_path_for(archive_name, rel_path):
+            archive_path = os.path.join(versions_dir, archive_name)
+            if not os.path.exists(archive_path):
+                raise FileNotFoundError(f"기준 스냅샷 {archive_name}이 없어서 {rel_path}를 복원할 수 없어ㅠㅠ")
+            return archive_path
+
+        for rel_path, entry in manifest['files'].items():
+            archive_name = entry['archive']
+            chunks = None
+            if archive_name == PACK_NAME and 'offset' in entry:
+                # 팩의 중앙 디렉토리를 읽지 않고 기록된 위치에서 바로 읽음 (팩이 커져도 이 스냅샷만큼만 읽음)
+                if pack is None:
+                    pack = open(archive_path_for(PACK_NAME, rel_path), 'rb')
+                chunks = read_member_at(pack, entry['offset'], entry['sha256'])
+
+            if chunks is None:
+                if archive_name not in archives:
+                    archives[archive_name] = zipfile.ZipFile(archive_path_for(archive_name, rel_path))
+                # 팩 안의 파일은 경로가 아니라 내용 해시로 저장되어 있음
+                member = entry['sha256'] if archive_name == PACK_NAME else rel_path
+                chunks = _iter_zip_member(archives[archive_name], member)
+
+            target = os.path.join(dest_dir, *rel_path.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            sha256 = hashlib.sha256()
+            with open(target, 'wb') as dst:
+                for chunk in chunks:
+                    sha256.update(chunk)
+                    dst.write(chunk)
+            if sha256.hexdigest() != entry['sha256']:
+                raise ValueError(f"{rel_path}의 해시가 매니페스트와 달라ㅠㅠ")
+            os.utime(target, (entry['mtime'], entry['mtime']))
+
+        return True, len(manifest['files'])
+
+    except Exception as e:
+        return False, str(e)
+    finally:
+        for zipf in archives.values():
+            zipf.close()
+        if pack:
+            pack.close()
+
+def _iter_zip_member(zipf, member):
+    with zipf.open(member) as src:
+        yield from iter(lambda: src.read(HASH_CHUNK_SIZE), b'')
+
+def _legacy_manifest(zipf, snapshot_name, archive_name):
+    """매니페스트가 없는 예전 백업의 매니페스트를 내용을 읽어서 만들기"""
+    try:
+        created_at = datetime.strptime(snapshot_name, 'backup_%Y%m%d_%H%M%S').isoformat()
+    except ValueError:
+        created_at = None
+    manifest = {'format': MANIFEST_FORMAT, 'created_at': created_at, 'base': None, 'files': {}}
+    for info in zipf.infolist():
+        if info.is_dir():
+            continue
+        sha256 = hashlib.sha256()
+        with zipf.open(info) as src:
+            for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+        manifest['files'][info.filename] = {
+            'size': info.file_size,
+            'mtime': time.mktime(info.date_time + (0, 0, -1)),
+            'sha256': sha256.hexdigest(),
+            'archive': archive_name
+        }
+    return manifest
+
+def compact_versions(versions_dir, keep_archives=False):
+    """
+    versions 폴더의 backup_*.zip들을 내용 주소 기반 팩 하나와 스냅샷별 매니페스트로 합치기
+
+    같은 내용의 파일은 팩에 한 번만 들어가고, 이미 압축된 데이터를 그대로 복사하므로 다시 압축하지 않음
+    팩은 매번 새로 써서 교체하며, 어떤 스냅샷도 가리키지 않는 내용은 이때 빠짐
+
+    Args:
+        versions_dir (str): versions 폴더 경로
+        keep_archives (bool): True면 합친 뒤에도 원래 압축 파일을 지우지 않음
+
+    Returns:
+        tuple: (성공 여부, {'snapshots', 'added', 'blobs', 'before', 'after'} 또는 에러 메시지)
+    """
+    pack_path = os.path.join(versions_dir, PACK_NAME)
+    packed_dir = os.path.join(versions_dir, PACKED_DIR_NAME)
+    tmp_path = f"{pack_path}.tmp"
+    try:
+        archives = sorted(
+            name for name in os.listdir(versions_dir)
+            if name.startswith('backup_') and name.endswith('.zip')
+        )
+        before = sum(os.path.getsize(os.path.join(versions_dir, name)) for name in archives)
+        if os.path.exists(pack_path):
+            before += os.path.getsize(pack_path)
+
+        # 합칠 스냅샷들의 매니페스트 (예전 백업은 내용을 읽어서 만듦)
+        manifests = {}
+        for name in archives:
+            with zipfile.ZipFile(os.path.join(versions_dir, name)) as zipf:
+                snapshot_name = name[:-len('.zip')]
+                if MANIFEST_NAME in zipf.namelist():
+                    manifests[snapshot_name] = json.loads(zipf.read(MANIFEST_NAME))
+                else:
+                    manifests[snapshot_name] = _legacy_manifest(zipf, snapshot_name, name)
+
+        # 이미 팩으로 옮긴 스냅샷 (팩을 새로 쓰면 내용 위치가 바뀌므로 같이 다시 씀)
+        for snapshot_name, path in list_snapshots(versions_dir):
+            if path.endswith('.json'):
+                manifests[snapshot_name] = read_manifest(path)
+
+        # 팩에 들어가야 할 내용 = 모든 스냅샷이 가리키는 내용
+        referenced = set()
+
+        # 내용 해시별로 처음 나온 (압축 파일, 경로)에서 복사
+        sources = defaultdict(dict)
+        for snapshot_name, manifest in manifests.items():
+            for rel_path, entry in manifest['files'].items():
+                referenced.add(entry['sha256'])
+                if entry['archive'] == PACK_NAME:
+                    continue
+                if entry['archive'] not in archives:
+                    raise FileNotFoundError(f"{snapshot_name}의 기준 스냅샷 {entry['archive']}이 없어서 합칠 수 없어ㅠㅠ")
+                sources[entry['archive']].setdefault(entry['sha256'], rel_path)
+
+        packed, added = set(), 0
+        with RawZipWriter(tmp_path) as writer:
+            if os.path.exists(pack_path):
+                with open(pack_path, 'rb') as source, zipfile.ZipFile(source) as pack:
+                    for info in pack.infolist():
+                        if info.filename in referenced and info.filename not in packed:
+                            writer.copy_member(source, info, info.filename)
+                            packed.add(info.filename)
+
+            for archive_name, blobs in sources.items():
+                with open(os.path.join(versions_dir, archive_name), 'rb') as source, zipfile.ZipFile(source) as zipf:
+                    for sha256, rel_path in blobs.items():
+                        if sha256 not in packed:
+                            writer.copy_member(source, zipf.getinfo(rel_path), sha256)
+                            packed.add(sha256)
+                            added += 1
+
+        missing = referenced - packed
+        if missing:
+            raise ValueError(f"팩에 없는 내용이 {len(missing)}개 있어서 합칠 수 없어ㅠㅠ")
+        os.replace(tmp_path, pack_path)
+
+        # 팩이 준비된 뒤에 매니페스트를 쓰고, 다 쓴 다음에 원래 압축 파일 삭제
+        # (그 사이에 멈춰서 위치가 어긋나도 복원할 때 이름을 확인하고 중앙 디렉토리로 다시 찾음)
+        offsets = {zinfo.filename: offset for zinfo, *_, offset in writer.entries}
+        os.makedirs(packed_dir, exist_ok=True)
+        for snapshot_name, manifest in manifests.items():
+            for entry in manifest['files'].values():
+                entry['archive'] = PACK_NAME
+                entry['offset'] = offsets[entry['sha256']]
+            index_path = os.path.join(packed_dir, f"{snapshot_name}.json")
+            with open(f"{index_path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(f"{index_path}.tmp", index_path)
+
+        if not keep_archives:
+            for name in archives:
+                os.remove(os.path.join(versions_dir, name))
+
+        after = os.path.getsize(pack_path) + sum(
+            os.path.getsize(os.path.join(versions_dir, name)) for name in archives if keep_archives
+        )
+        return True, {
+            'snapshots': len(archives),
+            'added': added,
+            'blobs': len(packed),
+            'before': before,
+            'after': after
+        }
+
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
         return False, str(e)
 
 if __name__ == '__main__':
-    success, result = backup_project()
-    if success:
-        print(f"백업 완료: {result}")
+    import argparse
+    import multiprocessing
+
+    # PyInstaller로 묶은 실행 파일에서 압축 작업자 프로세스가 다시 main을 실행하지 않도록
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="프로젝트 로컬 백업")
+    parser.add_argument('--incremental', action='store_true', help="직전 스냅샷 이후 바뀐 파일만 압축")
+    parser.add_argument('--workers', type=int, help="압축 작업자 프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--exclude', action='append', help="추가로 제외할 gitignore 패턴 (여러 번 사용 가능)")
+    parser.add_argument('--max-file-mb', type=float, help="이보다 큰 파일은 제외 (MB)")
+    parser.add_argument('--restore', nargs=2, metavar=('SNAPSHOT', 'DEST'), help="스냅샷을 DEST에 복원")
+    parser.add_argument('--compact', action='store_true', help="versions의 압축 파일들을 중복 없는 팩 하나로 합치기")
+    parser.add_argument('--keep', action='store_true', help="--compact 후에도 원래 압축 파일 유지")
+    parser.add_argument('--list', action='store_true', help="스냅샷 목록 출력")
+    args = parser.parse_args()
+
+    if args.list or args.compact:
+        versions_dir = os.path.join(os.getenv('PROJECT_PATH') or '.', 'versions')
+
+    if args.list:
+        for name, path in list_snapshots(versions_dir):
+            print(f"{name}  {path}")
+    elif args.compact:
+        success, result = compact_versions(versions_dir, keep_archives=args.keep)
+        if success:
+            print(f"합치기 완료: 스냅샷 {result['snapshots']}개, 새 내용 {result['added']}개 "
+                  f"(팩 전체 {result['blobs']}개), {result['before'] / 1024 / 1024:.1f}MB -> {result['after'] / 1024 / 1024:.1f}MB")
+        else:
+            print(f"합치기 실패: {result}")
+    elif args.restore:
+        success, result = restore_project(*args.restore)
+        if success:
+            print(f"복원 완료: {result}개 파일")
+        else:
+            print(f"복원 실패: {result}")
     else:
-        print(f"백업 실패: {result}")
\ No newline at end of file
+        max_file_size = int(args.max_file_mb * 1024 * 1024) if args.max_file_mb else None
+        success, result = backup_project(
+            incremental=args.incremental,
+            workers=args.workers,
+            excludes=BACKUP_EXCLUDES + (args.exclude or []),
+            max_file_size=max_file_size
+        )
+        if success:
+            print(f"백업 완료: {result}")
+        else:
+            print(f"백업 실패: {result}")
@@ -45,6 +45,8 @@ def build_exe():
         "--add-data", f"{os.path.join(project_root, 'credentials')}/*;{project_name}/credentials",
         # Add hidden imports
         "--hidden-import", "google.auth.transport.requests",
+        # discovery 문서는 Drive v3만 포함 (hooks/hook-googleapiclient.model.py)
+        "--additional-hooks-dir", os.path.join(project_root, "hooks"),
         main_script
     ]
     
@@ -53,7 +55,7 @@ def build_exe():
         if os.path.exists(os.path.join(project_root, "ico", "icon.webp")):
             from . import icon_converter
             if icon_converter.convert_webp_to_ico():
-                command.insert(-2, f"--icon={icon_path}")
+                command.insert(-1, f"--icon={icon_path}")
             
         subprocess.run(command, check=True)
         print("빌드 완료")
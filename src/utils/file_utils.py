@@ -0,0 +1,78 @@
+import hashlib
+import os
+import tempfile
+import time
+
+# 해시 계산 시 한 번에 읽을 바이트 수 (파일 전체를 메모리에 올리지 않음)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 수정된 지 이 시간(초)이 안 된 파일은 stat을 믿지 않음 (mtime 해상도가 거친 파일 시스템에서
+# 같은 시각 안에 한 번 더 고쳐지면 크기/mtime이 그대로일 수 있음)
+STAT_RACY_SECONDS = 2
+
+def file_md5(path, chunk_size=HASH_CHUNK_SIZE):
+    """파일을 청크 단위로 스트리밍하면서 MD5 해시 계산"""
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+def stat_signature(path):
+    """
+    내용이 바뀌었는지 읽지 않고 비교하기 위한 [크기, mtime_ns]
+    
+    Returns:
+        list: [st_size, st_mtime_ns] (방금 수정된 파일이면 None - 읽어서 비교해야 함)
+    """
+    st = os.stat(path)
+    if time.time_ns() - st.st_mtime_ns < STAT_RACY_SECONDS * 1_000_000_000:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+class HashingWriter:
+    """받은 바이트를 파일 객체에 쓰면서 MD5도 같이 계산 (쓴 파일을 다시 읽지 않기 위함)"""
+    
+    def __init__(self, fh):
+        self.fh = fh
+        self.md5 = hashlib.md5()
+    
+    def write(self, data):
+        self.md5.update(data)
+        return self.fh.write(data)
+    
+    def flush(self):
+        self.fh.flush()
+
+def temp_path_for(dest_path, suffix='.tmp'):
+    """
+    dest_path와 같은 디렉토리에 임시 파일 생성
+    
+    같은 파일 시스템에 있어야 os.replace가 원자적으로 동작함
+    
+    Returns:
+        str: 생성된 빈 임시 파일 경로 (사용 후 호출한 쪽에서 교체하거나 삭제)
+    """
+    directory, name = os.path.split(os.path.abspath(dest_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix=suffix, dir=directory)
+    os.close(fd)
+    return tmp_path
+
+def fsync_and_replace(tmp_path, dest_path):
+    """
+    임시 파일을 디스크에 반영(fsync)한 뒤 dest_path로 원자적으로 교체
+    
+    교체 중에 전원이 나가도 dest_path는 예전 내용 아니면 새 내용 중 하나만 보임
+    """
+    with open(tmp_path, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, dest_path)
+    
+    # 이름 변경 자체도 디스크에 남도록 디렉토리 fsync (Windows는 디렉토리를 열 수 없음)
+    if os.name == 'posix':
+        fd = os.open(os.path.dirname(os.path.abspath(dest_path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
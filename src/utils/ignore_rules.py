@@ -0,0 +1,169 @@
+import os
+import re
+
+# .gitignore와 관계없이 항상 제외하는 경로 (gitignore 문법)
+DEFAULT_EXCLUDES = (
+    'versions/',
+    '.git/',
+    '__pycache__/',
+    '.env',
+    'dist/',
+    'build/',
+    'logs/',
+)
+
+def _translate(pattern):
+    """gitignore 패턴 하나를 정규식으로 변환 (디렉토리는 끝에 '/'를 붙여서 매칭)"""
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    # 중간이나 앞에 '/'가 있으면 프로젝트 루트 기준, 없으면 어느 깊이에서든 매칭
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end].replace('\\', '\\\\')
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append(f'[{body}]')
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+
+    prefix = '' if anchored else '(?:.*/)?'
+    return prefix + ''.join(out) + ('/' if dir_only else '/?')
+
+def read_ignore_file(path):
+    """gitignore 형식 파일의 패턴 목록 (파일이 없으면 빈 목록)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return [line.rstrip('\n') for line in f]
+
+class IgnoreMatcher:
+    """
+    gitignore 패턴 목록을 정규식 하나로 묶은 매처
+
+    '!'로 다시 포함하는 패턴이 있으면 부호가 같은 연속 패턴끼리 묶고 뒤에서부터 검사
+    (마지막으로 매칭된 패턴이 결과를 결정하는 gitignore 규칙 그대로)
+    """
+
+    def __init__(self, patterns):
+        """
+        IgnoreMatcher 초기화
+
+        Args:
+            patterns (list): gitignore 문법 패턴 목록 (빈 줄과 '#' 주석은 무시)
+        """
+        groups = []
+        for line in patterns:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate or line.startswith('\\!') or line.startswith('\\#'):
+                line = line[1:]
+            if not line.strip('/'):
+                continue
+            if groups and groups[-1][0] == negate:
+                groups[-1][1].append(_translate(line))
+            else:
+                groups.append((negate, [_translate(line)]))
+
+        self.groups = [
+            (negate, re.compile('|'.join(f'(?:{regex})' for regex in regexes), re.DOTALL))
+            for negate, regexes in reversed(groups)
+        ]
+
+    @classmethod
+    def for_project(cls, project_root, excludes=None):
+        """기본 제외 목록 + 프로젝트 .gitignore + 추가 제외 목록으로 매처 생성"""
+        patterns = list(DEFAULT_EXCLUDES)
+        patterns += read_ignore_file(os.path.join(project_root, '.gitignore'))
+        patterns += list(excludes or [])
+        return cls(patterns)
+
+    def __call__(self, rel_path, is_dir=False):
+        """
+        제외 대상인지 확인
+
+        Args:
+            rel_path (str): 프로젝트 루트 기준 '/' 구분 상대 경로
+            is_dir (bool): 디렉토리인지
+
+        Returns:
+            bool: 제외해야 하면 True
+        """
+        if is_dir:
+            rel_path += '/'
+        for negate, regex in self.groups:
+            if regex.fullmatch(rel_path):
+                return not negate
+        return False
+
+def iter_project_files(project_root, matcher, max_file_size=None, oversized=None):
+    """
+    os.scandir로 프로젝트를 돌면서 백업 대상 파일을 반환
+
+    제외된 디렉토리는 안으로 들어가지 않고, 심볼릭 링크 디렉토리도 따라가지 않음
+
+    Args:
+        project_root (str): 프로젝트 루트
+        matcher (IgnoreMatcher): 제외 규칙
+        max_file_size (int): 이보다 큰 파일은 건너뜀 (None이면 제한 없음)
+        oversized (list): 크기 제한으로 건너뛴 (상대 경로, 크기)를 추가할 목록
+
+    Yields:
+        tuple: (전체 경로, '/' 구분 상대 경로, os.stat_result)
+    """
+    stack = [(project_root, '')]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}{entry.name}"
+            try:
+                is_dir = entry.is_dir()
+                if is_dir:
+                    if not entry.is_symlink() and not matcher(rel_path, is_dir=True):
+                        subdirs.append((entry.path, f"{rel_path}/"))
+                    continue
+                if not entry.is_file() or matcher(rel_path):
+                    continue
+                stat = entry.stat()
+            except FileNotFoundError:
+                # 도는 사이에 지워진 파일
+                continue
+
+            if max_file_size is not None and stat.st_size > max_file_size:
+                if oversized is not None:
+                    oversized.append((rel_path, stat.st_size))
+                continue
+            yield entry.path, rel_path, stat
+
+        # 이름 순서대로 나오도록 역순으로 쌓음
+        stack.extend(reversed(subdirs))
@@ -1,38 +1,126 @@
+import atexit
+import gzip
 import logging
-from datetime import datetime
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import threading
+
+if __name__ != "__main__":
+    from src.config import config, project_name
+else:
+    from config import config, project_name
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 프로세스에 하나뿐인 로그 큐 리스너 (setup_logging을 여러 번 불러도 핸들러가 늘지 않도록)
+_lock = threading.Lock()
+_listener = None
+_queue_handler = None
+_atexit_registered = False
+
+def _gzip_namer(name):
+    return f"{name}.gz"
+
+def _gzip_rotator(source, dest):
+    """회전된 로그 파일을 gzip으로 압축 (QueueListener 스레드에서 실행되므로 백업을 막지 않음)"""
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+def _file_handler(path, max_bytes, backup_count, when):
+    """크기(max_bytes) 또는 시간(when) 기준으로 회전하고 이전 파일은 .gz로 남기는 핸들러"""
+    if when:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=when, backupCount=backup_count, encoding='utf-8')
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    return handler
+
+def setup_logging(log_dir, name, level=logging.INFO, max_bytes=5 * 1024 * 1024, backup_count=10, when=None,
+                  console=True):
+    """
+    루트 로거에 QueueHandler 하나를 달고 파일/콘솔 쓰기는 QueueListener 스레드에서 처리
+
+    로그를 남기는 쪽은 큐에 넣기만 하므로 디스크가 느려도 백업이 기다리지 않음
+    이미 설정되어 있으면 아무것도 바꾸지 않고 기존 리스너를 반환 (감시 모드나 Logger를 여러 번 만들어도 안전)
+
+    Args:
+        log_dir (str): 로그 디렉토리 (없으면 생성)
+        name (str): 로그 파일 이름 ('<name>.log')
+        level (int): 루트 로거 레벨
+        max_bytes (int): 이 크기를 넘으면 회전 (when이 없을 때)
+        backup_count (int): 남길 이전 로그 파일 수
+        when (str): 'midnight', 'H' 등 시간 기준 회전 (TimedRotatingFileHandler의 when)
+        console (bool): 콘솔에도 출력 (콘솔이 없는 exe에서는 무시)
+
+    Returns:
+        logging.handlers.QueueListener: 로그를 쓰는 리스너
+    """
+    global _listener, _queue_handler, _atexit_registered
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        os.makedirs(log_dir, exist_ok=True)
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = [_file_handler(os.path.join(log_dir, f"{name}.log"), max_bytes, backup_count, when)]
+        # console=False로 빌드한 exe에는 stderr가 없음
+        if console and sys.stderr is not None:
+            handlers.append(logging.StreamHandler())
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(_queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+        return _listener
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 쓰고 파일 닫기 (프로세스 종료 시 자동 호출)"""
+    global _listener, _queue_handler
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = _queue_handler = None
 
 class Logger:
-    def __init__(self):
-        # 로거 설정
-        self.logger = logging.getLogger('MemoryVault')
-        self.logger.setLevel(logging.INFO)
-        
-        # 파일 핸들러 설정
-        log_filename = f"logs/memory_vault_{datetime.now().strftime('%Y%m%d')}.log"
-        file_handler = logging.FileHandler(log_filename)
-        file_handler.setLevel(logging.INFO)
-        
-        # 콘솔 핸들러 설정
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # 포맷 설정
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # 핸들러 추가
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-    
+    def __init__(self, log_dir=None):
+        # main과 같은 디렉토리/파일/회전 설정 (이미 되어 있으면 그대로 사용하므로 여러 번 만들어도 핸들러가 중복되지 않음)
+        setup_logging(
+            log_dir or config.LOG_DIR,
+            project_name,
+            max_bytes=config.LOG_MAX_BYTES,
+            backup_count=config.LOG_BACKUP_COUNT,
+            when=config.LOG_ROTATE_WHEN
+        )
+        self.logger = logging.getLogger(project_name)
+
     def info(self, message):
         self.logger.info(message)
-        
+
     def error(self, message):
         self.logger.error(message)
-        
+
     def warning(self, message):
         self.logger.warning(message)
-        
+
     def debug(self, message):
-        self.logger.debug(message)
\ No newline at end of file
+        self.logger.debug(message)
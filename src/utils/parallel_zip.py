@@ -0,0 +1,356 @@
+import hashlib
+import os
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# 이미 압축된 형식이라 deflate해도 거의 줄지 않는 확장자 (압축 없이 저장)
+STORED_EXTENSIONS = frozenset({
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar', '.whl', '.egg', '.jar',
+    '.exe', '.dll', '.pyd', '.ico', '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp3', '.mp4', '.mov', '.avi', '.pdf', '.docx', '.xlsx', '.pptx'
+})
+
+READ_CHUNK_SIZE = 1024 * 1024
+BATCH_BYTES = 8 * 1024 * 1024  # 작업자에게 한 번에 넘기는 파일 묶음 크기 (작은 파일마다 IPC 하지 않도록)
+SPILL_SIZE = 32 * 1024 * 1024  # 압축 결과가 이보다 크면 메모리 대신 임시 파일로 돌려줌
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024  # 압축할 양이 이보다 적으면 프로세스 풀 없이 처리
+
+_LOCAL_HEADER = '<4s5H3L2H'
+_CENTRAL_HEADER = '<4s2B5H3L5H2L'
+_MAX_32 = 0xFFFFFFFF
+
+def should_store(path):
+    """압축하지 않고 그대로 저장할 파일인지"""
+    return os.path.splitext(path)[1].lower() in STORED_EXTENSIONS
+
+def compress_member(path, level=6):
+    """
+    파일 하나를 raw deflate로 압축 (작업자 프로세스에서 실행)
+
+    Returns:
+        dict: method, crc, size, compress_size, sha256, data(bytes) 또는 spill_path(임시 파일)
+              압축해도 줄지 않으면 method가 ZIP_STORED이고 data/spill_path가 없음 (원본을 그대로 복사)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    crc, size, compress_size = 0, 0, 0
+    sha256 = hashlib.sha256()
+    pieces, spill = [], None
+
+    def emit(piece):
+        nonlocal compress_size, pieces, spill
+        if not piece:
+            return
+        compress_size += len(piece)
+        if spill:
+            spill.write(piece)
+            return
+        pieces.append(piece)
+        if compress_size > SPILL_SIZE:
+            spill = tempfile.NamedTemporaryFile(suffix='.deflate', delete=False)
+            spill.writelines(pieces)
+            pieces = []
+
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                sha256.update(chunk)
+                emit(compressor.compress(chunk))
+        emit(compressor.flush())
+    finally:
+        if spill:
+            spill.close()
+
+    result = {'crc': crc, 'size': size, 'sha256': sha256.hexdigest()}
+    if compress_size >= size:
+        if spill:
+            os.remove(spill.name)
+        return dict(result, method=zipfile.ZIP_STORED, compress_size=size)
+    return dict(
+        result,
+        method=zipfile.ZIP_DEFLATED,
+        compress_size=compress_size,
+        data=b''.join(pieces) if not spill else None,
+        spill_path=spill.name if spill else None
+    )
+
+def _compress_batch(batch):
+    return [compress_member(path, level) for path, level in batch]
+
+def _dos_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+class RawZipWriter:
+    """
+    이미 압축된 데이터를 그대로 써서 zip을 조립하는 작성기 (zip64 지원)
+
+    zipfile.ZipFile은 쓰면서 직접 압축하므로 다른 프로세스에서 압축한 결과를 넣으려면
+    로컬 헤더/중앙 디렉토리를 직접 기록해야 함
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fp = open(path, 'wb')
+        self.entries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.fp.close()
+
+    def _header(self, zinfo, method, crc, compress_size, size, zip64):
+        name = zinfo.filename.encode('ascii', errors='ignore')
+        flags = 0
+        if name.decode('ascii') != zinfo.filename:
+            name, flags = zinfo.filename.encode('utf-8'), 0x800
+        extra = b''
+        if zip64:
+            extra = struct.pack('<2H2Q', 1, 16, size, compress_size)
+            compress_size = size = _MAX_32
+        dostime, dosdate = _dos_time(zinfo.date_time)
+        header = struct.pack(
+            _LOCAL_HEADER, b'PK\x03\x04', 45 if zip64 else 20, flags, method, dostime, dosdate,
+            crc, compress_size, size, len(name), len(extra)
+        )
+        return header + name + extra, name, flags
+
+    def _record(self, zinfo, name, flags, method, crc, compress_size, size, offset):
+        self.entries.append((zinfo, name, flags, method, crc, compress_size, size, offset))
+
+    def _write_entry(self, zinfo, method, crc, compress_size, size, chunks):
+        offset = self.fp.tell()
+        zip64 = size > zipfile.ZIP64_LIMIT or compress_size > zipfile.ZIP64_LIMIT
+        header, name, flags = self._header(zinfo, method, crc, compress_size, size, zip64)
+        self.fp.write(header)
+        for chunk in chunks:
+            self.fp.write(chunk)
+        self._record(zinfo, name, flags, method, crc, compress_size, size, offset)
+
+    def add_compressed(self, zinfo, result):
+        """compress_member 결과(deflate)를 그대로 기록"""
+        spill_path = result.get('spill_path')
+        if spill_path:
+            with open(spill_path, 'rb') as spill:
+                chunks = iter(lambda: spill.read(READ_CHUNK_SIZE), b'')
+                self._write_entry(zinfo, result['method'], result['crc'],
+                                  result['compress_size'], result['size'], chunks)
+            os.remove(spill_path)
+        else:
+            self._write_entry(zinfo, result['method'], result['crc'],
+                              result['compress_size'], result['size'], [result['data']])
+
+    def copy_member(self, source, zinfo, name):
+        """
+        다른 zip의 멤버를 압축된 데이터 그대로 복사 (다시 압축하지 않음)
+
+        Args:
+            source: 원본 zip을 바이너리 모드로 연 파일 객체
+            zinfo (zipfile.ZipInfo): 원본 zip의 멤버 정보
+            name (str): 새 zip 안에서의 이름
+        """
+        source.seek(zinfo.header_offset)
+        header = source.read(30)
+        if header[:4] != b'PK\x03\x04':
+            raise zipfile.BadZipFile(f"{zinfo.filename}: bad local header")
+        name_length, extra_length = struct.unpack('<2H', header[26:30])
+        source.seek(name_length + extra_length, os.SEEK_CUR)
+
+        def chunks():
+            remaining = zinfo.compress_size
+            while remaining > 0:
+                chunk = source.read(min(remaining, READ_CHUNK_SIZE))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"{zinfo.filename}: truncated data")
+                remaining -= len(chunk)
+                yield chunk
+
+        target = zipfile.ZipInfo(name, zinfo.date_time)
+        target.external_attr = zinfo.external_attr
+        target.create_system = zinfo.create_system
+        self._write_entry(target, zinfo.compress_type, zinfo.CRC, zinfo.compress_size, zinfo.file_size, chunks())
+
+    def add_stored_file(self, zinfo, path):
+        """
+        파일을 압축 없이 스트리밍으로 기록 (CRC는 쓰면서 계산한 뒤 헤더를 다시 씀)
+
+        Returns:
+            str: 파일의 SHA-256
+        """
+        offset = self.fp.tell()
+        zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        header, name, flags = self._header(zinfo, zipfile.ZIP_STORED, 0, 0, 0, zip64)
+        self.fp.write(header)
+
+        crc, size = 0, 0
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                sha256.update(chunk)
+                self.fp.write(chunk)
+        if not zip64 and size > zipfile.ZIP64_LIMIT:
+            raise ValueError(f"{path} grew past the zip64 limit while being archived")
+
+        end = self.fp.tell()
+        self.fp.seek(offset)
+        self.fp.write(self._header(zinfo, zipfile.ZIP_STORED, crc, size, size, zip64)[0])
+        self.fp.seek(end)
+        self._record(zinfo, name, flags, zipfile.ZIP_STORED, crc, size, size, offset)
+        return sha256.hexdigest()
+
+    def add_bytes(self, name, data, level=6):
+        """메모리에 있는 데이터를 deflate해서 기록 (매니페스트 등)"""
+        zinfo = zipfile.ZipInfo(name, time.localtime()[:6])
+        zinfo.external_attr = 0o644 << 16
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        self.add_compressed(zinfo, {
+            'method': zipfile.ZIP_DEFLATED, 'crc': zlib.crc32(data), 'size': len(data),
+            'compress_size': len(compressed), 'data': compressed
+        })
+
+    def close(self):
+        """중앙 디렉토리와 끝 레코드를 쓰고 닫기"""
+        cd_start = self.fp.tell()
+        for zinfo, name, flags, method, crc, compress_size, size, offset in self.entries:
+            extra = b''
+            version = 20
+            if max(size, compress_size, offset) > zipfile.ZIP64_LIMIT:
+                extra = struct.pack('<2H3Q', 1, 24, size, compress_size, offset)
+                size = compress_size = offset = _MAX_32
+                version = 45
+            dostime, dosdate = _dos_time(zinfo.date_time)
+            self.fp.write(struct.pack(
+                _CENTRAL_HEADER, b'PK\x01\x02', version, zinfo.create_system, version, flags, method,
+                dostime, dosdate, crc, compress_size, size, len(name), len(extra), 0, 0, 0,
+                zinfo.external_attr, offset
+            ))
+            self.fp.write(name + extra)
+
+        count = len(self.entries)
+        cd_size = self.fp.tell() - cd_start
+        if count > 0xFFFF or cd_start > zipfile.ZIP64_LIMIT or cd_size > zipfile.ZIP64_LIMIT:
+            zip64_end = self.fp.tell()
+            self.fp.write(struct.pack('<4sQ2H2L4Q', b'PK\x06\x06', 44, 45, 45, 0, 0, count, count, cd_size, cd_start))
+            self.fp.write(struct.pack('<4sLQL', b'PK\x06\x07', 0, zip64_end, 1))
+            count, cd_size, cd_start = min(count, 0xFFFF), min(cd_size, _MAX_32), min(cd_start, _MAX_32)
+        self.fp.write(struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, count, count, cd_size, cd_start, 0))
+        self.fp.close()
+
+def read_member_at(source, offset, name):
+    """
+    로컬 헤더 위치를 알고 있는 멤버를 중앙 디렉토리를 읽지 않고 바로 읽기 (RawZipWriter로 쓴 zip 전용)
+
+    Args:
+        source: zip을 바이너리 모드로 연 파일 객체
+        offset (int): 로컬 헤더 위치
+        name (str): 그 위치에 있어야 하는 멤버 이름
+
+    Returns:
+        iterator: 압축을 푼 데이터 청크 (그 위치에 name 멤버가 없으면 None)
+    """
+    source.seek(offset)
+    header = source.read(30)
+    if len(header) < 30 or header[:4] != b'PK\x03\x04':
+        return None
+    _, _, flags, method, _, _, _, compress_size, _, name_length, extra_length = struct.unpack(_LOCAL_HEADER, header)
+    if source.read(name_length) != name.encode('utf-8'):
+        return None
+    extra = source.read(extra_length)
+    if compress_size == _MAX_32:
+        # RawZipWriter는 zip64 extra에 (원본 크기, 압축 크기)만 씀
+        compress_size = struct.unpack('<2H2Q', extra[:20])[3]
+    if flags & 0x8 or method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        return None
+
+    def chunks():
+        decompressor = zlib.decompressobj(-15) if method == zipfile.ZIP_DEFLATED else None
+        remaining = compress_size
+        while remaining > 0:
+            chunk = source.read(min(remaining, READ_CHUNK_SIZE))
+            if not chunk:
+                raise zipfile.BadZipFile(f"{name}: truncated data")
+            remaining -= len(chunk)
+            yield decompressor.decompress(chunk) if decompressor else chunk
+        if decompressor:
+            yield decompressor.flush()
+
+    return chunks()
+
+def _ordered_results(executor, batches, window):
+    """배치를 window개까지만 미리 제출하고 결과를 제출 순서대로 하나씩 반환"""
+    pending = deque()
+    for batch in batches:
+        pending.append(executor.submit(_compress_batch, batch))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+def _batches(tasks):
+    batch, batch_bytes = [], 0
+    for path, level, size in tasks:
+        batch.append((path, level))
+        batch_bytes += size
+        if batch_bytes >= BATCH_BYTES:
+            yield batch
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch
+
+def write_members(writer, members, workers=None, level=6):
+    """
+    파일들을 zip에 기록 (deflate는 프로세스 풀에서 병렬로, 이미 압축된 형식은 그대로 저장)
+
+    Args:
+        writer (RawZipWriter): 기록할 zip
+        members (list): (파일 경로, zip 안의 이름) 목록
+        workers (int): 작업자 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 처리)
+        level (int): deflate 레벨
+
+    Yields:
+        str: members 순서대로 각 파일의 SHA-256
+    """
+    zinfos = [zipfile.ZipInfo.from_file(path, name) for path, name in members]
+    tasks = [
+        (path, level, zinfo.file_size)
+        for (path, _), zinfo in zip(members, zinfos) if not should_store(path)
+    ]
+    workers = workers or os.cpu_count() or 1
+    use_pool = workers > 1 and sum(size for _, _, size in tasks) >= PARALLEL_MIN_BYTES
+
+    executor = ProcessPoolExecutor(max_workers=workers) if use_pool else None
+    try:
+        if executor:
+            results = _ordered_results(executor, _batches(tasks), workers * 2)
+        else:
+            results = (compress_member(path, level) for path, level, _ in tasks)
+
+        for (path, _), zinfo in zip(members, zinfos):
+            if should_store(path):
+                yield writer.add_stored_file(zinfo, path)
+                continue
+            result = next(results)
+            if result['method'] == zipfile.ZIP_STORED:
+                # 압축해도 줄지 않는 파일은 원본을 그대로 저장
+                yield writer.add_stored_file(zinfo, path)
+            else:
+                writer.add_compressed(zinfo, result)
+                yield result['sha256']
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
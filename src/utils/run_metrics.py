@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+if __name__ != "__main__":
+    from src.utils.file_utils import fsync_and_replace, temp_path_for
+else:
+    from file_utils import fsync_and_replace, temp_path_for
+
+# Prometheus 지표 (이름, 단계별 값 키, 설명)
+_PROMETHEUS_METRICS = (
+    ('memory_vault_phase_duration_seconds', 'seconds', "Time spent in each phase of the last backup run"),
+    ('memory_vault_phase_bytes', 'bytes', "Payload bytes uploaded in each phase of the last backup run"),
+    ('memory_vault_phase_api_calls', 'calls', "Drive API calls made in each phase of the last backup run"),
+    ('memory_vault_phase_retries', 'retries', "Retried Drive requests in each phase of the last backup run"),
+    ('memory_vault_phase_runs', 'count', "Times each phase ran during the last backup run"),
+)
+
+class RunMetrics:
+    """
+    백업 실행 한 번의 단계별 시간/바이트/API 호출/재시도 기록
+
+    단계는 스레드마다 따로 쌓이고, 호출/재시도/바이트는 그 스레드에서 열려 있는 모든 단계에 더함
+    (backup 안의 upload처럼 겹친 단계는 양쪽에 다 들어감)
+    작업자 스레드의 같은 단계는 합산되므로 seconds가 wall 시간보다 클 수 있음
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def reset(self):
+        """새 실행 시작 (감시 모드처럼 한 프로세스에서 여러 번 백업할 때)"""
+        with self._lock:
+            self.phases = {}
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _entry(self, name):
+        entry = self.phases.get(name)
+        if entry is None:
+            entry = self.phases[name] = {'seconds': 0.0, 'bytes': 0, 'calls': 0, 'retries': 0, 'count': 0}
+        return entry
+
+    @contextmanager
+    def phase(self, name):
+        """with 블록을 name 단계로 기록 (같은 단계가 여러 번이면 합산)"""
+        stack = self._stack()
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                entry = self._entry(name)
+                entry['seconds'] += elapsed
+                entry['count'] += 1
+
+    def _add(self, key, value):
+        stack = self._stack()
+        if not stack:
+            return
+        with self._lock:
+            for name in set(stack):
+                self._entry(name)[key] += value
+
+    def count_call(self, n=1):
+        """Drive API 호출 n번 (배치 요청은 안에 든 요청 수)"""
+        self._add('calls', n)
+
+    def count_retry(self, n=1):
+        """재시도 n번 (5xx/연결 끊김, 속도 제한)"""
+        self._add('retries', n)
+
+    def add_bytes(self, n):
+        """올린 바이트"""
+        self._add('bytes', n)
+
+    def snapshot(self):
+        """{단계 이름: {seconds, bytes, calls, retries, count}} 복사본"""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self.phases.items()}
+
+    def report(self):
+        """'authenticate 120ms, upload 850ms 1.2MB 3 calls, ...' 형식의 한 줄 요약"""
+        parts = []
+        for name, entry in self.snapshot().items():
+            part = f"{name} {entry['seconds'] * 1000:.0f}ms"
+            if entry['bytes']:
+                part += f" {entry['bytes'] / 1024 / 1024:.1f}MB"
+            if entry['calls']:
+                part += f" {entry['calls']} calls"
+            if entry['retries']:
+                part += f" {entry['retries']} retries"
+            parts.append(part)
+        return ', '.join(parts)
+
+    def write_json_line(self, path, **fields):
+        """
+        실행 결과를 JSON 한 줄로 path에 추가
+
+        Args:
+            path (str): JSON Lines 파일 경로
+            **fields: 같이 기록할 값 (status, mode 등)
+        """
+        record = {'time': datetime.now(timezone.utc).isoformat(timespec='seconds'), **fields,
+                  'phases': self.snapshot()}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def write_prometheus(self, path, success, labels=None):
+        """
+        node_exporter textfile collector 형식으로 path를 원자적으로 교체
+
+        Args:
+            path (str): .prom 파일 경로 (collector가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체)
+            success (bool): 이번 실행 성공 여부
+            labels (dict): 모든 지표에 붙일 라벨 (예: {'mode': 'rotate'})
+        """
+        base = ''.join(f',{key}="{_escape(value)}"' for key, value in (labels or {}).items())
+        phases = self.snapshot()
+        lines = []
+        for metric, key, help_text in _PROMETHEUS_METRICS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for name, entry in phases.items():
+                lines.append(f'{metric}{{phase="{_escape(name)}"{base}}} {entry[key]!r}')
+        run_labels = f"{{{base[1:]}}}" if base else ''
+        lines += [
+            "# HELP memory_vault_last_run_success Whether the last backup run succeeded",
+            "# TYPE memory_vault_last_run_success gauge",
+            f"memory_vault_last_run_success{run_labels} {int(bool(success))}",
+            "# HELP memory_vault_last_run_timestamp_seconds Unix time the last backup run finished",
+            "# TYPE memory_vault_last_run_timestamp_seconds gauge",
+            f"memory_vault_last_run_timestamp_seconds{run_labels} {time.time():.0f}",
+        ]
+
+        tmp_path = temp_path_for(path)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+                f.write('\n'.join(lines) + '\n')
+            fsync_and_replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+run_metrics = RunMetrics()
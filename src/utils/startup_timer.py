@@ -0,0 +1,33 @@
+import time
+from contextlib import contextmanager
+
+class StartupTimer:
+    """
+    프로세스 시작부터 첫 API 호출 준비까지 단계별 소요 시간 기록
+
+    main.py가 가장 먼저 import하므로 started는 인터프리터가 우리 코드를 읽기 시작한 시각
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        """with 블록에 걸린 시간을 name 단계에 더함 (같은 단계가 여러 번이면 합산)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def elapsed(self):
+        """시작 후 지난 시간 (초)"""
+        return time.perf_counter() - self.started
+
+    def report(self):
+        """'imports 210ms, auth imports 95ms, ... (total 330ms)' 형식의 한 줄 요약"""
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items()]
+        return f"{', '.join(parts)} (total {self.elapsed() * 1000:.0f}ms)"
+
+startup_timer = StartupTimer()
@@ -0,0 +1,171 @@
+import json
+import re
+import time
+from dataclasses import dataclass
+
+# 한 번에 읽어서 검사할 바이트 수 (메모리 사용량은 이 크기 + 가장 긴 줄 하나)
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 레코드 종류별 필수 문자열 필드
+_REQUIRED_FIELDS = {
+    'entity': ('name', 'entityType'),
+    'relation': ('from', 'to', 'relationType')
+}
+
+# JSON 문자열 리터럴 (이스케이프 포함)
+_STRING = rb'"(?:[^"\\\x00-\x1f]+|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*"'
+
+# MCP memory 서버가 JSON.stringify로 쓰는 그대로의 줄 (키 순서 고정)
+# 대부분의 줄은 json.loads로 객체를 만들지 않고 이 정규식 하나로 형식과 스키마가 확인됨
+_CANONICAL_LINE = re.compile(
+    rb'\{"type":"(?:'
+    rb'entity","name":' + _STRING + rb',"entityType":' + _STRING +
+    rb',"observations":\[(?:' + _STRING + rb'(?:,' + _STRING + rb')*)?\]'
+    rb'|relation","from":' + _STRING + rb',"to":' + _STRING + rb',"relationType":' + _STRING +
+    rb')\}\r?\n'
+)
+
+# '{"type":"' 다음 글자로 entity/relation 구분
+_KIND_OFFSET = len(b'{"type":"')
+
+class MemoryFileValidationError(Exception):
+    """memory.json이 깨져 있거나 스키마에 맞지 않을 때"""
+
+    def __init__(self, path, line_number, reason):
+        self.path = path
+        self.line_number = line_number
+        self.reason = reason
+        location = f"{line_number}번째 줄" if line_number else "파일"
+        super().__init__(f"{path} {location}이 이상해ㅠㅠ: {reason}")
+
+@dataclass
+class ValidationReport:
+    """검증 결과 (레코드 수와 처리 속도)"""
+    path: str
+    records: int = 0
+    entities: int = 0
+    relations: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def mb_per_second(self):
+        return self.bytes / (1024 * 1024) / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.records} records ({self.entities} entities, {self.relations} relations), "
+                f"{self.bytes / (1024 * 1024):.1f} MB in {self.seconds:.2f}s ({self.mb_per_second:.0f} MB/s)")
+
+def validate_record(record):
+    """
+    레코드 하나의 스키마 확인
+
+    Returns:
+        str: 레코드 종류 ('entity' 또는 'relation')
+
+    Raises:
+        ValueError: 스키마에 맞지 않을 때 (이유 포함)
+    """
+    if not isinstance(record, dict):
+        raise ValueError("JSON 객체가 아님")
+    kind = record.get('type')
+    fields = _REQUIRED_FIELDS.get(kind)
+    if fields is None:
+        raise ValueError(f"알 수 없는 type: {kind!r}")
+    for field in fields:
+        if not isinstance(record.get(field), str):
+            raise ValueError(f"{kind}의 '{field}'가 문자열이 아님")
+    if kind == 'entity':
+        observations = record.get('observations', [])
+        if not isinstance(observations, list) or not all(isinstance(o, str) for o in observations):
+            raise ValueError(f"entity '{record['name']}'의 observations가 문자열 목록이 아님")
+    return kind
+
+def _validate_line(line, line_number, path):
+    """표준 형식이 아닌 줄 하나를 json으로 직접 파싱해서 검증 (빈 줄이면 None)"""
+    if not line.strip():
+        return None
+    try:
+        return validate_record(json.loads(line.rstrip(b'\r\n')))
+    except UnicodeDecodeError:
+        raise MemoryFileValidationError(path, line_number, "UTF-8이 아님")
+    except json.JSONDecodeError as e:
+        # 마지막 줄이 잘렸으면 쓰는 도중에 읽은 것
+        raise MemoryFileValidationError(path, line_number, f"JSON 파싱 실패 ({e.msg}, {e.pos}번째 문자)")
+    except ValueError as e:
+        raise MemoryFileValidationError(path, line_number, str(e))
+
+def _validate_segment(segment, first_line, report, path):
+    """줄바꿈으로 끝나는 바이트 구간 검증 (first_line: 구간 첫 줄의 줄 번호)"""
+    try:
+        segment.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise MemoryFileValidationError(path, first_line + segment.count(b'\n', 0, e.start), "UTF-8이 아님")
+
+    match = _CANONICAL_LINE.match
+    entity_marker = ord('e')
+    pos, end = 0, len(segment)
+    while pos < end:
+        matched = match(segment, pos)
+        if matched:
+            if segment[pos + _KIND_OFFSET] == entity_marker:
+                report.entities += 1
+            else:
+                report.relations += 1
+            pos = matched.end()
+            continue
+
+        # 공백/키 순서가 다르거나 깨진 줄은 느린 경로로
+        line_end = segment.find(b'\n', pos) + 1 or end
+        kind = _validate_line(segment[pos:line_end], first_line + segment.count(b'\n', 0, pos), path)
+        if kind == 'entity':
+            report.entities += 1
+        elif kind == 'relation':
+            report.relations += 1
+        pos = line_end
+
+def validate_memory_file(path, allow_empty=False):
+    """
+    memory.json을 청크 단위로 읽으면서 JSON-lines 형식과 entity/relation 스키마 검증
+
+    파일 전체를 메모리에 올리지 않으므로 파일 크기와 관계없이 메모리 사용량이 일정함
+
+    Args:
+        path (str): 검증할 파일 경로
+        allow_empty (bool): 빈 파일을 허용할지 (메모리 서버가 쓰는 도중이면 잠깐 비어 있을 수 있음)
+
+    Returns:
+        ValidationReport: 레코드 수와 처리 속도
+
+    Raises:
+        MemoryFileValidationError: 깨진 줄이나 스키마 위반을 처음 발견했을 때
+    """
+    report = ValidationReport(path=str(path))
+    start = time.perf_counter()
+    line_number = 1
+    tail = b''
+
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            report.bytes += len(chunk)
+
+            # 마지막 줄바꿈까지만 검사하고 나머지는 다음 청크와 이어서 검사
+            data = tail + chunk
+            cut = data.rfind(b'\n') + 1
+            segment, tail = data[:cut], data[cut:]
+            _validate_segment(segment, line_number, report, path)
+            line_number += segment.count(b'\n')
+
+    # memory 서버는 마지막 줄 뒤에 줄바꿈을 쓰지 않음
+    if tail:
+        _validate_segment(tail + b'\n', line_number, report, path)
+
+    report.records = report.entities + report.relations
+    if not report.records and not allow_empty:
+        raise MemoryFileValidationError(path, None, "레코드가 하나도 없음")
+
+    report.seconds = time.perf_counter() - start
+    return report
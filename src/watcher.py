@@ -0,0 +1,146 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# inotify 이벤트 마스크 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct('iIII')
+
+class _Inotify:
+    """ctypes로 감싼 최소한의 inotify (Linux 전용)"""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed: {directory}")
+
+    def read_names(self, timeout):
+        """timeout초 동안 이벤트를 기다렸다가 변경된 파일 이름 목록 반환"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        names = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            names.append(os.fsdecode(data[offset:offset + length].rstrip(b'\0')))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+class MemoryFileWatcher:
+    """memory.json 변경을 감시하다가 쓰기가 잠잠해지면 콜백을 한 번 실행"""
+
+    def __init__(self, path, on_change, debounce_seconds=2.0, poll_interval=1.0, use_inotify=True):
+        """
+        MemoryFileWatcher 초기화
+
+        Args:
+            path (str): 감시할 파일 경로
+            on_change (callable): 변경이 잠잠해졌을 때 호출할 함수
+            debounce_seconds (float): 마지막 변경 후 이만큼 조용하면 콜백 실행
+            poll_interval (float): 폴링 모드에서 mtime 확인 주기 (초)
+            use_inotify (bool): 가능하면 inotify 사용 (실패 시 폴링으로 대체)
+        """
+        self.path = os.path.abspath(path)
+        self.on_change = on_change
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.stop_event = threading.Event()
+
+    def _open_inotify(self):
+        """inotify 열기 (Linux가 아니거나 실패하면 None)"""
+        if not self.use_inotify or not sys.platform.startswith('linux'):
+            return None
+        try:
+            # 파일이 교체(rename)되어도 따라가도록 상위 디렉토리를 감시
+            return _Inotify(os.path.dirname(self.path))
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable, falling back to polling: {e}")
+            return None
+
+    def _stat_signature(self):
+        """폴링용 파일 상태 (mtime, size)"""
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _fire(self):
+        """콜백 실행 (예외가 나도 감시는 계속)"""
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.error(f"Backup after change failed: {e}")
+
+    def run(self):
+        """stop()이 호출될 때까지 감시 (블로킹)"""
+        inotify = self._open_inotify()
+        name = os.path.basename(self.path)
+        last_signature = self._stat_signature()
+        deadline = None  # 변경이 감지된 뒤 콜백을 실행할 시각
+
+        logger.info(f"Watching {self.path} ({'inotify' if inotify else 'polling'}, "
+                    f"debounce {self.debounce_seconds}s)")
+        try:
+            while not self.stop_event.is_set():
+                if deadline is None:
+                    timeout = self.poll_interval
+                else:
+                    timeout = max(0.0, min(self.poll_interval, deadline - time.monotonic()))
+
+                if inotify:
+                    changed = name in inotify.read_names(timeout)
+                else:
+                    self.stop_event.wait(timeout)
+                    signature = self._stat_signature()
+                    changed = signature != last_signature
+                    last_signature = signature
+
+                if changed:
+                    # 쓰기가 이어지는 동안은 실행 시각을 계속 뒤로 미룸
+                    deadline = time.monotonic() + self.debounce_seconds
+                elif deadline is not None and time.monotonic() >= deadline:
+                    deadline = None
+                    if os.path.exists(self.path):
+                        self._fire()
+        finally:
+            if inotify:
+                inotify.close()
+
+    def stop(self):
+        """감시 중지 요청"""
+        self.stop_event.set()